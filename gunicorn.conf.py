@@ -0,0 +1,17 @@
+"""
+Gunicorn settings, loaded automatically when gunicorn starts from the project root
+"""
+
+
+def post_fork(server, worker):
+    """Start the worker's logging and give it its own Airtable connections instead of the master's"""
+    from src.managers.airtable_client import close_all
+    from src.utils.logging_config import configure_logging
+    configure_logging()
+    close_all()
+
+
+def worker_exit(server, worker):
+    """Stop the worker's GitHub activity threads"""
+    from src.managers.github_activity import shutdown_pools
+    shutdown_pools()
@@ -12,6 +12,7 @@ from src.core.chat import ChatService
 from src.core.bot import AIAccountabilityBot
 from src.managers.task_manager import TaskManager
 from src.managers.airtable_manager import AirtableManager
+from src.utils.logging_config import configure_logging
 
 def mask_api_key(api_key: str) -> str:
     """Mask API key for display"""
@@ -38,6 +39,8 @@ def main() -> int:
         if not env_loaded:
             print("Warning: No .env file found in any of the expected locations")
 
+        configure_logging()
+
         # Initialize ChatService
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
@@ -1,58 +1,91 @@
 """
 AI Accountability Bot Core Module
 """
+import copy
 import logging
-import re
-import schedule
-import time
-from threading import Thread
-from typing import Optional, List, Dict
+from itertools import islice
+from typing import Iterator, Optional, List, Dict, Tuple
 
-from ..managers.task_manager import TaskManager
+from ..managers.rate_limiter import Priority, request_priority
+from ..managers.task_manager import TASK_LIST_LIMIT, TaskManager
+from .reminders import ReminderScheduler, format_lead
+from ..utils.command_grammar import COMMANDS
 from ..utils.command_parser import CommandParser
 from ..utils.date_parser import DateParser
+from ..utils.intent_classifier import IntentClassifier, command_file_examples
+from ..utils.metrics import track
+from ..utils.tracing import span
+from ..utils.rendering import get_renderer, render
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
-)
+# Logging is configured by the entry points (see utils.logging_config)
 logger = logging.getLogger(__name__)
 
 class AIAccountabilityBot:
     """Core bot class handling task management and reminders"""
+
+    # Handlers by command name, called with the bot and the command's arguments
+    COMMAND_HANDLERS = {
+        'add_task': lambda bot, title, due_date=None: bot._handle_add_task(title, due_date),
+        'list_tasks': lambda bot, status=None: bot._handle_list_tasks(status),
+        'update_task': lambda bot, title, status: bot._handle_update_task(title, status),
+        'delete_task': lambda bot, title: bot._handle_delete_task(title),
+        'due_tasks': lambda bot, days=None: bot._handle_due_tasks(days),
+        'list_repos': lambda bot: bot._handle_list_repos(),
+        'repo_activity': lambda bot, repo, days=None: bot._handle_repo_activity(repo, days),
+        'create_issue': lambda bot, repo, text: bot._handle_create_issue(repo, text)
+    }
+
+    # Report commands, rendered chunk by chunk in the bot's output format
+    COMMAND_RENDERERS = {
+        'list_tasks': lambda bot, status=None: bot._render_list_tasks(status),
+        'due_tasks': lambda bot, days=None: bot._render_due_tasks(days),
+        'list_repos': lambda bot: bot._render_list_repos(),
+        'repo_activity': lambda bot, repo, days=None: bot._render_repo_activity(repo, days)
+    }
     
     def __init__(self, task_manager: TaskManager = None, chat_service = None, github_manager = None):
         """Initialize the bot with task manager and command patterns"""
         self.task_manager = task_manager or TaskManager()
         self.chat_service = chat_service
         self.github_manager = github_manager
-        self.scheduler_thread = None
+        self.renderer = get_renderer('text')
+        self.reminders: Optional[ReminderScheduler] = None
         self.running = False
         self.command_parser = CommandParser()
         self.date_parser = DateParser()
         
-        # Command patterns
-        self.patterns = {
-            'add': re.compile(r'^(?:add|create|new)\s+task:?\s+(.+?)(?:\s+by\s+(.+))?$', re.IGNORECASE),
-            'list': re.compile(r'^(?:list|show|display)\s+(?:all\s+)?tasks(?:\s+(.+))?$', re.IGNORECASE),
-            'update': re.compile(r'^(?:mark|set|update)\s+task\s+["\']?(.+?)["\']?\s+as\s+(.+)$', re.IGNORECASE),
-            'delete': re.compile(r'^(?:delete|remove)\s+task\s+["\']?(.+?)["\']?$', re.IGNORECASE),
-            'due': re.compile(r'^(?:show\s+)?(?:due\s+tasks?|what\s+is\s+due)(?:\s+in\s+(\d+)\s+days?)?$', re.IGNORECASE),
-            'repos': re.compile(r'^(?:list|show|my)\s+repos(?:itories)?$', re.IGNORECASE),
-            'activity': re.compile(r'^(?:show|get)\s+activity\s+for\s+([^\s]+)(?:\s+in\s+last\s+(\d+)\s+days?)?$', re.IGNORECASE),
-            'create_issue': re.compile(r'^create\s+issue\s+in\s+([^\s]+):\s+(.+)$', re.IGNORECASE)
-        }
+        # Commands are matched by the shared grammar; near misses (typos,
+        # paraphrases) are classified locally before the LLM
+        self.commands = COMMANDS
+        self.intents = IntentClassifier(command_file_examples(self._label_command), intents=self.COMMAND_HANDLERS)
+
+    def with_github(self, github_manager) -> 'AIAccountabilityBot':
+        """Get a per-request view of the bot bound to a user's GitHub manager
+
+        The view shares the task manager, chat service and parsers, so the
+        shared bot is never mutated by concurrent requests.
+        """
+        bot = copy.copy(self)
+        bot.github_manager = github_manager
+        return bot
+
+    def with_format(self, fmt: Optional[str] = None) -> 'AIAccountabilityBot':
+        """Get a per-request view of the bot rendering reports as text, markdown or json
+
+        Only reports (task lists, due tasks, repositories and activity) follow
+        the format; other replies stay plain text. Raises ValueError for an
+        unknown format.
+        """
+        bot = copy.copy(self)
+        bot.renderer = get_renderer(fmt)
+        return bot
 
     def check_due_tasks(self) -> None:
         """Check for tasks due soon and notify"""
         try:
             # Get tasks due in the next 24 hours
-            tasks = self.task_manager.get_due_tasks(1)
+            with request_priority(Priority.SCHEDULED):
+                tasks = self.task_manager.get_due_tasks(1)
             if tasks:
                 logger.info("🔔 Tasks due in the next 24 hours:")
                 for task in tasks:
@@ -68,73 +101,114 @@ class AIAccountabilityBot:
             logger.error(f"Error checking due tasks: {str(e)}")
 
     def start_scheduler(self) -> None:
-        """Start the scheduler in a separate thread"""
-        def run_scheduler():
-            # Schedule daily check at 9 AM
-            schedule.every().day.at("09:00").do(self.check_due_tasks)
-            
-            # Also check every 4 hours during the day
-            schedule.every(4).hours.do(self.check_due_tasks)
-            
-            self.running = True
-            while self.running:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+        """Start sending task reminders from a background thread
 
-        self.scheduler_thread = Thread(target=run_scheduler, daemon=True)
-        self.scheduler_thread.start()
+        Reminders are scheduled from the task manager's cache and fire at
+        each configured lead time before a task is due; changes pulled or
+        written through the task manager reschedule them as they happen.
+        """
+        if self.reminders is None:
+            with request_priority(Priority.SCHEDULED):
+                self.task_manager.sync.maybe_refresh()
+            self.reminders = ReminderScheduler(
+                self.task_manager.cache, self._send_reminder,
+                refresh=self._refresh_tasks, refresh_interval=self.task_manager.sync.interval
+            )
+        self.reminders.start()
+        self.running = True
         logger.info("Task reminder scheduler started")
 
     def stop_scheduler(self) -> None:
         """Stop the scheduler thread"""
         self.running = False
-        if self.scheduler_thread:
-            self.scheduler_thread.join()
+        if self.reminders is not None:
+            self.reminders.stop()
         logger.info("Task reminder scheduler stopped")
 
+    def _refresh_tasks(self) -> None:
+        """Pull task changes made outside this process into the cache"""
+        with request_priority(Priority.SCHEDULED):
+            self.task_manager.sync.maybe_refresh()
+
+    def _send_reminder(self, task: Dict, time_left: float) -> None:
+        """Log a reminder that a task is coming due"""
+        title = task['fields'].get('Title', 'Untitled')
+        due_date = task['fields'].get('Due Date')
+        priority = task['fields'].get('Priority', 'Medium')
+        logger.info(f"🔔 {title} is due {format_lead(time_left)} - Due: {due_date} - Priority: {priority}")
+
+        # If task is high priority, log an extra warning
+        if priority.lower() == 'high':
+            logger.warning(f"⚠️ High priority task due soon: {title}")
+
     def process_command(self, user_input: str) -> str:
         """Process user input and execute appropriate command"""
+        with span('process_command', input_length=len(user_input)) as active:
+            try:
+                route = self._route(user_input)
+                if active:
+                    active.set_attribute('command', route[0] if route else 'natural_language')
+                if route:
+                    name, args = route
+                    with track('command', name):
+                        return self.COMMAND_HANDLERS[name](self, **args)
+
+                # If no pattern matches, try natural language processing
+                with track('command', 'natural_language'):
+                    return self._handle_natural_language(user_input)
+
+            except Exception as e:
+                logger.error(f"Error processing command: {str(e)}")
+                if active:
+                    active.set_attribute('error', str(e))
+                return f"Error processing command: {str(e)}"
+
+    def stream_command(self, user_input: str) -> Iterator[str]:
+        """Process user input, yielding the response in chunks as it is produced
+
+        Reports are streamed as the renderer produces them, other commands
+        are answered in one chunk and free-form input is streamed from the
+        chat service token by token.
+        """
         try:
-            # Try each command pattern
-            for command, pattern in self.patterns.items():
-                if match := pattern.match(user_input):
-                    if command == 'add':
-                        title, due_date = match.groups()
-                        return self._handle_add_task(title, due_date)
-                        
-                    elif command == 'list':
-                        status = match.group(1)
-                        return self._handle_list_tasks(status)
-                        
-                    elif command == 'update':
-                        title, new_status = match.groups()
-                        return self._handle_update_task(title, new_status)
-                        
-                    elif command == 'delete':
-                        title = match.group(1)
-                        return self._handle_delete_task(title)
-                        
-                    elif command == 'due':
-                        days = match.group(1)
-                        return self._handle_due_tasks(days)
-                        
-                    elif command == 'repos':
-                        return self._handle_list_repos()
-                        
-                    elif command == 'activity':
-                        repo_name, days = match.groups()
-                        return self._handle_repo_activity(repo_name, days)
-                        
-                    elif command == 'create_issue':
-                        repo_name, issue_text = match.groups()
-                        return self._handle_create_issue(repo_name, issue_text)
-
-            # If no pattern matches, try natural language processing
-            return self._handle_natural_language(user_input)
-            
+            route = self._route(user_input)
+            if route:
+                name, args = route
+                with track('command', name):
+                    if name in self.COMMAND_RENDERERS:
+                        yield from self.COMMAND_RENDERERS[name](self, **args)
+                    else:
+                        yield self.COMMAND_HANDLERS[name](self, **args)
+                return
         except Exception as e:
             logger.error(f"Error processing command: {str(e)}")
-            return f"Error processing command: {str(e)}"
+            yield f"Error processing command: {str(e)}"
+            return
+        if self.chat_service is None:
+            yield self._handle_natural_language(user_input)
+            return
+        yield from self.chat_service.stream_chat(user_input)
+
+    def handles(self, user_input: str) -> bool:
+        """Whether the input is a command the bot answers without the chat service"""
+        return self._route(user_input) is not None
+
+    def _route(self, user_input: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Find the handler name and arguments for an exact command or a classified near miss
+
+        Commands the grammar recognizes but the bot has no handler for are
+        left to the chat service rather than reclassified.
+        """
+        command = self.commands.match(user_input)
+        if command:
+            return (command.name, command.slots) if command.name in self.COMMAND_HANDLERS else None
+        intent = self.intents.classify(user_input)
+        return (intent.intent, intent.slots) if intent else None
+
+    def _label_command(self, user_input: str) -> Optional[str]:
+        """Get the name of the bot command matching the input"""
+        command = self.commands.match(user_input)
+        return command.name if command and command.name in self.COMMAND_HANDLERS else None
 
     def _handle_add_task(self, title: str, due_date: Optional[str] = None) -> str:
         """Handle adding a new task"""
@@ -152,28 +226,30 @@ class AIAccountabilityBot:
 
     def _handle_list_tasks(self, status: Optional[str] = None) -> str:
         """Handle listing tasks"""
+        return render(self._render_list_tasks(status))
+
+    def _render_list_tasks(self, status: Optional[str] = None) -> Iterator[str]:
+        """Render the first page of tasks by due date"""
         try:
-            tasks = self.task_manager.get_tasks_by_status(status)
+            tasks = list(islice(self.task_manager.iter_tasks(status=status), TASK_LIST_LIMIT + 1))
             if not tasks:
-                return "No tasks found"
-            return self.task_manager.format_task_list(tasks)
+                yield from self.renderer.message("No tasks found")
+                return
+            note = None
+            if len(tasks) > TASK_LIST_LIMIT:
+                note = f"Showing the first {TASK_LIST_LIMIT} tasks by due date; GET /tasks pages through the rest"
+            yield from self.renderer.task_list(tasks[:TASK_LIST_LIMIT], note)
         except Exception as e:
-            return f"Error listing tasks: {str(e)}"
+            yield from self.renderer.error(f"Error listing tasks: {str(e)}")
 
     def _handle_update_task(self, title: str, new_status: str) -> str:
         """Handle updating a task's status"""
         try:
-            tasks = self.task_manager.get_tasks_by_status(None)
-            task_id = None
-            for task in tasks:
-                if task['fields']['Title'].lower() == title.lower():
-                    task_id = task['id']
-                    break
-            
-            if not task_id:
+            task = self.task_manager.find_task_by_title(title)
+            if not task:
                 return f"Could not find task: {title}"
                 
-            task = self.task_manager.update_task_status(task_id, new_status)
+            task = self.task_manager.update_task_status(task['id'], new_status)
             return f"✅ Updated task '{task['fields']['Title']}' to {new_status}"
         except Exception as e:
             return f"Error updating task: {str(e)}"
@@ -181,48 +257,31 @@ class AIAccountabilityBot:
     def _handle_delete_task(self, title: str) -> str:
         """Handle deleting a task"""
         try:
-            tasks = self.task_manager.get_tasks_by_status(None)
-            task_id = None
-            for task in tasks:
-                if task['fields']['Title'].lower() == title.lower():
-                    task_id = task['id']
-                    break
-            
-            if not task_id:
+            task = self.task_manager.find_task_by_title(title)
+            if not task:
                 return f"Could not find task: {title}"
                 
-            self.task_manager.delete_task(task_id)
+            self.task_manager.delete_task(task['id'])
             return f"✅ Deleted task: {title}"
         except Exception as e:
             return f"Error deleting task: {str(e)}"
 
     def _handle_due_tasks(self, days: Optional[str] = None) -> str:
         """Handle checking due tasks"""
+        return render(self._render_due_tasks(days))
+
+    def _render_due_tasks(self, days: Optional[str] = None) -> Iterator[str]:
+        """Render the tasks due in the next few days"""
         try:
             # Default to 7 days if not specified
             days_ahead = int(days) if days else 7
             tasks = self.task_manager.get_due_tasks(days_ahead)
-            
             if not tasks:
-                return f"No tasks due in the next {days_ahead} days"
-            
-            # Format the response
-            response = f"Tasks due in the next {days_ahead} days:\n\n"
-            for task in tasks:
-                fields = task['fields']
-                title = fields.get('Title', 'Untitled')
-                due_date = fields.get('Due Date', 'No due date')
-                priority = fields.get('Priority', 'Medium')
-                status = fields.get('Status', 'Not started')
-                
-                response += f"📅 {title}\n"
-                response += f"   Due: {due_date}\n"
-                response += f"   Priority: {priority}\n"
-                response += f"   Status: {status}\n\n"
-            
-            return response.strip()
+                yield from self.renderer.message(f"No tasks due in the next {days_ahead} days")
+                return
+            yield from self.renderer.due_tasks(tasks, days_ahead)
         except Exception as e:
-            return f"Error checking due tasks: {str(e)}"
+            yield from self.renderer.error(f"Error checking due tasks: {str(e)}")
 
     def _handle_natural_language(self, text: str) -> str:
         """Handle natural language input using GPT"""
@@ -231,58 +290,39 @@ class AIAccountabilityBot:
 
     def _handle_list_repos(self) -> str:
         """Handle listing GitHub repositories"""
+        return render(self._render_list_repos())
+
+    def _render_list_repos(self) -> Iterator[str]:
+        """Render the user's GitHub repositories"""
         if not self.github_manager:
-            return "Please connect your GitHub account first"
-        
+            yield from self.renderer.message("Please connect your GitHub account first")
+            return
+
         try:
             repos = self.github_manager.get_repositories()
             if not repos:
-                return "No repositories found"
-            
-            response = "Your GitHub repositories:\n\n"
-            for repo in repos:
-                response += f"📁 {repo['name']}\n"
-                if repo['description']:
-                    response += f"   {repo['description']}\n"
-                response += f"   Language: {repo['language'] or 'N/A'}\n"
-                response += f"   Stars: {repo['stars']} | Forks: {repo['forks']}\n\n"
-            
-            return response.strip()
+                yield from self.renderer.message("No repositories found")
+                return
+            yield from self.renderer.repositories(repos)
         except Exception as e:
-            return f"Error listing repositories: {str(e)}"
+            yield from self.renderer.error(f"Error listing repositories: {str(e)}")
 
     def _handle_repo_activity(self, repo_name: str, days: Optional[str] = None) -> str:
         """Handle showing repository activity"""
+        return render(self._render_repo_activity(repo_name, days))
+
+    def _render_repo_activity(self, repo_name: str, days: Optional[str] = None) -> Iterator[str]:
+        """Render a repository's recent commits, pull requests and issues"""
         if not self.github_manager:
-            return "Please connect your GitHub account first"
-        
+            yield from self.renderer.message("Please connect your GitHub account first")
+            return
+
         try:
             days_int = int(days) if days else 7
             activity = self.github_manager.get_repo_activity(repo_name, days_int)
-            
-            response = f"Activity for {repo_name} in the last {days_int} days:\n\n"
-            
-            # Show commits
-            response += "🔨 Recent Commits:\n"
-            for commit in activity['commits']:
-                response += f"   [{commit['sha']}] {commit['message']}\n"
-                response += f"   by {commit['author']} on {commit['date'][:10]}\n\n"
-            
-            # Show PRs
-            response += "🔄 Pull Requests:\n"
-            for pr in activity['pull_requests']:
-                response += f"   #{pr['number']} {pr['title']}\n"
-                response += f"   Status: {pr['state']}\n\n"
-            
-            # Show issues
-            response += "❗ Issues:\n"
-            for issue in activity['issues']:
-                response += f"   #{issue['number']} {issue['title']}\n"
-                response += f"   Status: {issue['state']}\n\n"
-            
-            return response.strip()
+            yield from self.renderer.repo_activity(repo_name, days_int, activity)
         except Exception as e:
-            return f"Error getting repository activity: {str(e)}"
+            yield from self.renderer.error(f"Error getting repository activity: {str(e)}")
 
     def _handle_create_issue(self, repo_name: str, issue_text: str) -> str:
         """Handle creating a GitHub issue"""
@@ -1,26 +1,48 @@
 """
 ChatService module for handling OpenAI GPT interactions and natural language commands
 """
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+import logging
 import os
 from dotenv import load_dotenv
-import re
+import time
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, AsyncIterator, Iterator, List, Any, Tuple
 
 from ..managers.airtable_manager import AirtableManager
-from ..managers.task_manager import TaskManager
+from ..managers.async_adapters import run_io
+from ..managers.task_manager import TASK_LIST_LIMIT, TaskManager
+from ..utils.command_grammar import COMMANDS
 from ..utils.date_parser import DateParser
+from ..utils.intent_classifier import IntentClassifier, command_file_examples
+from ..utils.metrics import instrumented, track
+from .response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+CHAT_MODEL = "gpt-3.5-turbo"
+EMBEDDING_MODEL = "text-embedding-3-small"
+CHAT_SYSTEM_PROMPT = "You are a helpful AI assistant for task and repository management. You can help with managing tasks and repositories, and answer questions about the system."
+WRITER_SYSTEM_PROMPT = "You are a helpful assistant that writes clear, well-structured GitHub issues and project text."
+
+def _cache_params(system_prompt: str, temperature: float, max_tokens: int) -> Dict[str, Any]:
+    """Generation settings a cached response is scoped by"""
+    return {'model': CHAT_MODEL, 'system_prompt': system_prompt,
+            'temperature': temperature, 'max_tokens': max_tokens}
 
 class ChatService:
-    def __init__(self, api_key: str):
-        """Initialize the chat service with OpenAI API key"""
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, airtable_manager: Optional[AirtableManager] = None,
+                 task_manager: Optional[TaskManager] = None,
+                 response_cache: Optional[ResponseCache] = None, client: Optional[Any] = None):
+        """Initialize the chat service with OpenAI API key, reusing managers when given"""
+        self.client = client or OpenAI(api_key=api_key)
+        self.response_cache = response_cache if response_cache is not None else self._create_response_cache()
         
         # Try to initialize managers
         try:
-            self.airtable = AirtableManager()
-            self.task_manager = TaskManager()
+            self.airtable = airtable_manager or AirtableManager()
+            self.task_manager = task_manager or TaskManager(self.airtable)
             self.has_airtable = True
         except ValueError as e:
             print(f"Warning: {str(e)}")
@@ -29,18 +51,22 @@ class ChatService:
         
         self.date_parser = DateParser()
         
-        # Command patterns
-        self.patterns = {
-            'add_task': re.compile(r'(?:add|create|new)\s+task:?\s+(.+?)(?:\s+by\s+(.+))?$', re.IGNORECASE),
-            'list_tasks': re.compile(r'(?:list|show|display)\s+(?:all\s+)?tasks(?:\s+(.+))?$', re.IGNORECASE),
-            'update_task': re.compile(r'(?:mark|set|update)\s+task\s+["\']?(.+?)["\']?\s+as\s+(.+)$', re.IGNORECASE),
-            'delete_task': re.compile(r'(?:delete|remove)\s+task\s+["\']?(.+?)["\']?$', re.IGNORECASE),
-            'due_tasks': re.compile(r'(?:show|list|what\s+is)\s+due(?:\s+in\s+(\d+)\s+days?)?$', re.IGNORECASE),
-            'add_repo': re.compile(r'(?:add|create|new)\s+repo(?:sitory)?\s+(.+)$', re.IGNORECASE),
-            'list_repos': re.compile(r'(?:list|show|display)\s+repo(?:sitorie)?s$', re.IGNORECASE),
-            'search_repos': re.compile(r'(?:search|find)\s+repo(?:sitorie)?s?\s+(.+)$', re.IGNORECASE)
+        # Commands are matched by the shared grammar; near misses (typos,
+        # paraphrases) are classified locally before the LLM
+        self.commands = COMMANDS
+        self.command_handlers = {
+            'add_task': self._add_task,
+            'list_tasks': self._list_tasks,
+            'update_task': self._update_task,
+            'delete_task': self._delete_task,
+            'due_tasks': self._due_tasks,
+            'list_repos': self._list_repos,
+            'add_repo': self._add_repo,
+            'search_repos': self._search_repos
         }
+        self.intents = IntentClassifier(command_file_examples(self._label_command), intents=self.command_handlers)
     
+    @instrumented('chat')
     def handle_natural_task_command(self, text: str) -> str:
         """Handle natural language task commands"""
         try:
@@ -49,67 +75,17 @@ class ChatService:
                 
             text = text.lower().strip()
             
-            # Add task
-            match = self.patterns['add_task'].match(text)
-            if match:
-                title, due_date_str = match.groups()
-                due_date = self.date_parser.parse_date(due_date_str) if due_date_str else None
-                self.task_manager.create_task(title, f"Created via command: {title}", due_date)
-                return f"Added task: {title}" + (f" (due {due_date})" if due_date else "")
-            
-            # List tasks
-            match = self.patterns['list_tasks'].match(text)
-            if match:
-                status = match.group(1)
-                tasks = self.task_manager.get_tasks_by_status(status)
-                if not tasks:
-                    return "No tasks found."
-                return "\n".join([f"- {task['fields']['Title']} (Status: {task['fields'].get('Status', 'Todo')}, Due: {task['fields'].get('Due Date', 'Not set')})" for task in tasks])
-            
-            # Update task
-            match = self.patterns['update_task'].match(text)
-            if match:
-                title, new_status = match.groups()
-                tasks = self.task_manager.get_tasks_by_status(None)
-                task_id = None
-                for task in tasks:
-                    if task['fields']['Title'].lower() == title.lower():
-                        task_id = task['id']
-                        break
-                if task_id:
-                    self.task_manager.update_task_status(task_id, new_status)
-                    return f"Updated task '{title}' status to {new_status}"
-                return f"Could not find task: {title}"
-            
-            # Delete task
-            match = self.patterns['delete_task'].match(text)
-            if match:
-                title = match.group(1)
-                tasks = self.task_manager.get_tasks_by_status(None)
-                task_id = None
-                for task in tasks:
-                    if task['fields']['Title'].lower() == title.lower():
-                        task_id = task['id']
-                        break
-                if task_id:
-                    self.task_manager.delete_task(task_id)
-                    return f"Deleted task: {title}"
-                return f"Could not find task: {title}"
-            
-            # Due tasks
-            match = self.patterns['due_tasks'].match(text)
-            if match:
-                days = int(match.group(1)) if match.group(1) else 7
-                tasks = self.task_manager.get_due_tasks(days)
-                if not tasks:
-                    return f"No tasks due in the next {days} days."
-                return "\n".join([f"- {task['fields']['Title']} (Due: {task['fields'].get('Due Date', 'Not set')})" for task in tasks])
+            route = self._route(text)
+            if route:
+                name, args = route
+                return self.command_handlers[name](**args)
             
             return self.chat_with_gpt(text)
             
         except Exception as e:
             return f"Error processing command: {str(e)}"
     
+    @instrumented('chat')
     def handle_repository_command(self, command: str, args: str) -> str:
         """Handle repository-related commands"""
         try:
@@ -130,46 +106,210 @@ class ChatService:
                     break
             
             if command == 'list':
-                repos = self.airtable.list_repositories()
-                if not repos:
-                    return "No repositories found."
-                return "\n".join([f"- {repo['fields'].get('Repository Name', 'Unnamed')}" for repo in repos])
+                return self._list_repos()
                 
             elif command == 'add':
                 if not args:
                     return "Please provide a repository name."
-                self.airtable.create_repository(args, "Added via command")
-                return f"Added repository: {args}"
+                return self._add_repo(args)
                 
             elif command == 'search':
                 if not args:
                     return "Please provide a search term."
-                repos = self.airtable.search_repositories(args)
-                if not repos:
-                    return f"No repositories found matching '{args}'."
-                return "\n".join([f"- {repo['fields'].get('Repository Name', 'Unnamed')}" for repo in repos])
+                return self._search_repos(args)
                 
             else:
+                intent = self.intents.classify(f"repo {command} {args}".strip())
+                if intent and intent.intent in ('list_repos', 'add_repo', 'search_repos'):
+                    return self.command_handlers[intent.intent](**intent.slots)
                 return f"Unknown repository command: {command}"
                 
         except Exception as e:
             return f"Error processing repository command: {str(e)}"
     
+    def handles(self, text: str) -> bool:
+        """Whether the text is a command answered without the LLM"""
+        return self._route(text.lower().strip()) is not None
+
+    def _route(self, text: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Find the handler name and arguments for an exact command or a classified near miss"""
+        command = self.commands.match(text)
+        if command:
+            return (command.name, command.slots) if command.name in self.command_handlers else None
+        intent = self.intents.classify(text)
+        return (intent.intent, intent.slots) if intent else None
+
+    def _label_command(self, text: str) -> Optional[str]:
+        """Get the name of the chat command matching the text"""
+        command = self.commands.match(text)
+        return command.name if command and command.name in self.command_handlers else None
+
+    def _add_task(self, title: str, due_date: Optional[str] = None) -> str:
+        """Add a task, parsing a natural language due date"""
+        parsed_date = self.date_parser.parse_date(due_date) if due_date else None
+        self.task_manager.create_task(title, f"Created via command: {title}", parsed_date)
+        return f"Added task: {title}" + (f" (due {parsed_date})" if parsed_date else "")
+
+    def _list_tasks(self, status: Optional[str] = None) -> str:
+        """List tasks, optionally by status"""
+        tasks = list(islice(self.task_manager.iter_tasks(status=status), TASK_LIST_LIMIT + 1))
+        if not tasks:
+            return "No tasks found."
+        response = "\n".join([f"- {task['fields']['Title']} (Status: {task['fields'].get('Status', 'Todo')}, Due: {task['fields'].get('Due Date', 'Not set')})" for task in tasks[:TASK_LIST_LIMIT]])
+        if len(tasks) > TASK_LIST_LIMIT:
+            response += "\n... and more; GET /tasks pages through the rest"
+        return response
+
+    def _update_task(self, title: str, status: str) -> str:
+        """Update the status of the task with the given title"""
+        task = self.task_manager.find_task_by_title(title)
+        if task:
+            self.task_manager.update_task_status(task['id'], status)
+            return f"Updated task '{title}' status to {status}"
+        return f"Could not find task: {title}"
+
+    def _delete_task(self, title: str) -> str:
+        """Delete the task with the given title"""
+        task = self.task_manager.find_task_by_title(title)
+        if task:
+            self.task_manager.delete_task(task['id'])
+            return f"Deleted task: {title}"
+        return f"Could not find task: {title}"
+
+    def _due_tasks(self, days: Optional[str] = None) -> str:
+        """List tasks due within a number of days, a week by default"""
+        days = int(days) if days else 7
+        tasks = self.task_manager.get_due_tasks(days)
+        if not tasks:
+            return f"No tasks due in the next {days} days."
+        return "\n".join([f"- {task['fields']['Title']} (Due: {task['fields'].get('Due Date', 'Not set')})" for task in tasks])
+
+    def _list_repos(self) -> str:
+        """List tracked repositories"""
+        repos = self.airtable.list_repositories()
+        if not repos:
+            return "No repositories found."
+        return "\n".join([f"- {repo['fields'].get('Repository Name', 'Unnamed')}" for repo in repos])
+
+    def _add_repo(self, name: str) -> str:
+        """Track a repository"""
+        self.airtable.create_repository(name, "Added via command")
+        return f"Added repository: {name}"
+
+    def _search_repos(self, term: str) -> str:
+        """Search tracked repositories"""
+        repos = self.airtable.search_repositories(term)
+        if not repos:
+            return f"No repositories found matching '{term}'."
+        return "\n".join([f"- {repo['fields'].get('Repository Name', 'Unnamed')}" for repo in repos])
+
+    @instrumented('chat')
     def chat_with_gpt(self, text: str) -> str:
         """Send a message to ChatGPT and get a response using the new API"""
         try:
+            return self._complete(text, CHAT_SYSTEM_PROMPT, temperature=0.7, max_tokens=150)
+        except Exception as e:
+            return f"Error communicating with ChatGPT: {str(e)}"
+
+    @instrumented('chat')
+    def stream_chat(self, text: str) -> Iterator[str]:
+        """Send a message to ChatGPT, yielding the response as tokens arrive"""
+        try:
+            yield from self._stream(text, CHAT_SYSTEM_PROMPT, temperature=0.7, max_tokens=150)
+        except Exception as e:
+            yield f"Error communicating with ChatGPT: {str(e)}"
+
+    @instrumented('chat')
+    def generate_text(self, prompt: str, max_tokens: int = 500) -> str:
+        """Generate longer-form text, such as an issue description, for a prompt"""
+        try:
+            return self._complete(prompt, WRITER_SYSTEM_PROMPT, temperature=0.7, max_tokens=max_tokens)
+        except Exception as e:
+            raise Exception(f"Error generating text: {str(e)}")
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Get hit rate and latency saved by the response cache"""
+        return self.response_cache.metrics() if self.response_cache else {}
+
+    def _complete(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> str:
+        """Run a chat completion, served from the response cache when possible"""
+        params = _cache_params(system_prompt, temperature, max_tokens)
+        cached = self._cache_get(prompt, params)
+        if cached is not None:
+            return cached
+
+        start = time.monotonic()
+        with track('openai', 'completion', kind='client', model=CHAT_MODEL, max_tokens=max_tokens):
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=CHAT_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        content = response.choices[0].message.content
+        if content:
+            self._cache_put(prompt, content, time.monotonic() - start, params)
+        return content
+
+    def _stream(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> Iterator[str]:
+        """Stream a chat completion, yielding a cached response whole when there is one"""
+        params = _cache_params(system_prompt, temperature, max_tokens)
+        cached = self._cache_get(prompt, params)
+        if cached is not None:
+            yield cached
+            return
+
+        start = time.monotonic()
+        parts = []
+        with track('openai', 'stream', kind='client', model=CHAT_MODEL, max_tokens=max_tokens):
+            stream = self.client.chat.completions.create(
+                model=CHAT_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are a helpful AI assistant for task and repository management. You can help with managing tasks and repositories, and answer questions about the system."},
-                    {"role": "user", "content": text}
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
                 ],
-                temperature=0.7,
-                max_tokens=150
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
             )
-            return response.choices[0].message.content
+            for chunk in stream:
+                token = chunk.choices[0].delta.content if chunk.choices else None
+                if token:
+                    parts.append(token)
+                    yield token
+        if parts:
+            self._cache_put(prompt, ''.join(parts), time.monotonic() - start, params)
+
+    def _cache_get(self, prompt: str, params: Dict[str, Any]) -> Optional[str]:
+        """Look up a cached response; a failing cache counts as a miss"""
+        if not self.response_cache:
+            return None
+        try:
+            return self.response_cache.get(prompt, **params)
         except Exception as e:
-            return f"Error communicating with ChatGPT: {str(e)}"
+            logger.warning(f"Error reading response cache: {str(e)}")
+            return None
+
+    def _cache_put(self, prompt: str, content: str, latency: float, params: Dict[str, Any]) -> None:
+        """Store a response; a failing cache skips the store"""
+        if not self.response_cache:
+            return
+        try:
+            self.response_cache.put(prompt, content, latency, **params)
+        except Exception as e:
+            logger.warning(f"Error writing response cache: {str(e)}")
+
+    def _create_response_cache(self) -> Optional[ResponseCache]:
+        """Build the response cache from the environment; OPENAI_RESPONSE_CACHE=off disables it"""
+        if os.getenv('OPENAI_RESPONSE_CACHE', '').lower() == 'off':
+            return None
+        embed = None
+        if os.getenv('OPENAI_CACHE_SIMILARITY'):
+            embed = lambda text: self.client.embeddings.create(model=EMBEDDING_MODEL, input=text).data[0].embedding
+        return ResponseCache(embed=embed)
 
     def is_healthy(self) -> bool:
         """Check if OpenAI API connection is healthy"""
@@ -178,6 +318,105 @@ class ChatService:
         except Exception as e:
             return False
 
+class AsyncChatService:
+    """Awaitable ChatService that talks to OpenAI through the async client
+
+    Completions and streams are awaited on the event loop. Commands, which
+    read and write Airtable, and response cache lookups run in the shared
+    I/O pool. The response cache is shared with the wrapped ChatService.
+    """
+
+    def __init__(self, chat_service: ChatService, client: Optional[Any] = None):
+        """Wrap ``chat_service``, with an AsyncOpenAI client for its API key unless given"""
+        self.chat_service = chat_service
+        self.client = client or AsyncOpenAI(api_key=chat_service.client.api_key)
+
+    async def handle_natural_task_command(self, text: str) -> str:
+        """Handle natural language task commands"""
+        if not self.chat_service.has_airtable or self.chat_service.handles(text):
+            return await run_io(self.chat_service.handle_natural_task_command, text)
+        return await self.chat_with_gpt(text.lower().strip())
+
+    async def chat_with_gpt(self, text: str) -> str:
+        """Send a message to ChatGPT and await the response"""
+        try:
+            return await self._complete(text, CHAT_SYSTEM_PROMPT, temperature=0.7, max_tokens=150)
+        except Exception as e:
+            return f"Error communicating with ChatGPT: {str(e)}"
+
+    async def stream_chat(self, text: str) -> AsyncIterator[str]:
+        """Send a message to ChatGPT, yielding the response as tokens arrive"""
+        try:
+            async for token in self._stream(text, CHAT_SYSTEM_PROMPT, temperature=0.7, max_tokens=150):
+                yield token
+        except Exception as e:
+            yield f"Error communicating with ChatGPT: {str(e)}"
+
+    async def generate_text(self, prompt: str, max_tokens: int = 500) -> str:
+        """Generate longer-form text, such as an issue description, for a prompt"""
+        try:
+            return await self._complete(prompt, WRITER_SYSTEM_PROMPT, temperature=0.7, max_tokens=max_tokens)
+        except Exception as e:
+            raise Exception(f"Error generating text: {str(e)}")
+
+    def is_healthy(self) -> bool:
+        """Check if OpenAI API connection is healthy"""
+        return self.chat_service.is_healthy()
+
+    async def _complete(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> str:
+        params = _cache_params(system_prompt, temperature, max_tokens)
+        cache = self.chat_service.response_cache
+        if cache:
+            cached = await run_io(self.chat_service._cache_get, prompt, params)
+            if cached is not None:
+                return cached
+
+        start = time.monotonic()
+        with track('openai', 'completion', kind='client', model=CHAT_MODEL, max_tokens=max_tokens):
+            response = await self.client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        content = response.choices[0].message.content
+        if cache and content:
+            await run_io(self.chat_service._cache_put, prompt, content, time.monotonic() - start, params)
+        return content
+
+    async def _stream(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> AsyncIterator[str]:
+        params = _cache_params(system_prompt, temperature, max_tokens)
+        cache = self.chat_service.response_cache
+        if cache:
+            cached = await run_io(self.chat_service._cache_get, prompt, params)
+            if cached is not None:
+                yield cached
+                return
+
+        start = time.monotonic()
+        parts = []
+        with track('openai', 'stream', kind='client', model=CHAT_MODEL, max_tokens=max_tokens):
+            stream = await self.client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            async for chunk in stream:
+                token = chunk.choices[0].delta.content if chunk.choices else None
+                if token:
+                    parts.append(token)
+                    yield token
+        if cache and parts:
+            await run_io(self.chat_service._cache_put, prompt, ''.join(parts), time.monotonic() - start, params)
+
 def main():
     load_dotenv()
     api_key = os.getenv('OPENAI_API_KEY')
@@ -0,0 +1,398 @@
+"""
+Reminder fan-out for many users' task bases
+"""
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import tzinfo
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import requests
+
+from ..managers.airtable_client import get_api
+from ..managers.rate_limiter import Priority, request_priority
+from ..managers.table_sync import TableSync
+from ..managers.task_cache import TaskCache
+from ..utils.logging_config import configure_logging
+from .reminders import ReminderScheduler, format_lead
+
+logger = logging.getLogger(__name__)
+
+
+def shard_of(user_id: str, shards: int) -> int:
+    """Stable shard for a user, the same in every process"""
+    return zlib.crc32(user_id.encode()) % shards
+
+
+class Account:
+    """A user who gets reminders for their tasks in an Airtable base"""
+
+    def __init__(self, user_id: str, base_id: str, timezone: str = 'UTC', webhook_url: Optional[str] = None):
+        self.user_id = user_id
+        self.base_id = base_id
+        self.timezone = ZoneInfo(timezone)
+        self.webhook_url = webhook_url
+
+    def __repr__(self) -> str:
+        return f"Account({self.user_id!r}, {self.base_id!r}, {str(self.timezone)!r})"
+
+
+def load_accounts(path: str) -> List[Account]:
+    """Read accounts from a JSON list of ``{"user", "base_id", "timezone", "webhook_url"}`` objects"""
+    with open(path) as f:
+        return [Account(entry['user'], entry['base_id'], entry.get('timezone', 'UTC'), entry.get('webhook_url'))
+                for entry in json.load(f)]
+
+
+class Reminder:
+    """One reminder for one account's task"""
+
+    def __init__(self, account: Account, task: Dict[str, Any], due_at: float, lead: float, now: float):
+        self.account = account
+        self.task = task
+        self.due_at = due_at
+        self.lead = lead
+        self.fired_at = now
+        self.time_left = max(due_at - now, 0.0)
+
+    @property
+    def key(self) -> str:
+        """Idempotency key: the same task, due instant and lead time is only reminded once"""
+        return f"{self.account.user_id}:{self.task['id']}:{int(self.due_at)}:{int(self.lead)}"
+
+    @property
+    def message(self) -> str:
+        title = self.task['fields'].get('Title', 'Untitled')
+        return f"🔔 {title} is due {format_lead(self.time_left)}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        fields = self.task['fields']
+        return {
+            'user': self.account.user_id,
+            'task_id': self.task['id'],
+            'title': fields.get('Title', 'Untitled'),
+            'due_date': fields.get('Due Date'),
+            'priority': fields.get('Priority', 'Medium'),
+            'message': self.message
+        }
+
+    def __repr__(self) -> str:
+        return f"Reminder({self.key!r})"
+
+
+class ReminderLedger:
+    """Idempotency keys of reminders already sent, persisted in SQLite
+
+    Claiming a key is a single ``INSERT OR IGNORE``, so restarts and other
+    processes sharing the file never send the same reminder twice. Keys
+    older than ``retention`` days are pruned on open.
+    """
+
+    def __init__(self, path: Optional[str] = None, retention: Optional[float] = None):
+        """Open or create the ledger at ``path``"""
+        self.path = path or os.getenv('REMINDER_LEDGER', 'reminders.sqlite')
+        self.retention = (retention if retention is not None
+                          else float(os.getenv('REMINDER_LEDGER_RETENTION', '30'))) * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        if self.path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sent (key TEXT PRIMARY KEY, user_id TEXT, sent_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sent_at ON sent (sent_at)")
+        self.prune()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM sent WHERE key = ?", (key,)).fetchone() is not None
+
+    def claim(self, key: str, user_id: str) -> bool:
+        """Record ``key`` as sent, returning False if it already was"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO sent (key, user_id, sent_at) VALUES (?, ?, ?)", (key, user_id, time.time())
+            )
+            return cursor.rowcount == 1
+
+    def release(self, key: str) -> None:
+        """Forget ``key`` so the reminder can be sent again, e.g. after a failed delivery"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sent WHERE key = ?", (key,))
+
+    def prune(self) -> int:
+        """Drop keys older than the retention period, returning how many were dropped"""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM sent WHERE sent_at < ?", (time.time() - self.retention,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LogSink:
+    """Write reminders to the log"""
+    name = 'log'
+
+    def send(self, reminder: Reminder) -> None:
+        logger.info(f"{reminder.account.user_id}: {reminder.message}")
+
+
+class WebhookSink:
+    """POST reminders as JSON to the account's webhook, or a default URL"""
+    name = 'webhook'
+
+    def __init__(self, url: Optional[str] = None, timeout: float = 5.0):
+        self.url = url or os.getenv('REMINDER_WEBHOOK_URL')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, reminder: Reminder) -> None:
+        url = reminder.account.webhook_url or self.url
+        if url:
+            self.session.post(url, json=reminder.to_dict(), timeout=self.timeout).raise_for_status()
+
+
+# Sinks by name for REMINDER_SINKS; any object with ``name`` and ``send(reminder)`` works
+SINKS: Dict[str, Callable[[], Any]] = {
+    'log': LogSink,
+    'webhook': WebhookSink
+}
+
+
+def create_sinks(names: str) -> List[Any]:
+    """Build the sinks named in a comma-separated list"""
+    try:
+        return [SINKS[name.strip()]() for name in names.split(',') if name.strip()]
+    except KeyError as e:
+        raise ValueError(f"Unknown reminder sink: {e.args[0]}")
+
+
+class BaseReminders(ReminderScheduler):
+    """Reminders for the accounts sharing one Airtable base
+
+    Tasks belong to the account named in ``owner_field``; in a base with a
+    single account, tasks without an owner belong to it. Date-only due dates
+    fall at ``due_time`` in the owner's timezone.
+    """
+
+    def __init__(self, engine: 'ReminderEngine', base_id: str, accounts: List[Account],
+                 cache: TaskCache, owner_field: str, **kwargs: Any):
+        self.engine = engine
+        self.base_id = base_id
+        self.accounts = {account.user_id: account for account in accounts}
+        self.owner_field = owner_field
+        super().__init__(cache, None, **kwargs)
+
+    def owner_of(self, task: Dict[str, Any]) -> Optional[Account]:
+        """The account a task belongs to"""
+        owner = task.get('fields', {}).get(self.owner_field)
+        if isinstance(owner, list):
+            owner = owner[0] if owner else None
+        if isinstance(owner, dict):
+            # Collaborator fields
+            owner = owner.get('email') or owner.get('id')
+        if owner:
+            return self.accounts.get(str(owner))
+        return next(iter(self.accounts.values())) if len(self.accounts) == 1 else None
+
+    def timezone_for(self, task: Dict[str, Any]) -> Optional[tzinfo]:
+        account = self.owner_of(task)
+        return account.timezone if account else None
+
+    def due_instant(self, task: Dict[str, Any]) -> Optional[float]:
+        if self.owner_of(task) is None:
+            return None
+        return super().due_instant(task)
+
+    def deliver(self, task: Dict[str, Any], due_at: float, lead: float, now: float) -> None:
+        account = self.owner_of(task)
+        if account:
+            self.engine.dispatch(Reminder(account, task, due_at, lead, now))
+
+
+class ReminderEngine:
+    """Deliver task reminders for many accounts
+
+    Accounts are grouped by base: each base has one task cache kept current
+    by incremental sync and one reminder heap, so upstream queries scale
+    with bases rather than users. Due reminders are handed to ``shards``
+    worker threads by a stable hash of the user, so one user's reminders
+    stay in order and a slow sink only holds up its shard. Each delivery to
+    each sink is claimed in the ledger first, so nothing is sent twice; a
+    reminder any sink failed to take is handed back to its base to retry.
+
+    To spread accounts across processes, give each process a different
+    ``shard`` of ``(index, count)``; it then only handles its users.
+    """
+
+    def __init__(self, accounts: List[Account], sinks: Optional[List[Any]] = None,
+                 ledger: Optional[ReminderLedger] = None, shards: Optional[int] = None,
+                 shard: Optional[Tuple[int, int]] = None,
+                 base_factory: Optional[Callable[[str], Tuple[TaskCache, Callable[[], None], float]]] = None,
+                 owner_field: Optional[str] = None, **scheduler_options: Any):
+        """Schedule reminders for ``accounts``
+
+        ``base_factory(base_id)`` returns the base's task cache, a refresh
+        function and the refresh interval; by default it syncs the Tasks
+        table of each base. Other keyword arguments go to each base's
+        ReminderScheduler.
+        """
+        index, count = shard or tuple(int(part) for part in os.getenv('REMINDER_PROCESS_SHARD', '0/1').split('/'))
+        self.accounts = [account for account in accounts if shard_of(account.user_id, count) == index]
+        self.sinks = sinks if sinks is not None else create_sinks(os.getenv('REMINDER_SINKS', 'log'))
+        self.ledger = ledger or ReminderLedger()
+        self.shards = shards or int(os.getenv('REMINDER_SHARDS', '4'))
+        self.stats = {'delivered': 0, 'duplicates': 0, 'failed': 0, 'retried': 0}
+        self._stats_lock = threading.Lock()
+        self._first_delivery: Optional[float] = None
+        self._last_delivery: Optional[float] = None
+        self._queues: List[queue.Queue] = [queue.Queue() for _ in range(self.shards)]
+        self._workers: List[threading.Thread] = []
+
+        by_base: Dict[str, List[Account]] = {}
+        for account in self.accounts:
+            by_base.setdefault(account.base_id, []).append(account)
+        owner_field = owner_field or os.getenv('REMINDER_OWNER_FIELD', 'Owner')
+        base_factory = base_factory or self._open_base
+        self.bases: Dict[str, BaseReminders] = {}
+        for base_id, base_accounts in by_base.items():
+            cache, refresh, interval = base_factory(base_id)
+            self.bases[base_id] = BaseReminders(self, base_id, base_accounts, cache, owner_field,
+                                                refresh=refresh, refresh_interval=interval, **scheduler_options)
+
+    @staticmethod
+    def _open_base(base_id: str) -> Tuple[TaskCache, Callable[[], None], float]:
+        api = get_api(os.getenv('AIRTABLE_API_KEY'), base_id)
+        table = api.table(base_id, os.getenv('AIRTABLE_TASKS_TABLE', 'Tasks'))
+        cache = TaskCache()
+        sync = TableSync(table, cache)
+
+        def refresh():
+            with request_priority(Priority.SCHEDULED):
+                sync.maybe_refresh()
+        return cache, refresh, sync.interval
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """Start the shard workers and every base's scheduler"""
+        if self._workers:
+            return
+        self._workers = [threading.Thread(target=self._work, args=(q,), name=f'reminders-shard-{i}', daemon=True)
+                         for i, q in enumerate(self._queues)]
+        for worker in self._workers:
+            worker.start()
+        for base in self.bases.values():
+            base.start()
+        logger.info(f"Reminder engine started: {len(self.accounts)} accounts, {len(self.bases)} bases, "
+                    f"{self.shards} shards")
+
+    def stop(self) -> None:
+        """Stop scheduling, deliver what is already queued, and stop the workers"""
+        for base in self.bases.values():
+            base.stop()
+        for q in self._queues:
+            q.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        logger.info("Reminder engine stopped")
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Fire every base's reminders due by ``now`` and wait until they are delivered"""
+        fired = sum(base.run_pending(now) for base in self.bases.values())
+        self.drain()
+        return fired
+
+    def drain(self) -> None:
+        """Wait until every queued reminder has been delivered"""
+        if self._workers:
+            for q in self._queues:
+                q.join()
+
+    def dispatch(self, reminder: Reminder) -> None:
+        """Queue a reminder on its user's shard, or deliver it now if the workers are not running"""
+        if self._workers:
+            self._queues[shard_of(reminder.account.user_id, self.shards)].put(reminder)
+        else:
+            self._deliver(reminder)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Delivery counts and throughput in reminders per second"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+            elapsed = ((self._last_delivery - self._first_delivery)
+                       if self._first_delivery is not None else 0.0)
+        stats.update({
+            'accounts': len(self.accounts),
+            'bases': len(self.bases),
+            'queued': sum(q.qsize() for q in self._queues),
+            'reminders_per_second': stats['delivered'] / elapsed if elapsed > 0 else 0.0
+        })
+        return stats
+
+    def _work(self, q: queue.Queue) -> None:
+        while True:
+            reminder = q.get()
+            try:
+                if reminder is None:
+                    return
+                self._deliver(reminder)
+            finally:
+                q.task_done()
+
+    def _deliver(self, reminder: Reminder) -> None:
+        failed = False
+        for sink in self.sinks:
+            key = f"{reminder.key}:{getattr(sink, 'name', type(sink).__name__)}"
+            if not self.ledger.claim(key, reminder.account.user_id):
+                self._count('duplicates')
+                continue
+            try:
+                sink.send(reminder)
+            except Exception as e:
+                self.ledger.release(key)
+                self._count('failed')
+                logger.error(f"Error sending reminder {key}: {str(e)}")
+                failed = True
+                continue
+            self._count('delivered')
+        base = self.bases.get(reminder.account.base_id)
+        if failed and base is not None and base.retry(reminder.task['id'], reminder.due_at, reminder.lead, reminder.fired_at):
+            self._count('retried')
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+            if name == 'delivered':
+                now = time.monotonic()
+                if self._first_delivery is None:
+                    self._first_delivery = now
+                self._last_delivery = now
+
+
+def main():
+    """Run the reminder engine for the accounts in REMINDER_ACCOUNTS"""
+    configure_logging()
+    engine = ReminderEngine(load_accounts(os.getenv('REMINDER_ACCOUNTS', 'accounts.json')))
+    engine.start()
+    try:
+        while True:
+            time.sleep(60)
+            logger.info(f"Reminder engine metrics: {engine.metrics()}")
+    except KeyboardInterrupt:
+        engine.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Event-driven task reminders scheduled from the task cache
+"""
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, tzinfo
+from datetime import time as time_of_day
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..managers.record_store import Changes, RecordStore
+
+logger = logging.getLogger(__name__)
+
+DURATION_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$', re.IGNORECASE)
+UNIT_SECONDS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_lead_times(spec: str) -> List[float]:
+    """Parse lead times such as ``"1d,1h,0"`` into seconds, longest first"""
+    leads = set()
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        match = DURATION_RE.match(part)
+        if not match:
+            raise ValueError(f"Invalid reminder lead time: {part.strip()}")
+        leads.add(float(match.group(1)) * UNIT_SECONDS[match.group(2).lower()])
+    return sorted(leads, reverse=True)
+
+
+def format_lead(seconds: float) -> str:
+    """Describe a lead time, e.g. ``in 1 day`` or ``now``"""
+    for unit, size in (('week', 604800), ('day', 86400), ('hour', 3600), ('minute', 60)):
+        if seconds >= size:
+            count = int(seconds // size)
+            return f"in {count} {unit}{'s' if count != 1 else ''}"
+    return "now"
+
+
+class ReminderScheduler:
+    """Fire a reminder for each task at each lead time before it is due
+
+    Upcoming reminders are kept in a min-heap of ``(fire at, due at, lead,
+    record id)`` built from the task cache and kept current by listening to
+    its changes, so creating, rescheduling, completing or deleting a task
+    costs one heap update and nothing re-reads the table. The scheduler
+    thread sleeps until the earliest reminder or until it is woken by a
+    change that moved it earlier.
+
+    Entries are invalidated lazily: a popped entry only fires if its due
+    instant is still the one tracked for the task. Date-only due dates are
+    taken to fall at ``due_time``. A task added after some of its lead times
+    have passed, including an open task that is already overdue, gets the
+    most recent of those reminders straight away, once.
+
+    A reminder whose delivery fails is put back on the heap after
+    ``retry_delay`` seconds, doubling on each further failure, until it has
+    been tried ``max_attempts`` times.
+    """
+
+    def __init__(self, cache: RecordStore, notify: Optional[Callable[[Dict[str, Any], float], None]],
+                 lead_times: Optional[List[float]] = None, due_time: Optional[time_of_day] = None,
+                 refresh: Optional[Callable[[], None]] = None, refresh_interval: Optional[float] = None,
+                 retry_delay: Optional[float] = None, max_attempts: Optional[int] = None,
+                 clock: Callable[[], float] = time.time):
+        """Schedule reminders for the tasks in ``cache``, calling ``notify(task, seconds until due)`` for each
+
+        ``refresh``, if given, is called every ``refresh_interval`` seconds to
+        pull changes made outside this process into the cache. Subclasses that
+        override ``deliver`` may pass no ``notify``.
+        """
+        self.cache = cache
+        self.notify = notify
+        self.lead_times = (lead_times if lead_times is not None
+                           else parse_lead_times(os.getenv('REMINDER_LEAD_TIMES', '1d,1h')))
+        self.due_time = due_time or time_of_day.fromisoformat(os.getenv('REMINDER_DUE_TIME', '09:00'))
+        self.refresh = refresh
+        self.refresh_interval = refresh_interval
+        self.retry_delay = (retry_delay if retry_delay is not None
+                            else float(os.getenv('REMINDER_RETRY_DELAY', '60')))
+        self.max_attempts = (max_attempts if max_attempts is not None
+                             else int(os.getenv('REMINDER_MAX_ATTEMPTS', '5')))
+        self.clock = clock
+        self.running = False
+        self.stats = {'scheduled': 0, 'fired': 0, 'stale': 0, 'retried': 0}
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[float, float, float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._fired: Dict[str, Set[Tuple[float, float]]] = {}
+        self._failures: Dict[str, Dict[Tuple[float, float], int]] = {}
+        self._next_refresh: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self.cache.add_listener(self._on_change)
+        self._on_change([(record['id'], record) for record in self.cache.all()])
+
+    def __len__(self) -> int:
+        """Number of reminders still to fire"""
+        with self._condition:
+            return sum(1 for entry in self._heap if self._is_current(entry))
+
+    def start(self) -> None:
+        """Start firing reminders on a background thread"""
+        with self._condition:
+            if self.running:
+                return
+            self.running = True
+        self._thread = threading.Thread(target=self._run, name='reminders', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and wait for it to exit"""
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        """Stop and detach from the cache"""
+        self.stop()
+        self.cache.remove_listener(self._on_change)
+
+    def next_reminder(self) -> Optional[float]:
+        """When the earliest pending reminder fires, as a Unix timestamp"""
+        with self._condition:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Fire every reminder due by ``now``, returning how many fired"""
+        now = self.clock() if now is None else now
+        due: List[Tuple[float, float, str]] = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                _, due_at, lead, record_id = entry
+                if not self._is_current(entry) or (due_at, lead) in self._fired.get(record_id, ()):
+                    self.stats['stale'] += 1
+                    continue
+                self._fired.setdefault(record_id, set()).add((due_at, lead))
+                due.append((due_at, lead, record_id))
+
+        count = 0
+        for due_at, lead, record_id in due:
+            task = self.cache.get(record_id)
+            if task is None:
+                continue
+            try:
+                self.deliver(task, due_at, lead, now)
+                count += 1
+            except Exception as e:
+                logger.error(f"Error sending reminder for {record_id}: {str(e)}")
+                self.retry(record_id, due_at, lead, now)
+        self.stats['fired'] += count
+        return count
+
+    def retry(self, record_id: str, due_at: float, lead: float, now: float) -> bool:
+        """Fire a reminder that failed at ``now`` again after a backoff, or False if it is out of attempts"""
+        with self._condition:
+            if self._due.get(record_id) != due_at:
+                return False
+            failures = self._failures.setdefault(record_id, {})
+            attempts = failures.get((due_at, lead), 0) + 1
+            if attempts >= self.max_attempts:
+                logger.error(f"Giving up on reminder for {record_id} after {attempts} attempts")
+                return False
+            failures[(due_at, lead)] = attempts
+            self._fired.get(record_id, set()).discard((due_at, lead))
+            heapq.heappush(self._heap, (now + self.retry_delay * 2 ** (attempts - 1), due_at, lead, record_id))
+            self.stats['retried'] += 1
+            self._condition.notify_all()
+            return True
+
+    def due_instant(self, task: Dict[str, Any]) -> Optional[float]:
+        """When an open task is due, as a Unix timestamp, or None if it has no due date or is done"""
+        fields = task.get('fields', {})
+        value = fields.get('Due Date')
+        if not value or (fields.get('Status') or '').strip().casefold() == 'done':
+            return None
+        zone = self.timezone_for(task)
+        try:
+            if 'T' in value:
+                due = datetime.fromisoformat(value.replace('Z', '+00:00'))
+                return (due.replace(tzinfo=zone) if due.tzinfo is None else due).timestamp()
+            return datetime.combine(date.fromisoformat(value), self.due_time, tzinfo=zone).timestamp()
+        except ValueError:
+            logger.warning(f"Ignoring unparseable due date {value!r} on task {task.get('id')}")
+            return None
+
+    def timezone_for(self, task: Dict[str, Any]) -> Optional[tzinfo]:
+        """Timezone for due dates without an offset; None means the server's local time"""
+        return None
+
+    def deliver(self, task: Dict[str, Any], due_at: float, lead: float, now: float) -> None:
+        """Send the reminder for ``task`` scheduled ``lead`` seconds before ``due_at``"""
+        self.notify(task, max(due_at - now, 0.0))
+
+    def _on_change(self, changes: Changes) -> None:
+        now = self.clock()
+        with self._condition:
+            head = self._heap[0][0] if self._heap else None
+            for record_id, record in changes:
+                self._reschedule(record_id, record, now)
+            if self._heap and (head is None or self._heap[0][0] < head):
+                self._condition.notify_all()
+            if len(self._heap) > 2 * len(self._due) * max(len(self.lead_times), 1) + 64:
+                self._compact()
+
+    def _reschedule(self, record_id: str, record: Optional[Dict[str, Any]], now: float) -> None:
+        due_at = self.due_instant(record) if record else None
+        previous = self._due.pop(record_id, None)
+        if due_at is None:
+            self._fired.pop(record_id, None)
+            self._failures.pop(record_id, None)
+            return
+        self._due[record_id] = due_at
+        if due_at == previous:
+            return
+
+        passed = [lead for lead in self.lead_times if due_at - lead <= now]
+        for lead in self.lead_times:
+            if due_at - lead > now:
+                heapq.heappush(self._heap, (due_at - lead, due_at, lead, record_id))
+                self.stats['scheduled'] += 1
+        if passed:
+            heapq.heappush(self._heap, (now, due_at, min(passed), record_id))
+            self.stats['scheduled'] += 1
+
+    def _is_current(self, entry: Tuple[float, float, float, str]) -> bool:
+        return self._due.get(entry[3]) == entry[1]
+
+    def _drop_stale(self) -> None:
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+            self.stats['stale'] += 1
+
+    def _compact(self) -> None:
+        self._heap = [entry for entry in self._heap if self._is_current(entry)]
+        heapq.heapify(self._heap)
+
+    def _timeout(self, now: float) -> Optional[float]:
+        self._drop_stale()
+        wakeups = []
+        if self._heap:
+            wakeups.append(self._heap[0][0])
+        if self.refresh and self.refresh_interval:
+            if self._next_refresh is None:
+                self._next_refresh = now
+            wakeups.append(self._next_refresh)
+        return max(min(wakeups) - now, 0.0) if wakeups else None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self.running:
+                    return
+                timeout = self._timeout(self.clock())
+                if timeout is None or timeout > 0:
+                    self._condition.wait(timeout)
+                if not self.running:
+                    return
+                now = self.clock()
+                refresh_due = (self.refresh is not None and self._next_refresh is not None
+                               and now >= self._next_refresh)
+                if refresh_due:
+                    self._next_refresh = now + self.refresh_interval
+            if refresh_due:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Error refreshing tasks for reminders: {str(e)}")
+            self.run_pending()
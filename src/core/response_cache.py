@@ -0,0 +1,182 @@
+"""
+Response cache for LLM completions with exact and semantic matching
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+WHITESPACE_RE = re.compile(r'\s+')
+TRAILING_PUNCTUATION = '?!. '
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Fold case, collapse whitespace and drop trailing punctuation"""
+    return WHITESPACE_RE.sub(' ', prompt.casefold()).strip().rstrip(TRAILING_PUNCTUATION)
+
+
+def _unit(vector: Sequence[float]) -> Tuple[float, ...]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return tuple(x / norm for x in vector)
+
+
+class ResponseCache:
+    """Bounded SQLite cache of completions keyed by prompt and generation settings
+
+    Entries are scoped by model, temperature, system prompt and token limit,
+    so a response is only reused for an identical request. Within a scope a
+    normalized prompt matches exactly; with an ``embed`` function, a prompt
+    whose embedding has cosine similarity of at least ``similarity`` with a
+    cached prompt is served that prompt's response. Entries expire after
+    ``ttl`` seconds and the least recently used are evicted past
+    ``max_entries``.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None,
+                 embed: Optional[Callable[[str], Sequence[float]]] = None,
+                 similarity: Optional[float] = None):
+        """Open (or create) the cache database at ``path``"""
+        self.path = path or os.getenv('OPENAI_RESPONSE_CACHE', 'response_cache.sqlite')
+        self.ttl = ttl or float(os.getenv('OPENAI_CACHE_TTL', '86400'))
+        self.max_entries = max_entries or int(os.getenv('OPENAI_CACHE_MAX_ENTRIES', '1000'))
+        self.similarity = similarity or float(os.getenv('OPENAI_CACHE_SIMILARITY', '0.95'))
+        # A lookup and the store after a miss embed the same prompt
+        self._embed = lru_cache(maxsize=256)(lambda text: _unit(embed(text))) if embed else None
+        # scope -> key -> unit embedding, loaded lazily per scope
+        self._vectors: Dict[str, Dict[str, Tuple[float, ...]]] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, scope TEXT, prompt TEXT, response TEXT,'
+            ' embedding TEXT, latency REAL, created REAL, last_used REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)')
+        self._conn.commit()
+        self.stats = {'hits': 0, 'semantic_hits': 0, 'misses': 0, 'latency_saved': 0.0}
+
+    @staticmethod
+    def scope(**params: Any) -> str:
+        """Hash of the generation settings a response depends on"""
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+    def get(self, prompt: str, **params: Any) -> Optional[str]:
+        """Get a cached response for ``prompt`` under the given settings"""
+        scope = self.scope(**params)
+        normalized = normalize_prompt(prompt)
+        key = self._key(scope, normalized)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, latency, created FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row and row[2] + self.ttl > now:
+                self._hit(key, row[1], now, 'hits')
+                return row[0]
+            if row:
+                self._delete([key])
+
+        if self._embed is None:
+            with self._lock:
+                return self._miss()
+        vector = self._embed(normalized)
+        with self._lock:
+            best_key, best_score = None, self.similarity
+            for other, other_vector in self._scope_vectors(scope).items():
+                score = sum(a * b for a, b in zip(vector, other_vector))
+                if score >= best_score:
+                    best_key, best_score = other, score
+            if best_key is None:
+                return self._miss()
+            row = self._conn.execute(
+                'SELECT response, latency, created FROM responses WHERE key = ?', (best_key,)
+            ).fetchone()
+            if row is None or row[2] + self.ttl <= now:
+                self._delete([best_key])
+                return self._miss()
+            self._hit(best_key, row[1], now, 'semantic_hits')
+            return row[0]
+
+    def put(self, prompt: str, response: str, latency: float = 0.0, **params: Any) -> None:
+        """Store the response to ``prompt``, with the seconds it took to generate"""
+        scope = self.scope(**params)
+        normalized = normalize_prompt(prompt)
+        key = self._key(scope, normalized)
+        vector = self._embed(normalized) if self._embed else None
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, scope, normalized, response, json.dumps(vector) if vector else None, latency, now, now)
+            )
+            if vector and scope in self._vectors:
+                self._vectors[scope][key] = vector
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._vectors.clear()
+
+    def metrics(self) -> Dict[str, float]:
+        """Hit rate, hit/miss counts and the generation time saved by hits"""
+        with self._lock:
+            stats = dict(self.stats)
+            entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        lookups = stats['hits'] + stats['semantic_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['semantic_hits']) / lookups if lookups else 0.0
+        stats['entries'] = entries
+        return stats
+
+    @staticmethod
+    def _key(scope: str, normalized: str) -> str:
+        return hashlib.sha256(f'{scope}:{normalized}'.encode()).hexdigest()
+
+    def _hit(self, key: str, latency: float, now: float, kind: str) -> None:
+        self.stats[kind] += 1
+        self.stats['latency_saved'] += latency or 0.0
+        self._conn.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+        self._conn.commit()
+
+    def _miss(self) -> None:
+        self.stats['misses'] += 1
+        return None
+
+    def _scope_vectors(self, scope: str) -> Dict[str, Tuple[float, ...]]:
+        vectors = self._vectors.get(scope)
+        if vectors is None:
+            rows = self._conn.execute(
+                'SELECT key, embedding FROM responses WHERE scope = ? AND embedding IS NOT NULL', (scope,)
+            ).fetchall()
+            vectors = self._vectors[scope] = {key: tuple(json.loads(embedding)) for key, embedding in rows}
+        return vectors
+
+    def _delete(self, keys: List[str]) -> None:
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', [(key,) for key in keys])
+        self._conn.commit()
+        for vectors in self._vectors.values():
+            for key in keys:
+                vectors.pop(key, None)
+
+    def _evict(self, now: float) -> None:
+        expired = [row[0] for row in self._conn.execute(
+            'SELECT key FROM responses WHERE created <= ?', (now - self.ttl,)
+        )]
+        overflow = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0] - len(expired) - self.max_entries
+        if overflow > 0:
+            expired += [row[0] for row in self._conn.execute(
+                'SELECT key FROM responses WHERE created > ? ORDER BY last_used LIMIT ?',
+                (now - self.ttl, overflow)
+            )]
+        if expired:
+            self._delete(expired)
@@ -0,0 +1,56 @@
+"""
+Shared Airtable API clients with pooled HTTP connections
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import ScheduledApi
+
+_clients: Dict[Tuple[str, str], ScheduledApi] = {}
+_clients_lock = threading.Lock()
+
+
+def _timeout() -> Optional[Tuple[float, float]]:
+    value = os.getenv('AIRTABLE_TIMEOUT')
+    if not value:
+        return None
+    connect, _, read = value.partition(',')
+    return (float(connect), float(read or connect))
+
+
+def create_api(api_key: str) -> ScheduledApi:
+    """Build a scheduled Airtable client with a tuned connection pool
+
+    ``AIRTABLE_POOL_SIZE`` caps the keep-alive connections per host; size it
+    to the number of threads per gunicorn worker. ``AIRTABLE_ENDPOINT_URL``
+    points the client at another server, such as a local stand-in.
+    """
+    pool_size = int(os.getenv('AIRTABLE_POOL_SIZE', '10'))
+    endpoint_url = os.getenv('AIRTABLE_ENDPOINT_URL', 'https://api.airtable.com')
+    api = ScheduledApi(api_key, timeout=_timeout(), endpoint_url=endpoint_url)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+    api.session.mount('https://', adapter)
+    api.session.mount('http://', adapter)
+    return api
+
+
+def get_api(api_key: str, base_id: str) -> ScheduledApi:
+    """Get the process-wide client for an API key and base"""
+    key = (api_key, base_id)
+    with _clients_lock:
+        api = _clients.get(key)
+        if api is None:
+            api = create_api(api_key)
+            _clients[key] = api
+        return api
+
+
+def close_all() -> None:
+    """Close every pooled client; gunicorn.conf.py calls this in each worker after the fork"""
+    with _clients_lock:
+        for api in _clients.values():
+            api.session.close()
+        _clients.clear()
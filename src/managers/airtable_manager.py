@@ -1,8 +1,17 @@
 from dotenv import load_dotenv
+import logging
 import os
+from concurrent.futures import Future
 from datetime import datetime
-from pyairtable import Api
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
+
+from .airtable_client import get_api
+from .repository_index import RepositoryIndex
+from .table_sync import TableSync
+from .write_queue import WriteBehindQueue
+from ..utils.metrics import instrumented
+
+logger = logging.getLogger(__name__)
 
 class AirtableManager:
     def __init__(self):
@@ -15,11 +24,24 @@ class AirtableManager:
         if not all([self.api_key, self.base_id, self.table_name]):
             raise ValueError("Missing required Airtable credentials in .env file")
             
-        self.api = Api(self.api_key)
+        self.api = get_api(self.api_key, self.base_id)
         self.table = self.api.table(self.base_id, self.table_name)
+        self.store = RepositoryIndex()
+        self.local_search = os.getenv('AIRTABLE_LOCAL_SEARCH', 'true').lower() != 'false'
+        self.sync = TableSync(self.table, self.store)
+        self.writes = WriteBehindQueue(self.table, store=self.store)
+
+    @instrumented('airtable')
+    def flush(self) -> None:
+        """Send all deferred repository writes to Airtable now"""
+        self.writes.flush()
 
-    def create_repository(self, name: str, description: str) -> Dict[str, Any]:
-        """Create a new repository record in Airtable"""
+    @instrumented('airtable')
+    def create_repository(self, name: str, description: str, defer: bool = False) -> Union[Dict[str, Any], Future]:
+        """Create a new repository record in Airtable
+
+        With ``defer=True`` the write is batched and a Future is returned.
+        """
         try:
             fields = {
                 "Repository Name": name,
@@ -28,62 +50,104 @@ class AirtableManager:
                 "Last Updated": datetime.now().isoformat()
             }
             
+            if defer:
+                return self.writes.create(fields)
             record = self.table.create(fields)
+            self.store.upsert(record)
             return record
         except Exception as e:
             raise Exception(f"Error creating repository: {str(e)}")
 
+    @instrumented('airtable')
     def get_repository(self, record_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a specific repository by ID"""
         try:
-            return self.table.get(record_id)
+            self.sync.maybe_refresh()
+            record = self.store.get(record_id)
+            if record is None:
+                record = self.table.get(record_id)
+                self.store.upsert(record)
+            return record
         except Exception as e:
             raise Exception(f"Error retrieving repository: {str(e)}")
 
+    @instrumented('airtable')
     def get_repository_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a repository by its name"""
         try:
-            formula = f"LOWER({{Repository Name}}) = LOWER('{name}')"
-            records = self.table.all(formula=formula)
+            records = self.get_repositories_by_name(name)
             return records[0] if records else None
         except Exception as e:
             raise Exception(f"Error getting repository by name: {str(e)}")
 
+    @instrumented('airtable')
     def get_repositories_by_name(self, name: str) -> List[Dict[str, Any]]:
         """Get all repositories with a given name"""
         try:
-            formula = f"LOWER({{Repository Name}}) = LOWER('{name}')"
-            return self.table.all(formula=formula)
+            self.sync.maybe_refresh()
+            wanted = name.lower()
+            return [
+                record for record in self.store.all()
+                if record.get('fields', {}).get('Repository Name', '').lower() == wanted
+            ]
         except Exception as e:
             raise Exception(f"Error getting repositories by name: {str(e)}")
 
-    def update_repository(self, record_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
-        """Update an existing repository"""
+    @instrumented('airtable')
+    def update_repository(self, record_id: str, fields: Dict[str, Any],
+                          defer: bool = False) -> Union[Dict[str, Any], Future]:
+        """Update an existing repository
+
+        With ``defer=True`` the write is batched and a Future is returned.
+        """
         try:
             fields["Last Updated"] = datetime.now().isoformat()
-            return self.table.update(record_id, fields)
+            if defer:
+                return self.writes.update(record_id, fields)
+            record = self.table.update(record_id, fields)
+            self.store.upsert(record)
+            return record
         except Exception as e:
             raise Exception(f"Error updating repository: {str(e)}")
 
-    def delete_repository(self, record_id: str) -> bool:
-        """Delete a repository"""
+    @instrumented('airtable')
+    def delete_repository(self, record_id: str, defer: bool = False) -> Union[bool, Future]:
+        """Delete a repository
+
+        With ``defer=True`` the write is batched and a Future is returned.
+        """
         try:
+            if defer:
+                return self.writes.delete(record_id)
             self.table.delete(record_id)
+            self.store.remove(record_id)
             return True
         except Exception as e:
             raise Exception(f"Error deleting repository: {str(e)}")
 
+    @instrumented('airtable')
     def list_repositories(self, formula: Optional[str] = None) -> List[Dict[str, Any]]:
         """List all repositories, optionally filtered by formula"""
         try:
-            return self.table.all(formula=formula)
+            if formula:
+                return self.table.all(formula=formula)
+            self.sync.maybe_refresh()
+            return self.store.all()
         except Exception as e:
             raise Exception(f"Error listing repositories: {str(e)}")
             
+    @instrumented('airtable')
     def search_repositories(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search repositories by name or description"""
+        """Search repositories by name or description, best match first"""
+        if self.local_search:
+            try:
+                self.sync.maybe_refresh()
+                return self.store.search(search_term)
+            except Exception as e:
+                logger.warning(f"Error searching local repository index, searching Airtable instead: {str(e)}")
         try:
-            formula = f"OR(FIND(LOWER('{search_term}'), LOWER({{Repository Name}})) > 0, FIND(LOWER('{search_term}'), LOWER({{Description}})) > 0)"
+            term = search_term.replace('\\', '\\\\').replace("'", "\\'")
+            formula = f"OR(FIND(LOWER('{term}'), LOWER({{Repository Name}})) > 0, FIND(LOWER('{term}'), LOWER({{Description}})) > 0)"
             return self.table.all(formula=formula)
         except Exception as e:
             raise Exception(f"Error searching repositories: {str(e)}")
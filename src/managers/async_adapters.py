@@ -0,0 +1,119 @@
+"""
+Async variants of the managers for the ASGI server
+"""
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+
+from .airtable_manager import AirtableManager
+from .github_manager import GitHubManager
+from .task_manager import TaskManager
+
+T = TypeVar('T')
+
+# Blocking upstream calls from the event loop run here; the pool size bounds
+# how many Airtable/GitHub requests one process keeps in flight
+_io_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv('ASGI_IO_WORKERS', '256')), thread_name_prefix='asgi-io'
+)
+
+
+async def run_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call in the shared I/O pool without blocking the event loop
+
+    The call sees the caller's context variables, such as its request
+    priority and trace span.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_io_pool, functools.partial(context.run, fn, *args, **kwargs))
+
+
+async def iterate_io(fn: Callable[..., Iterator[T]], *args: Any, **kwargs: Any) -> AsyncIterator[T]:
+    """Run a blocking generator in the shared I/O pool, yielding its items as they are produced
+
+    The whole generator runs in one pool thread with the caller's context
+    variables, so context managers inside it enter and exit in the same context.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def produce() -> None:
+        try:
+            for item in fn(*args, **kwargs):
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    future = loop.run_in_executor(_io_pool, functools.partial(context.run, produce))
+    while True:
+        item = await queue.get()
+        if item is done:
+            break
+        yield item
+    # Re-raise anything the generator raised
+    await future
+
+
+def _delegate(name: str) -> Callable[..., Any]:
+    async def method(self, *args: Any, **kwargs: Any) -> Any:
+        return await run_io(getattr(self.manager, name), *args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = f"Awaitable ``{name}`` of the wrapped manager"
+    return method
+
+
+class AsyncManager:
+    """Awaitable facade over a synchronous manager
+
+    Each method runs the wrapped manager's method in the shared I/O pool, so
+    the manager's caches, batching and rate limits are shared with the
+    synchronous app while the event loop stays free.
+    """
+
+    def __init__(self, manager: Any):
+        """Wrap ``manager``"""
+        self.manager = manager
+
+
+class AsyncTaskManager(AsyncManager):
+    manager: TaskManager
+
+    create_task = _delegate('create_task')
+    update_task_status = _delegate('update_task_status')
+    delete_task = _delegate('delete_task')
+    get_tasks_by_status = _delegate('get_tasks_by_status')
+    find_task_by_title = _delegate('find_task_by_title')
+    get_due_tasks = _delegate('get_due_tasks')
+    get_task_details = _delegate('get_task_details')
+    flush = _delegate('flush')
+
+
+class AsyncAirtableManager(AsyncManager):
+    manager: AirtableManager
+
+    create_repository = _delegate('create_repository')
+    update_repository = _delegate('update_repository')
+    delete_repository = _delegate('delete_repository')
+    list_repositories = _delegate('list_repositories')
+    get_repository = _delegate('get_repository')
+    get_repository_by_name = _delegate('get_repository_by_name')
+    get_repositories_by_name = _delegate('get_repositories_by_name')
+    search_repositories = _delegate('search_repositories')
+    is_healthy = _delegate('is_healthy')
+    flush = _delegate('flush')
+
+
+class AsyncGitHubManager(AsyncManager):
+    manager: GitHubManager
+
+    get_repositories = _delegate('get_repositories')
+    get_repo_activity = _delegate('get_repo_activity')
+    create_issue = _delegate('create_issue')
+    update_issue = _delegate('update_issue')
+    is_healthy = _delegate('is_healthy')
@@ -0,0 +1,142 @@
+"""
+Streaming repository activity that only pages through the requested window
+"""
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .github_client import GitHubClient
+
+PAGE_SIZE = 100
+
+_pools: Optional[Tuple[ThreadPoolExecutor, ThreadPoolExecutor]] = None
+_pools_lock = threading.Lock()
+
+
+def get_pools() -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+    """The process-wide stream and page pools, created on first concurrent use
+
+    Streams and their page fetches run in separate pools so a stream waiting
+    on its pages can never occupy the workers those pages need.
+    """
+    global _pools
+    with _pools_lock:
+        if _pools is None:
+            _pools = (
+                ThreadPoolExecutor(max_workers=int(os.getenv('GITHUB_STREAM_WORKERS', '12')),
+                                   thread_name_prefix='github-stream'),
+                ThreadPoolExecutor(max_workers=int(os.getenv('GITHUB_PAGE_WORKERS', '16')),
+                                   thread_name_prefix='github-page')
+            )
+        return _pools
+
+
+def shutdown_pools() -> None:
+    """Stop the pools' threads once their work is done; the next concurrent fetch starts new ones"""
+    global _pools
+    with _pools_lock:
+        pools, _pools = _pools, None
+    for pool in pools or ():
+        pool.shutdown(wait=True)
+
+
+def iso_timestamp(timestamp: str) -> str:
+    """Normalize a GitHub timestamp to UTC isoformat with an explicit offset"""
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).astimezone(timezone.utc).isoformat()
+
+
+def format_commit(commit: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a commit"""
+    return {
+        'sha': commit['sha'][:7],
+        'message': commit['commit']['message'],
+        'author': commit['commit']['author']['name'],
+        'date': iso_timestamp(commit['commit']['author']['date'])
+    }
+
+
+def format_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a pull request or issue"""
+    return {
+        'number': item['number'],
+        'title': item['title'],
+        'state': item['state'],
+        'created_at': iso_timestamp(item['created_at']),
+        'updated_at': iso_timestamp(item['updated_at'])
+    }
+
+
+class ActivityStream:
+    """Lazily fetch commits, pull requests and issues updated since a cutoff
+
+    Each stream stops paginating as soon as it leaves the window, so the cost
+    is proportional to the activity in the window rather than to the
+    repository's history. In concurrent mode the three streams are fetched in
+    parallel, as are the pages of the streams filtered server-side.
+    """
+
+    def __init__(self, client: GitHubClient, repo_name: str, since: datetime, concurrent: bool = False):
+        """Stream activity for ``repo_name`` since the timezone-aware ``since``"""
+        self.client = client
+        self.repo_name = repo_name
+        self.pools = get_pools() if concurrent else None
+        self.prefetch: Optional[Executor] = self.pools[1] if self.pools else None
+        self.since = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+        # Query from the start of the day so the URL, and its cached ETag, stay
+        # stable across calls; the exact window is applied locally
+        self.since_param = since.strftime('%Y-%m-%dT00:00:00Z')
+
+    def commits(self) -> Iterator[Dict[str, Any]]:
+        """Commits authored in the window, newest first"""
+        for commit in self.client.iter_items(
+            f'/repos/{self.repo_name}/commits', {'since': self.since_param, 'per_page': PAGE_SIZE},
+            self.prefetch
+        ):
+            if commit['commit']['author']['date'] >= self.since:
+                yield format_commit(commit)
+
+    def pull_requests(self) -> Iterator[Dict[str, Any]]:
+        """Pull requests updated in the window, most recently updated first"""
+        # The pulls endpoint has no since filter; stop at the first stale entry
+        for pr in self.client.iter_items(
+            f'/repos/{self.repo_name}/pulls',
+            {'state': 'all', 'sort': 'updated', 'direction': 'desc', 'per_page': PAGE_SIZE}
+        ):
+            if pr['updated_at'] < self.since:
+                return
+            yield format_item(pr)
+
+    def issues(self) -> Iterator[Dict[str, Any]]:
+        """Issues, excluding pull requests, updated in the window"""
+        for issue in self.client.iter_items(
+            f'/repos/{self.repo_name}/issues',
+            {'state': 'all', 'sort': 'updated', 'direction': 'desc',
+             'since': self.since_param, 'per_page': PAGE_SIZE},
+            self.prefetch
+        ):
+            if issue['updated_at'] < self.since:
+                return
+            # Pull requests are also returned as issues; they are listed above
+            if 'pull_request' in issue:
+                continue
+            yield format_item(issue)
+
+    def collect(self) -> Dict[str, Any]:
+        """Materialize all three streams in the GitHubManager activity shape"""
+        if self.pools is not None:
+            stream_pool = self.pools[0]
+            commits = stream_pool.submit(lambda: list(self.commits()))
+            pulls = stream_pool.submit(lambda: list(self.pull_requests()))
+            issues = stream_pool.submit(lambda: list(self.issues()))
+            return {
+                'commits': commits.result(),
+                'pull_requests': pulls.result(),
+                'issues': issues.result()
+            }
+        return {
+            'commits': list(self.commits()),
+            'pull_requests': list(self.pull_requests()),
+            'issues': list(self.issues())
+        }
@@ -0,0 +1,319 @@
+"""
+GitHub REST client with a persistent conditional-request cache
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from ..utils.metrics import track
+
+GITHUB_API_URL = 'https://api.github.com'
+LINK_RE = re.compile(r'<([^>]+)>;\s*rel="(\w+)"')
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class HTTPCache:
+    """SQLite store of response bodies and validators, keyed by token and URL
+
+    URLs carry parameters such as ``since`` that change from day to day, so
+    entries not used for ``ttl`` seconds are dropped and the least recently
+    used are evicted past ``max_entries``, both checked on write.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """Open (or create) the cache database at ``path``"""
+        self.path = path
+        self.ttl = ttl or float(os.getenv('GITHUB_CACHE_TTL', '604800'))
+        self.max_entries = max_entries or int(os.getenv('GITHUB_CACHE_MAX_ENTRIES', '10000'))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,'
+            ' link TEXT, body TEXT, expires REAL, last_used REAL)'
+        )
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(responses)')]
+        if 'last_used' not in columns:
+            # Caches written before entries were evicted
+            self._conn.execute('ALTER TABLE responses ADD COLUMN last_used REAL')
+            self._conn.execute('UPDATE responses SET last_used = ?', (time.time(),))
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)')
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the cached entry for ``key``"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, link, body, expires FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute('UPDATE responses SET last_used = ? WHERE key = ?', (time.time(), key))
+                self._conn.commit()
+        if row is None:
+            return None
+        etag, last_modified, link, body, expires = row
+        return {'etag': etag, 'last_modified': last_modified, 'link': link,
+                'body': json.loads(body), 'expires': expires}
+
+    def put(self, key: str, etag: Optional[str], last_modified: Optional[str],
+            link: Optional[str], body: Any, expires: float) -> None:
+        """Store a response, evicting stale and least recently used entries"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, etag, last_modified, link, json.dumps(body), expires, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def touch(self, key: str, expires: float) -> None:
+        """Extend the freshness of an entry after a 304"""
+        with self._lock:
+            self._conn.execute('UPDATE responses SET expires = ?, last_used = ? WHERE key = ?',
+                               (expires, time.time(), key))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute('DELETE FROM responses WHERE last_used <= ?', (now - self.ttl,))
+        overflow = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)',
+                (overflow,)
+            )
+
+
+def cache_path(path: Optional[str] = None) -> str:
+    """Where the cache lives: ``path`` or ``GITHUB_HTTP_CACHE``, relative to ``GITHUB_CACHE_DIR``
+
+    The directory defaults to ``$XDG_CACHE_HOME/ai-accountability-bot`` (or
+    ``~/.cache/...``) rather than the working directory, and is created on
+    first use.
+    """
+    path = path or os.getenv('GITHUB_HTTP_CACHE', 'github_cache.sqlite')
+    if path == ':memory:' or os.path.isabs(path):
+        return path
+    cache_dir = os.path.expanduser(os.getenv('GITHUB_CACHE_DIR') or os.path.join(
+        os.getenv('XDG_CACHE_HOME') or os.path.join('~', '.cache'), 'ai-accountability-bot'
+    ))
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, path)
+
+
+_caches: Dict[str, HTTPCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(path: Optional[str] = None) -> HTTPCache:
+    """Get the process-wide cache for ``path`` (``GITHUB_HTTP_CACHE`` by default)"""
+    path = cache_path(path)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = HTTPCache(path)
+        return cache
+
+
+class GitHubClient:
+    """Minimal GitHub REST client that revalidates cached responses
+
+    Fresh entries (within the response's Cache-Control max-age) are served
+    without a request. Stale entries are revalidated with If-None-Match /
+    If-Modified-Since; GitHub's 304 replies do not count against the rate
+    limit.
+
+    The client is safe to share between threads. At most ``max_concurrency``
+    requests are in flight at once, and a secondary rate limit hit by one
+    thread pauses all of them until GitHub's Retry-After has passed.
+    """
+
+    def __init__(self, access_token: str, cache: Optional[HTTPCache] = None,
+                 base_url: str = GITHUB_API_URL, timeout: float = 30.0,
+                 max_concurrency: Optional[int] = None, max_retry_wait: float = 60.0):
+        """Create a client for ``access_token``"""
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retry_wait = max_retry_wait
+        self._inflight = threading.BoundedSemaphore(
+            max_concurrency or int(os.getenv('GITHUB_MAX_CONCURRENCY', '4'))
+        )
+        self._blocked_until = 0.0
+        self.cache = cache if cache is not None else get_cache()
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {access_token}',
+            'Accept': 'application/vnd.github+json',
+            'X-GitHub-Api-Version': '2022-11-28',
+        })
+        self._token_hash = hashlib.sha256(access_token.encode()).hexdigest()[:16]
+        self.rate_limit_remaining: Optional[int] = None
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0}
+        self._stats_lock = threading.Lock()
+
+    def url(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build an absolute URL with deterministically ordered query params"""
+        url = path if path.startswith('http') else f"{self.base_url}/{path.lstrip('/')}"
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return url
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, Optional[str]]:
+        """GET a URL, returning the decoded body and the next-page URL if any"""
+        body, links = self.get_page(self.url(path, params))
+        return body, links.get('next')
+
+    def get_page(self, url: str) -> Tuple[Any, Dict[str, str]]:
+        """GET an absolute URL, returning the decoded body and its Link relations"""
+        key = f'{self._token_hash}:{url}'
+        cached = self.cache.get(key)
+        if cached and cached['expires'] > time.time():
+            self._count('hits')
+            return cached['body'], _links(cached['link'])
+
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        response = self._send('GET', url, headers)
+
+        if response.status_code == 304 and cached:
+            self._count('not_modified')
+            self.cache.touch(key, _expires(response))
+            return cached['body'], _links(cached['link'])
+
+        response.raise_for_status()
+        body = response.json()
+        link = response.headers.get('Link')
+        self._count('misses')
+        if response.headers.get('ETag') or response.headers.get('Last-Modified'):
+            self.cache.put(key, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                           link, body, _expires(response))
+        return body, _links(link)
+
+    def iter_pages(self, path: str, params: Optional[Dict[str, Any]] = None,
+                   prefetch: Optional[Executor] = None) -> Iterator[Any]:
+        """Yield each page of a paginated listing, following Link headers
+
+        With a ``prefetch`` executor, the remaining pages named by the first
+        page's ``rel="last"`` link are fetched concurrently and yielded in order.
+        """
+        body, links = self.get_page(self.url(path, params))
+        yield body
+        if prefetch is not None and 'last' in links:
+            futures = [prefetch.submit(self.get_page, url) for url in _page_urls(links['last'])]
+            try:
+                for future in futures:
+                    yield future.result()[0]
+            finally:
+                for future in futures:
+                    future.cancel()
+            return
+        url = links.get('next')
+        while url:
+            body, links = self.get_page(url)
+            yield body
+            url = links.get('next')
+
+    def iter_items(self, path: str, params: Optional[Dict[str, Any]] = None,
+                   prefetch: Optional[Executor] = None) -> Iterator[Any]:
+        """Yield every item across the pages of a listing"""
+        for page in self.iter_pages(path, params, prefetch):
+            yield from page
+
+    def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a GraphQL query, returning its ``data``"""
+        response = self._send('POST', f'{self.base_url}/graphql', {},
+                              {'query': query, 'variables': variables or {}})
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors'):
+            raise Exception('; '.join(error.get('message', str(error)) for error in payload['errors']))
+        return payload['data']
+
+    def _send(self, method: str, url: str, headers: Dict[str, str],
+              json: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """Send a request, waiting out secondary rate limits"""
+        deadline = time.monotonic() + self.max_retry_wait
+        while True:
+            pause = self._blocked_until - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+            with self._inflight, track('github_api', method.upper(), kind='client') as active:
+                response = self.session.request(method, url, headers=headers, json=json, timeout=self.timeout)
+                if active:
+                    active.set_attribute('url.full', url)
+                    active.set_attribute('http.response.status_code', response.status_code)
+            self._track_rate_limit(response)
+            delay = _retry_delay(response)
+            if delay is None or time.monotonic() + delay > deadline:
+                return response
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _track_rate_limit(self, response: requests.Response) -> None:
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            self.rate_limit_remaining = int(remaining)
+
+
+def _links(link: Optional[str]) -> Dict[str, str]:
+    """Parse a Link header into a rel -> URL map"""
+    return {rel: url for url, rel in LINK_RE.findall(link or '')}
+
+
+def _page_urls(last_url: str) -> List[str]:
+    """URLs for pages 2 through the page named by a ``rel="last"`` link"""
+    parts = urlsplit(last_url)
+    query = dict(parse_qsl(parts.query))
+    last_page = int(query.get('page', 1))
+    urls = []
+    for page in range(2, last_page + 1):
+        query['page'] = str(page)
+        urls.append(urlunsplit(parts._replace(query=urlencode(sorted(query.items())))))
+    return urls
+
+
+def _retry_delay(response: requests.Response) -> Optional[float]:
+    """Seconds to wait before retrying a rate-limited response, or None"""
+    if response.status_code not in (403, 429):
+        return None
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is not None:
+        return float(retry_after)
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        reset = float(response.headers.get('X-RateLimit-Reset', time.time()))
+        return max(reset - time.time(), 0) + 1
+    if response.status_code == 429 or 'secondary rate limit' in response.text.lower():
+        # GitHub asks clients to wait at least a minute without a Retry-After
+        return 60.0
+    return None
+
+
+def _expires(response: requests.Response) -> float:
+    match = MAX_AGE_RE.search(response.headers.get('Cache-Control', ''))
+    return time.time() + (int(match.group(1)) if match else 0)
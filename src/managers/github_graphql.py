@@ -0,0 +1,199 @@
+"""
+GitHub GraphQL backend fetching repositories and activity in batched queries
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .github_activity import iso_timestamp
+from .github_manager import GitHubManager
+from ..utils.metrics import instrumented
+
+REPOSITORIES_QUERY = """
+query($first: Int!, $after: String) {
+  viewer {
+    repositories(first: $first, after: $after,
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name nameWithOwner description url
+        primaryLanguage { name }
+        stargazerCount forkCount
+      }
+    }
+  }
+  rateLimit { cost remaining }
+}
+"""
+
+PAGE_INFO = 'pageInfo { hasNextPage endCursor }'
+STREAMS = ('commits', 'pull_requests', 'issues')
+
+
+def _stream_selection(stream: str, first: int, cursor_var: Optional[str]) -> str:
+    after = f', after: ${cursor_var}' if cursor_var else ''
+    if stream == 'commits':
+        return (
+            'defaultBranchRef { target { ... on Commit { '
+            f'history(first: {first}, since: $since{after}) {{ {PAGE_INFO} '
+            'nodes { oid message author { name date } } } } } }'
+        )
+    if stream == 'pull_requests':
+        return (
+            f'pullRequests(first: {first}, orderBy: {{field: UPDATED_AT, direction: DESC}}{after}) '
+            f'{{ {PAGE_INFO} nodes {{ number title state createdAt updatedAt }} }}'
+        )
+    return (
+        f'issues(first: {first}, orderBy: {{field: UPDATED_AT, direction: DESC}}, '
+        f'filterBy: {{since: $issuesSince}}{after}) '
+        f'{{ {PAGE_INFO} nodes {{ number title state createdAt updatedAt }} }}'
+    )
+
+
+def _connection(repo: Dict[str, Any], stream: str) -> Optional[Dict[str, Any]]:
+    if stream == 'commits':
+        branch = repo.get('defaultBranchRef')
+        return branch['target'].get('history') if branch and branch.get('target') else None
+    return repo['pullRequests'] if stream == 'pull_requests' else repo['issues']
+
+
+def _split_name(repo_name: str) -> Tuple[str, str]:
+    owner, _, name = repo_name.partition('/')
+    if not name:
+        raise ValueError(f"Repository name must be owner/name: {repo_name}")
+    return owner, name
+
+
+class GitHubGraphQLManager(GitHubManager):
+    """GitHubManager backend that reads through the GraphQL API
+
+    Repositories and the activity of many repositories are fetched in a few
+    paginated queries instead of one REST stream per repository and kind.
+    Page sizes shrink as more connections share a query, and again when the
+    GraphQL rate limit runs low. Writes still go through the REST API.
+    """
+
+    def __init__(self, access_token: str, base_url: Optional[str] = None, node_budget: Optional[int] = None):
+        """Initialize the GraphQL backend with an access token"""
+        super().__init__(access_token, concurrent=False, base_url=base_url)
+        self.node_budget = node_budget or int(os.getenv('GITHUB_GRAPHQL_NODE_BUDGET', '1000'))
+        self.rate_limit_remaining: Optional[int] = None
+
+    @instrumented('github')
+    def get_repositories(self) -> List[Dict]:
+        """Get list of user's repositories"""
+        repos = []
+        after = None
+        while True:
+            data = self._query(REPOSITORIES_QUERY, {'first': 100, 'after': after})
+            connection = data['viewer']['repositories']
+            for repo in connection['nodes']:
+                repos.append({
+                    'name': repo['name'],
+                    'full_name': repo['nameWithOwner'],
+                    'description': repo['description'],
+                    'url': repo['url'],
+                    'language': (repo.get('primaryLanguage') or {}).get('name'),
+                    'stars': repo['stargazerCount'],
+                    'forks': repo['forkCount']
+                })
+            if not connection['pageInfo']['hasNextPage']:
+                return repos
+            after = connection['pageInfo']['endCursor']
+
+    @instrumented('github')
+    def get_repo_activity(self, repo_name: str, days: int = 7) -> Dict:
+        """Get recent activity for a repository"""
+        return self.get_repos_activity([repo_name], days)[repo_name]
+
+    @instrumented('github')
+    def get_repos_activity(self, repo_names: List[str], days: int = 7) -> Dict[str, Dict]:
+        """Get recent activity for several repositories, batched into shared queries"""
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        owners = [_split_name(name) for name in repo_names]
+        activity = {name: {stream: [] for stream in STREAMS} for name in repo_names}
+        # (repo index, stream, cursor) still to fetch
+        pending: List[Tuple[int, str, Optional[str]]] = [
+            (i, stream, None) for i in range(len(repo_names)) for stream in STREAMS
+        ]
+
+        while pending:
+            query, variables = self._activity_query(pending, owners, since)
+            data = self._query(query, variables)
+            next_round = []
+            for i, stream, _ in pending:
+                repo = data[f'r{i}']
+                if repo is None:
+                    raise Exception(f"Repository not found: {repo_names[i]}")
+                connection = _connection(repo, stream)
+                if connection is None:
+                    continue
+                items = activity[repo_names[i]][stream]
+                if self._collect(stream, connection['nodes'], since, items) and connection['pageInfo']['hasNextPage']:
+                    next_round.append((i, stream, connection['pageInfo']['endCursor']))
+            pending = next_round
+        return activity
+
+    def _activity_query(self, pending: List[Tuple[int, str, Optional[str]]],
+                        owners: List[Tuple[str, str]], since: str) -> Tuple[str, Dict[str, Any]]:
+        first = self._page_size(len(pending))
+        declarations = []
+        variables: Dict[str, Any] = {}
+        selections: Dict[int, List[str]] = {}
+        for i, stream, cursor in pending:
+            cursor_var = None
+            if cursor:
+                cursor_var = f'c{i}_{stream}'
+                declarations.append(f'${cursor_var}: String')
+                variables[cursor_var] = cursor
+            selections.setdefault(i, []).append(_stream_selection(stream, first, cursor_var))
+            if stream == 'commits' and 'since' not in variables:
+                declarations.append('$since: GitTimestamp!')
+                variables['since'] = since
+            if stream == 'issues' and 'issuesSince' not in variables:
+                declarations.append('$issuesSince: DateTime!')
+                variables['issuesSince'] = since
+
+        blocks = []
+        for i, parts in selections.items():
+            declarations.extend([f'$o{i}: String!', f'$n{i}: String!'])
+            variables[f'o{i}'], variables[f'n{i}'] = owners[i]
+            blocks.append(f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ {" ".join(parts)} }}')
+        query = f'query({", ".join(declarations)}) {{ {" ".join(blocks)} rateLimit {{ cost remaining }} }}'
+        return query, variables
+
+    def _page_size(self, connections: int) -> int:
+        """Nodes per connection so one query stays within the node budget"""
+        size = max(10, min(100, self.node_budget // max(1, connections)))
+        if self.rate_limit_remaining is not None and self.rate_limit_remaining < 500:
+            size = max(10, size // 2)
+        return size
+
+    @staticmethod
+    def _collect(stream: str, nodes: List[Dict[str, Any]], since: str, items: List[Dict]) -> bool:
+        """Append formatted nodes, returning False once the stream has left the window"""
+        for node in nodes:
+            if stream == 'commits':
+                items.append({
+                    'sha': node['oid'][:7],
+                    'message': node['message'],
+                    'author': node['author']['name'],
+                    'date': iso_timestamp(node['author']['date'])
+                })
+                continue
+            if node['updatedAt'] < since:
+                return False
+            items.append({
+                'number': node['number'],
+                'title': node['title'],
+                'state': 'open' if node['state'] == 'OPEN' else 'closed',
+                'created_at': iso_timestamp(node['createdAt']),
+                'updated_at': iso_timestamp(node['updatedAt'])
+            })
+        return True
+
+    def _query(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        data = self.client.graphql(query, variables)
+        if data.get('rateLimit'):
+            self.rate_limit_remaining = data['rateLimit']['remaining']
+        return data
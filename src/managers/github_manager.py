@@ -5,68 +5,50 @@ import os
 from typing import Dict, List, Optional
 from github import Github
 from github.Repository import Repository
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+from .github_activity import ActivityStream
+from .github_client import GITHUB_API_URL, GitHubClient
+from ..utils.metrics import instrumented
 
 class GitHubManager:
-    def __init__(self, access_token: str):
+    def __init__(self, access_token: str, concurrent: Optional[bool] = None, base_url: Optional[str] = None):
         """Initialize GitHub manager with access token"""
-        self.github = Github(access_token)
+        base_url = base_url or os.getenv('GITHUB_API_URL', GITHUB_API_URL)
+        self.github = Github(access_token, base_url=base_url)
         self.user = self.github.get_user()
+        self.client = GitHubClient(access_token, base_url=base_url)
+        if concurrent is None:
+            concurrent = os.getenv('GITHUB_CONCURRENT_ACTIVITY', 'true').lower() != 'false'
+        self.concurrent = concurrent
     
+    @instrumented('github')
     def get_repositories(self) -> List[Dict]:
         """Get list of user's repositories"""
         repos = []
-        for repo in self.user.get_repos():
+        for repo in self.client.iter_items('/user/repos', {'per_page': 100}):
             repos.append({
-                'name': repo.name,
-                'full_name': repo.full_name,
-                'description': repo.description,
-                'url': repo.html_url,
-                'language': repo.language,
-                'stars': repo.stargazers_count,
-                'forks': repo.forks_count
+                'name': repo['name'],
+                'full_name': repo['full_name'],
+                'description': repo['description'],
+                'url': repo['html_url'],
+                'language': repo['language'],
+                'stars': repo['stargazers_count'],
+                'forks': repo['forks_count']
             })
         return repos
     
+    @instrumented('github')
     def get_repo_activity(self, repo_name: str, days: int = 7) -> Dict:
         """Get recent activity for a repository"""
-        repo = self.github.get_repo(repo_name)
-        since = datetime.now() - timedelta(days=days)
-        
-        # Get commits
-        commits = list(repo.get_commits(since=since))
-        
-        # Get pull requests
-        pulls = list(repo.get_pulls(state='all', sort='updated', direction='desc'))
-        recent_pulls = [pr for pr in pulls if pr.updated_at >= since]
-        
-        # Get issues
-        issues = list(repo.get_issues(state='all', sort='updated', direction='desc'))
-        recent_issues = [issue for issue in issues if issue.updated_at >= since]
-        
-        return {
-            'commits': [{
-                'sha': c.sha[:7],
-                'message': c.commit.message,
-                'author': c.commit.author.name,
-                'date': c.commit.author.date.isoformat()
-            } for c in commits],
-            'pull_requests': [{
-                'number': pr.number,
-                'title': pr.title,
-                'state': pr.state,
-                'created_at': pr.created_at.isoformat(),
-                'updated_at': pr.updated_at.isoformat()
-            } for pr in recent_pulls],
-            'issues': [{
-                'number': issue.number,
-                'title': issue.title,
-                'state': issue.state,
-                'created_at': issue.created_at.isoformat(),
-                'updated_at': issue.updated_at.isoformat()
-            } for issue in recent_issues]
-        }
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        return ActivityStream(self.client, repo_name, since, concurrent=self.concurrent).collect()
     
+    def cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss/304 counts for this manager's HTTP cache"""
+        return dict(self.client.stats)
+    
+    @instrumented('github')
     def create_issue(self, repo_name: str, title: str, body: str) -> Dict:
         """Create a new issue in the repository"""
         repo = self.github.get_repo(repo_name)
@@ -77,6 +59,7 @@ class GitHubManager:
             'url': issue.html_url
         }
     
+    @instrumented('github')
     def update_issue(self, repo_name: str, issue_number: int, state: str) -> Dict:
         """Update an issue's state (open/closed)"""
         repo = self.github.get_repo(repo_name)
@@ -89,6 +72,11 @@ class GitHubManager:
             'url': issue.html_url
         }
     
+    def close(self) -> None:
+        """Close the manager's HTTP connections"""
+        self.client.session.close()
+        self.github.close()
+
     def is_healthy(self) -> bool:
         """Check if GitHub connection is working"""
         try:
@@ -96,3 +84,11 @@ class GitHubManager:
             return True
         except Exception:
             return False
+
+
+def create_github_manager(access_token: str) -> GitHubManager:
+    """Build the GitHub manager backend selected by ``GITHUB_BACKEND`` (rest or graphql)"""
+    if os.getenv('GITHUB_BACKEND', 'rest').lower() == 'graphql':
+        from .github_graphql import GitHubGraphQLManager
+        return GitHubGraphQLManager(access_token)
+    return GitHubManager(access_token)
@@ -0,0 +1,194 @@
+"""
+Process-wide Airtable request scheduler enforcing the per-base rate limit
+"""
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
+import requests
+from pyairtable import Api
+
+from ..utils.metrics import track
+
+# Airtable locks a base out for 30 seconds after a 429
+THROTTLE_PENALTY = 30.0
+
+
+class Priority(IntEnum):
+    """Request classes, served lowest value first"""
+    INTERACTIVE = 0
+    SCHEDULED = 1
+    BULK = 2
+
+
+# Set while a request holds a scheduler token, so pyairtable's POST fallback reuses it
+_in_request: contextvars.ContextVar = contextvars.ContextVar('airtable_in_request', default=False)
+
+# Unset means INTERACTIVE, but lets background work tell it apart from an explicit choice
+_current_priority: contextvars.ContextVar = contextvars.ContextVar('airtable_priority', default=None)
+
+
+def current_priority(default: Optional[Priority] = None) -> Optional[Priority]:
+    """The priority set by an enclosing ``request_priority``, or ``default``"""
+    priority = _current_priority.get()
+    return priority if priority is not None else default
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """Run the enclosed Airtable calls at ``priority``"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class RateLimitScheduler:
+    """Token bucket shared by every Airtable client talking to one base
+
+    Callers block in ``acquire`` until a token is available. Waiting callers
+    are served by priority, then in arrival order.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: Optional[float] = None):
+        """Allow ``rate`` requests per second with bursts of up to ``burst``"""
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+        self._waiting: list = []
+        self._seq = itertools.count()
+        self._stats = {
+            p: {'granted': 0, 'wait_total': 0.0, 'wait_max': 0.0} for p in Priority
+        }
+        self._throttled = 0
+
+    def acquire(self, priority: Optional[Priority] = None) -> float:
+        """Block until a request may be sent, returning the time spent waiting"""
+        priority = Priority(priority if priority is not None else current_priority(Priority.INTERACTIVE))
+        start = time.monotonic()
+        ticket: Tuple[int, int] = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._waiting[0] != ticket:
+                        self._cond.wait()
+                        continue
+                    delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                heapq.heappop(self._waiting)
+                self._tokens -= 1
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                raise
+            finally:
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            stats = self._stats[priority]
+            stats['granted'] += 1
+            stats['wait_total'] += waited
+            stats['wait_max'] = max(stats['wait_max'], waited)
+        return waited
+
+    def penalize(self, seconds: float = THROTTLE_PENALTY) -> None:
+        """Hold every caller back after Airtable answered 429"""
+        with self._cond:
+            self._throttled += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0)
+            self._cond.notify_all()
+
+    def metrics(self) -> Dict[str, object]:
+        """Snapshot of queue depth and wait times per priority"""
+        with self._cond:
+            depth = {p.name.lower(): 0 for p in Priority}
+            for priority, _ in self._waiting:
+                depth[Priority(priority).name.lower()] += 1
+            waits = {}
+            for priority, stats in self._stats.items():
+                granted = stats['granted']
+                waits[priority.name.lower()] = {
+                    'granted': granted,
+                    'wait_avg': stats['wait_total'] / granted if granted else 0.0,
+                    'wait_max': stats['wait_max'],
+                }
+            return {
+                'queue_depth': depth,
+                'waits': waits,
+                'throttled': self._throttled,
+                'tokens': self._tokens,
+            }
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+_schedulers: Dict[str, RateLimitScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(base_id: str) -> RateLimitScheduler:
+    """Get the process-wide scheduler for an Airtable base"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(base_id)
+        if scheduler is None:
+            scheduler = RateLimitScheduler(rate=float(os.getenv('AIRTABLE_RATE_LIMIT', '5')))
+            _schedulers[base_id] = scheduler
+        return scheduler
+
+
+def _base_id_from_url(url: str) -> str:
+    path = url.split('/v0/', 1)[-1]
+    return path.split('/', 1)[0]
+
+
+class ScheduledApi(Api):
+    """pyairtable Api whose requests all pass through the per-base scheduler
+
+    429 responses put the base's scheduler into the 30 second penalty and the
+    request is retried, instead of urllib3 retrying behind the scheduler.
+    """
+
+    def __init__(self, api_key: str, max_throttle_retries: int = 3, **kwargs):
+        kwargs.setdefault('retry_strategy', None)
+        super().__init__(api_key, **kwargs)
+        self.max_throttle_retries = max_throttle_retries
+
+    def request(self, method, url, fallback=None, options=None, params=None, json=None):
+        if _in_request.get():
+            # pyairtable re-enters here to send a long GET as a POST; it already holds the token
+            return super().request(method, url, fallback=fallback, options=options, params=params, json=json)
+        scheduler = get_scheduler(_base_id_from_url(url))
+        for attempt in range(self.max_throttle_retries + 1):
+            scheduler.acquire()
+            token = _in_request.set(True)
+            try:
+                with track('airtable_api', method.upper(), kind='client') as active:
+                    if active:
+                        active.set_attribute('url.full', url)
+                        active.set_attribute('attempt', attempt)
+                    return super().request(method, url, fallback=fallback, options=options, params=params, json=json)
+            except requests.exceptions.HTTPError as e:
+                throttled = e.response is not None and e.response.status_code == 429
+                if not throttled or attempt == self.max_throttle_retries:
+                    raise
+                scheduler.penalize()
+            finally:
+                _in_request.reset(token)
@@ -0,0 +1,120 @@
+"""
+In-process record store for locally mirrored Airtable tables
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# (record id, record) pairs; the record is None when it was removed
+Changes = List[Tuple[str, Optional[Dict[str, Any]]]]
+
+
+class RecordStore:
+    """Thread-safe map of Airtable record id to record
+
+    Subclasses maintain secondary indexes by overriding ``_index`` and
+    ``_unindex``, which are always called with the lock held. Listeners
+    added with ``add_listener`` are called with each batch of changes after
+    the lock is released.
+    """
+
+    def __init__(self):
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._listeners: List[Callable[[Changes], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._records
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether a full snapshot has been loaded"""
+        return self.loaded_at is not None
+
+    def add_listener(self, listener: Callable[[Changes], None]) -> None:
+        """Call ``listener`` with every batch of inserted, replaced or removed records"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Changes], None]) -> None:
+        """Stop calling ``listener``"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def invalidate(self) -> None:
+        """Mark the store as needing a full reload"""
+        self.loaded_at = None
+
+    def load(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Replace the store contents with a full table snapshot"""
+        with self._lock:
+            previous = list(self._records)
+            records = list(records)
+            self._clear()
+            self._index_many(records)
+            changes: Changes = [(record['id'], record) for record in records]
+            changes.extend((record_id, None) for record_id in previous if record_id not in self._records)
+            self.loaded_at = time.monotonic()
+        self._notify(changes)
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert or replace a single record"""
+        self.upsert_many([record])
+
+    def upsert_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace several records, returning how many were applied"""
+        changes: Changes = []
+        with self._lock:
+            for record in records:
+                self._unindex(record['id'])
+                self._index(record)
+                changes.append((record['id'], record))
+        self._notify(changes)
+        return len(changes)
+
+    def remove(self, record_id: str) -> None:
+        """Drop a record from the store if present"""
+        with self._lock:
+            removed = self._unindex(record_id)
+        if removed is not None:
+            self._notify([(record_id, None)])
+
+    def retain(self, record_ids: Set[str]) -> int:
+        """Drop every record not in ``record_ids``, returning how many were removed"""
+        with self._lock:
+            stale = [record_id for record_id in self._records if record_id not in record_ids]
+            for record_id in stale:
+                self._unindex(record_id)
+        self._notify([(record_id, None) for record_id in stale])
+        return len(stale)
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Get a record by id"""
+        return self._records.get(record_id)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get every stored record"""
+        with self._lock:
+            return list(self._records.values())
+
+    def _notify(self, changes: Changes) -> None:
+        if changes:
+            for listener in list(self._listeners):
+                listener(changes)
+
+    def _clear(self) -> None:
+        self._records.clear()
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        self._records[record['id']] = record
+
+    def _index_many(self, records: List[Dict[str, Any]]) -> None:
+        """Index a full snapshot; subclasses can build their indexes in bulk"""
+        for record in records:
+            self._index(record)
+
+    def _unindex(self, record_id: str) -> Optional[Dict[str, Any]]:
+        return self._records.pop(record_id, None)
@@ -0,0 +1,185 @@
+"""
+Local inverted index for repository search
+"""
+import re
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .record_store import RecordStore
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def _tokens(text: str) -> List[str]:
+    return TOKEN_RE.findall(text)
+
+
+def _grams(text: str) -> Set[str]:
+    """Every substring of length 1 to 3, so any query can be narrowed by its grams"""
+    grams = set()
+    for n in (1, 2, 3):
+        grams.update(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+class SearchIndex:
+    """Token and character n-gram postings over a few text fields
+
+    Queries match records where the whole query is a substring of a field,
+    or where every query word is a prefix of a word in the record, and are
+    ranked with matches in heavier fields first.
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        """Index the fields named in ``weights``, scoring matches by field weight"""
+        self.weights = weights
+        self._texts: Dict[str, Dict[str, str]] = {}
+        self._doc_tokens: Dict[str, Dict[str, Set[str]]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def clear(self) -> None:
+        self._texts.clear()
+        self._doc_tokens.clear()
+        self._grams.clear()
+        self._tokens.clear()
+        self._vocabulary.clear()
+
+    def add(self, doc_id: str, fields: Dict[str, Any]) -> None:
+        """Index a document, replacing any previous version"""
+        self.remove(doc_id)
+        texts = {name: str(fields.get(name) or '').casefold() for name in self.weights}
+        self._texts[doc_id] = texts
+        self._doc_tokens[doc_id] = {name: set(_tokens(text)) for name, text in texts.items()}
+        for text in texts.values():
+            for gram in _grams(text):
+                self._grams.setdefault(gram, set()).add(doc_id)
+            for token in _tokens(text):
+                postings = self._tokens.get(token)
+                if postings is None:
+                    postings = self._tokens[token] = set()
+                    insort(self._vocabulary, token)
+                postings.add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a document from the index"""
+        texts = self._texts.pop(doc_id, None)
+        if texts is None:
+            return
+        del self._doc_tokens[doc_id]
+        for text in texts.values():
+            for gram in _grams(text):
+                self._drop(self._grams, gram, doc_id)
+            for token in _tokens(text):
+                if self._drop(self._tokens, token, doc_id):
+                    del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Get ``(doc_id, score)`` pairs matching ``query``, best first"""
+        query = query.strip().casefold()
+        if not query:
+            return []
+        words = _tokens(query)
+        candidates = self._substring_candidates(query) | self._prefix_candidates(words)
+
+        ranked = []
+        for doc_id in candidates:
+            score = self._score(self._texts[doc_id], self._doc_tokens[doc_id], query, words)
+            if score > 0:
+                ranked.append((doc_id, score))
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+    def _substring_candidates(self, query: str) -> Set[str]:
+        if len(query) <= 3:
+            return set(self._grams.get(query, ()))
+        # Rarest trigrams first; survivors are verified when scoring
+        grams = sorted({query[i:i + 3] for i in range(len(query) - 2)},
+                       key=lambda gram: len(self._grams.get(gram, ())))
+        candidates = set(self._grams.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self._grams.get(gram, set())
+        return candidates
+
+    def _prefix_candidates(self, words: Iterable[str]) -> Set[str]:
+        candidates: Optional[Set[str]] = None
+        for word in words:
+            matches: Set[str] = set()
+            pos = bisect_left(self._vocabulary, word)
+            while pos < len(self._vocabulary) and self._vocabulary[pos].startswith(word):
+                matches |= self._tokens[self._vocabulary[pos]]
+                pos += 1
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return set()
+        return candidates or set()
+
+    def _score(self, texts: Dict[str, str], doc_tokens: Dict[str, Set[str]],
+               query: str, words: List[str]) -> float:
+        all_tokens = set().union(*doc_tokens.values())
+        substring = any(query in text for text in texts.values())
+        if not substring and not (words and all(
+                any(token.startswith(word) for token in all_tokens) for word in words)):
+            return 0.0
+
+        score = 0.0
+        for name, text in texts.items():
+            weight = self.weights[name]
+            if text == query:
+                score += 10 * weight
+            elif text.startswith(query):
+                score += 5 * weight
+            elif query in text:
+                score += 2 * weight
+            tokens = doc_tokens[name]
+            for word in words:
+                if word in tokens:
+                    score += weight
+                elif any(token.startswith(word) for token in tokens):
+                    score += 0.5 * weight
+        return score
+
+    @staticmethod
+    def _drop(index: Dict[str, Set[str]], key: str, doc_id: str) -> bool:
+        """Remove ``doc_id`` from a posting list, returning True if the list emptied"""
+        postings = index.get(key)
+        if postings is None:
+            return False
+        postings.discard(doc_id)
+        if not postings:
+            del index[key]
+            return True
+        return False
+
+
+class RepositoryIndex(RecordStore):
+    """Repository records with a search index over name and description"""
+
+    def __init__(self):
+        super().__init__()
+        self.index = SearchIndex({'Repository Name': 3.0, 'Description': 1.0})
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get repositories matching ``query``, best match first"""
+        with self._lock:
+            return [self._records[doc_id] for doc_id, _ in self.index.search(query, limit)]
+
+    def _clear(self) -> None:
+        super()._clear()
+        self.index.clear()
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        super()._index(record)
+        self.index.add(record['id'], record.get('fields', {}))
+
+    def _unindex(self, record_id: str) -> Optional[Dict[str, Any]]:
+        record = super()._unindex(record_id)
+        if record is not None:
+            self.index.remove(record_id)
+        return record
@@ -0,0 +1,98 @@
+"""
+Incremental Airtable table sync driven by Last Updated watermarks
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pyairtable.formulas import escape_quotes
+
+from .rate_limiter import Priority, current_priority, request_priority
+from .record_store import RecordStore
+
+
+class TableSync:
+    """Keep a RecordStore current by pulling only records changed since the last sync
+
+    The first refresh downloads the whole table. Later refreshes pull records
+    whose watermark field is on or after the highest value seen so far, and
+    every ``sweep_interval`` seconds an id-only listing drops records that were
+    deleted upstream.
+    """
+
+    def __init__(self, table, store: RecordStore, field: str = 'Last Updated',
+                 interval: Optional[float] = None, sweep_interval: Optional[float] = None):
+        """Create a sync engine for ``table`` writing into ``store``"""
+        self.table = table
+        self.store = store
+        self.field = field
+        self.interval = interval if interval is not None else float(os.getenv('AIRTABLE_SYNC_INTERVAL', '30'))
+        self.sweep_interval = (sweep_interval if sweep_interval is not None
+                               else float(os.getenv('AIRTABLE_SWEEP_INTERVAL', '600')))
+        self.watermark: Optional[str] = None
+        self.last_refresh: Optional[float] = None
+        self.last_sweep: Optional[float] = None
+        self.stats = {'full_loads': 0, 'delta_pulls': 0, 'records_pulled': 0, 'sweeps': 0, 'deleted': 0}
+        self._lock = threading.Lock()
+
+    def delta_formula(self) -> str:
+        """Formula selecting records modified on or after the watermark"""
+        watermark = escape_quotes(self.watermark)
+        return f"NOT(IS_BEFORE({{{self.field}}}, '{watermark}'))"
+
+    def maybe_refresh(self) -> None:
+        """Refresh if the store is empty or the sync interval has elapsed
+
+        The caller is waiting on the refresh, so it runs at the caller's
+        priority: INTERACTIVE unless a ``request_priority`` says otherwise.
+        """
+        if (not self.store.is_loaded or self.last_refresh is None
+                or time.monotonic() - self.last_refresh >= self.interval):
+            self.refresh(priority=current_priority(Priority.INTERACTIVE))
+
+    def refresh(self, full: bool = False, priority: Optional[Priority] = None) -> None:
+        """Pull changes from Airtable into the store
+
+        Runs at ``priority``, else at the caller's ``request_priority``, else
+        as BULK work that nobody is waiting on.
+        """
+        if priority is None:
+            priority = current_priority(Priority.BULK)
+        with self._lock, request_priority(priority):
+            now = time.monotonic()
+            if full or self.watermark is None or not self.store.is_loaded:
+                records = self.table.all()
+                self.store.load(records)
+                self.stats['full_loads'] += 1
+                self.last_sweep = now
+            else:
+                records = self.table.all(formula=self.delta_formula())
+                self.store.upsert_many(records)
+                self.stats['delta_pulls'] += 1
+                if now - (self.last_sweep or 0) >= self.sweep_interval:
+                    self.sweep()
+            self.stats['records_pulled'] += len(records)
+            self._advance(records)
+            if self.watermark is None:
+                # Nothing carries the field yet; anything written from now on will
+                self.watermark = datetime.now().strftime("%Y-%m-%d")
+            self.last_refresh = now
+
+    def sweep(self) -> int:
+        """Drop locally stored records that no longer exist in Airtable"""
+        with request_priority(current_priority(Priority.BULK)):
+            live_ids = {record['id'] for record in self.table.all(fields=[self.field])}
+        removed = self.store.retain(live_ids)
+        self.stats['sweeps'] += 1
+        self.stats['deleted'] += removed
+        self.last_sweep = time.monotonic()
+        return removed
+
+    def _advance(self, records: List[Dict[str, Any]]) -> None:
+        # ISO-8601 dates and timestamps compare correctly as strings
+        for record in records:
+            value = record.get('fields', {}).get(self.field)
+            if value and (self.watermark is None or value > self.watermark):
+                self.watermark = value
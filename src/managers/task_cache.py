@@ -0,0 +1,162 @@
+"""
+Local indexed task store backing TaskManager lookups
+"""
+import base64
+import json
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .record_store import RecordStore
+
+# Sort orders kept as indexes, by the task field they order by
+SORT_FIELDS = {'due_date': 'Due Date', 'title': 'Title', 'created': 'Created Date'}
+
+# Sorts after every real value, so tasks missing the sort field come last
+_MISSING = '\uffff'
+
+Position = Tuple[str, str]
+
+
+def _fold(value: Optional[str]) -> str:
+    """Normalize a title or status for case-insensitive lookups"""
+    return (value or '').strip().casefold()
+
+
+def sort_position(task: Dict[str, Any], sort: str) -> Position:
+    """A task's ``(sort key, record id)`` position in a sort order"""
+    value = task.get('fields', {}).get(SORT_FIELDS[sort])
+    if sort == 'title':
+        return (_fold(value) or _MISSING, task['id'])
+    # ISO dates sort lexically
+    return (value or _MISSING, task['id'])
+
+
+def encode_cursor(task: Dict[str, Any], sort: str) -> str:
+    """Opaque cursor resuming a listing in ``sort`` order after ``task``"""
+    key, record_id = sort_position(task, sort)
+    return base64.urlsafe_b64encode(json.dumps([sort, key, record_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: str) -> Position:
+    """Get the position a cursor resumes after, checking it was made for ``sort``"""
+    try:
+        cursor_sort, key, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was made for sort '{cursor_sort}', not '{sort}'")
+    return (key, record_id)
+
+
+class TaskCache(RecordStore):
+    """In-process copy of the Tasks table with title, status and sort order indexes"""
+
+    def __init__(self):
+        """Create an empty cache"""
+        super().__init__()
+        self._by_title: Dict[str, List[str]] = {}
+        self._by_status: Dict[str, List[str]] = {}
+        # Sorted (sort key, record id) positions per sort order
+        self._order: Dict[str, List[Position]] = {sort: [] for sort in SORT_FIELDS}
+        self._bulk = False
+
+    def find_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+        """Get the first task whose title matches, ignoring case"""
+        with self._lock:
+            ids = self._by_title.get(_fold(title))
+            return self._records[ids[0]] if ids else None
+
+    def by_status(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get tasks with the given status, or all tasks when status is None"""
+        with self._lock:
+            if not status:
+                return list(self._records.values())
+            return [self._records[i] for i in self._by_status.get(_fold(status), [])]
+
+    def due_on_or_before(self, date: str, exclude_status: Optional[str] = 'Done') -> List[Dict[str, Any]]:
+        """Get tasks due on or before ``date`` (YYYY-MM-DD), earliest first"""
+        excluded = _fold(exclude_status)
+        with self._lock:
+            by_due = self._order['due_date']
+            end = bisect_right(by_due, (date, _MISSING))
+            tasks = [self._records[i] for _, i in by_due[:end]]
+        if not excluded:
+            return tasks
+        return [t for t in tasks if _fold(t['fields'].get('Status')) != excluded]
+
+    def iter_sorted(self, sort: str = 'due_date', descending: bool = False,
+                    after: Optional[Position] = None, chunk: int = 256) -> Iterator[Dict[str, Any]]:
+        """Yield tasks in ``sort`` order, starting after the position ``after``
+
+        Tasks are read from the index ``chunk`` at a time and the lock is not
+        held between chunks, so a listing never copies the whole table and
+        changes made while iterating show up from the next chunk on.
+        """
+        if sort not in self._order:
+            raise ValueError(f"Unknown sort: {sort}")
+        position = tuple(after) if after else None
+        while True:
+            with self._lock:
+                order = self._order[sort]
+                if descending:
+                    end = bisect_left(order, position) if position else len(order)
+                    batch = order[max(end - chunk, 0):end][::-1]
+                else:
+                    start = bisect_right(order, position) if position else 0
+                    batch = order[start:start + chunk]
+                tasks = [self._records[record_id] for _, record_id in batch]
+            if not tasks:
+                return
+            yield from tasks
+            position = batch[-1]
+
+    def _clear(self) -> None:
+        super()._clear()
+        self._by_title.clear()
+        self._by_status.clear()
+        for order in self._order.values():
+            order.clear()
+
+    def _index_many(self, records: List[Dict[str, Any]]) -> None:
+        # Sorting once beats inserting a full snapshot in order
+        self._bulk = True
+        try:
+            super()._index_many(records)
+        finally:
+            self._bulk = False
+            for order in self._order.values():
+                order.sort()
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        super()._index(record)
+        record_id = record['id']
+        fields = record.get('fields', {})
+        self._by_title.setdefault(_fold(fields.get('Title')), []).append(record_id)
+        self._by_status.setdefault(_fold(fields.get('Status')), []).append(record_id)
+        for sort, order in self._order.items():
+            if self._bulk:
+                order.append(sort_position(record, sort))
+            else:
+                insort(order, sort_position(record, sort))
+
+    def _unindex(self, record_id: str) -> Optional[Dict[str, Any]]:
+        record = super()._unindex(record_id)
+        if record is None:
+            return None
+        fields = record.get('fields', {})
+        self._discard(self._by_title, _fold(fields.get('Title')), record_id)
+        self._discard(self._by_status, _fold(fields.get('Status')), record_id)
+        for sort, order in self._order.items():
+            entry = sort_position(record, sort)
+            pos = bisect_left(order, entry)
+            if pos < len(order) and order[pos] == entry:
+                del order[pos]
+        return record
+
+    @staticmethod
+    def _discard(index: Dict[str, List[str]], key: str, record_id: str) -> None:
+        ids = index.get(key)
+        if ids and record_id in ids:
+            ids.remove(record_id)
+            if not ids:
+                del index[key]
@@ -1,7 +1,28 @@
-from datetime import datetime, timedelta
-from pyairtable import Api
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
 from dotenv import load_dotenv
 import os
+from typing import Any, Dict, Optional, Union
+
+from ..utils.rendering import get_renderer, render
+from ..utils.metrics import instrumented
+from .airtable_client import get_api
+from .table_sync import TableSync
+from .task_cache import SORT_FIELDS, TaskCache, decode_cursor, encode_cursor
+from .write_queue import WriteBehindQueue
+
+# Tasks shown in a chat reply; /tasks pages through longer lists
+TASK_LIST_LIMIT = 20
+
+
+def _check_due_bound(name, value):
+    """Reject a due date bound that is not YYYY-MM-DD, which the range filter compares as text"""
+    try:
+        if date.fromisoformat(value).isoformat() == value:
+            return
+    except (ValueError, TypeError):
+        pass
+    raise ValueError(f"Invalid {name}. Must be a date in YYYY-MM-DD format")
 
 class TaskManager:
     def __init__(self, airtable_manager=None):
@@ -20,11 +41,28 @@ class TaskManager:
         if not all([self.api_key, self.base_id, self.table_name]):
             raise ValueError("Missing required Airtable credentials in .env file")
         
-        self.api = Api(self.api_key)
+        self.api = get_api(self.api_key, self.base_id)
         self.table = self.api.table(self.base_id, self.table_name)
+        self.cache = TaskCache()
+        self.sync = TableSync(self.table, self.cache)
+        self.writes = WriteBehindQueue(self.table, store=self.cache)
+
+    def _ensure_cache(self):
+        """Pull task changes from Airtable into the cache when a refresh is due"""
+        self.sync.maybe_refresh()
+
+    @instrumented('tasks')
+    def flush(self):
+        """Send all deferred task writes to Airtable now"""
+        self.writes.flush()
+
+    @instrumented('tasks')
+    def create_task(self, title: str, description: str, due_date: Optional[str] = None, priority: str = "Medium",
+                    defer: bool = False) -> Union[Dict[str, Any], Future]:
+        """Create a new task
 
-    def create_task(self, title, description, due_date=None, priority="Medium"):
-        """Create a new task"""
+        With ``defer=True`` the write is batched and a Future is returned.
+        """
         try:
             fields = {
                 "Title": title,
@@ -32,19 +70,26 @@ class TaskManager:
                 "Status": "Todo",
                 "Priority": priority,
                 "Created Date": datetime.now().strftime("%Y-%m-%d"),
-                "Last Updated": datetime.now().strftime("%Y-%m-%d")
+                "Last Updated": datetime.now().isoformat()
             }
             
             if due_date:
                 fields["Due Date"] = due_date
             
+            if defer:
+                return self.writes.create(fields)
             record = self.table.create(fields)
+            self.cache.upsert(record)
             return record
         except Exception as e:
             raise Exception(f"Error creating task: {str(e)}")
 
-    def update_task_status(self, task_id, new_status):
-        """Update task status"""
+    @instrumented('tasks')
+    def update_task_status(self, task_id: str, new_status: str, defer: bool = False) -> Union[Dict[str, Any], Future]:
+        """Update task status
+
+        With ``defer=True`` the write is batched and a Future is returned.
+        """
         valid_statuses = ["Todo", "In Progress", "Done"]
         if new_status not in valid_statuses:
             raise ValueError(f"Invalid status. Must be one of: {valid_statuses}")
@@ -52,42 +97,114 @@ class TaskManager:
         try:
             fields = {
                 "Status": new_status,
-                "Last Updated": datetime.now().strftime("%Y-%m-%d")
+                "Last Updated": datetime.now().isoformat()
             }
-            return self.table.update(task_id, fields)
+            if defer:
+                return self.writes.update(task_id, fields)
+            record = self.table.update(task_id, fields)
+            self.cache.upsert(record)
+            return record
         except Exception as e:
             raise Exception(f"Error updating task status: {str(e)}")
 
+    @instrumented('tasks')
     def get_tasks_by_status(self, status=None):
         """Get tasks filtered by status"""
         try:
-            formula = None
-            if status:
-                formula = f"{{Status}} = '{status}'"
-            return self.table.all(formula=formula)
+            self._ensure_cache()
+            return self.cache.by_status(status)
         except Exception as e:
             raise Exception(f"Error getting tasks: {str(e)}")
 
+    @instrumented('tasks')
+    def find_task_by_title(self, title):
+        """Get a task by its title, ignoring case"""
+        try:
+            self._ensure_cache()
+            return self.cache.find_by_title(title)
+        except Exception as e:
+            raise Exception(f"Error finding task: {str(e)}")
+
+    @instrumented('tasks')
     def get_due_tasks(self, days=7):
         """Get tasks due within specified days"""
         try:
             future_date = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
-            formula = f"AND({{Due Date}} <= '{future_date}', {{Status}} != 'Done')"
-            return self.table.all(formula=formula)
+            self._ensure_cache()
+            return self.cache.due_on_or_before(future_date, exclude_status="Done")
         except Exception as e:
             raise Exception(f"Error getting due tasks: {str(e)}")
 
+    @instrumented('tasks')
+    def iter_tasks(self, status=None, sort='due_date', descending=False, cursor=None,
+                   due_before=None, due_after=None):
+        """Iterate over tasks in ``sort`` order, filtered by status and due date range
+
+        ``sort`` is one of ``due_date``, ``title`` or ``created``; tasks missing
+        the field come last. ``cursor`` resumes after the task it was made for
+        with ``task_cursor``. Due dates are YYYY-MM-DD and inclusive. Tasks
+        are read from the local index as they are consumed.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Invalid sort. Must be one of: {list(SORT_FIELDS)}")
+        for name, value in (('due_before', due_before), ('due_after', due_after)):
+            if value:
+                _check_due_bound(name, value)
+        after = decode_cursor(cursor, sort) if cursor else None
+        # Sorted by due date, the range bounds where the listing starts and stops
+        bounded = sort == 'due_date' and not descending
+        if bounded and due_after and (after is None or after < (due_after, '')):
+            after = (due_after, '')
+        try:
+            self._ensure_cache()
+        except Exception as e:
+            raise Exception(f"Error listing tasks: {str(e)}")
+        return self._iter_tasks(status, sort, descending, after, due_before, due_after, bounded)
+
+    def _iter_tasks(self, status, sort, descending, after, due_before, due_after, bounded):
+        status = status.strip().casefold() if status else None
+        for task in self.cache.iter_sorted(sort, descending, after):
+            fields = task['fields']
+            due_date = (fields.get('Due Date') or '')[:10]
+            if due_before and (not due_date or due_date > due_before):
+                if bounded:
+                    return
+                continue
+            if due_after and (not due_date or due_date < due_after):
+                continue
+            if status and (fields.get('Status') or '').strip().casefold() != status:
+                continue
+            yield task
+
+    @staticmethod
+    def task_cursor(task, sort='due_date'):
+        """Cursor for resuming ``iter_tasks`` after ``task``"""
+        return encode_cursor(task, sort)
+
+    @instrumented('tasks')
     def get_task_details(self, task_id):
         """Get detailed information about a specific task"""
         try:
-            return self.table.get(task_id)
+            self._ensure_cache()
+            record = self.cache.get(task_id)
+            if record is None:
+                record = self.table.get(task_id)
+                self.cache.upsert(record)
+            return record
         except Exception as e:
             raise Exception(f"Error getting task details: {str(e)}")
 
-    def delete_task(self, task_id):
-        """Delete a task"""
+    @instrumented('tasks')
+    def delete_task(self, task_id: str, defer: bool = False) -> Union[bool, Future]:
+        """Delete a task
+
+        With ``defer=True`` the write is batched and a Future is returned.
+        """
         try:
+            if defer:
+                return self.writes.delete(task_id)
             self.table.delete(task_id)
+            self.cache.remove(task_id)
             return True
         except Exception as e:
             raise Exception(f"Error deleting task: {str(e)}")
@@ -96,29 +213,4 @@ class TaskManager:
         """Format task list for display"""
         if not tasks:
             return "No tasks found."
-        
-        output = []
-        for task in tasks:
-            fields = task['fields']
-            status_emoji = {
-                "Todo": "📋",
-                "In Progress": "⏳",
-                "Done": "✅"
-            }.get(fields.get('Status', 'Todo'), "📋")
-            
-            due_date = fields.get('Due Date', 'No due date')
-            priority = fields.get('Priority', 'Medium')
-            priority_emoji = {
-                "High": "🔴",
-                "Medium": "🟡",
-                "Low": "🟢"
-            }.get(priority, "🟡")
-            
-            output.append(
-                f"{status_emoji} {fields['Title']}\n"
-                f"   Priority: {priority_emoji} {priority}\n"
-                f"   Due: {due_date}\n"
-                f"   Status: {fields.get('Status', 'Todo')}"
-            )
-        
-        return "\n\n".join(output)
+        return render(get_renderer('text').task_list(tasks))
@@ -0,0 +1,149 @@
+"""
+Write-behind queue that coalesces Airtable mutations into batch requests
+"""
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from .rate_limiter import Priority, current_priority, request_priority
+from .record_store import RecordStore
+
+# Airtable accepts at most 10 records per batch request
+BATCH_SIZE = 10
+
+
+class WriteBehindQueue:
+    """Buffer creates, updates and deletes and send them as batch calls
+
+    Mutations queued within one flush window are sent together on the next
+    ``flush()``, which also runs automatically ``flush_interval`` seconds after
+    the first queued mutation. Repeated updates to the same record are merged
+    into one. Every queued mutation returns a Future resolving to the Airtable
+    response for that record.
+    """
+
+    def __init__(self, table, store: Optional[RecordStore] = None, flush_interval: Optional[float] = None):
+        """Create a queue for ``table``, keeping ``store`` in step with committed writes"""
+        self.table = table
+        self.store = store
+        self.flush_interval = (flush_interval if flush_interval is not None
+                               else float(os.getenv('AIRTABLE_FLUSH_INTERVAL', '0.5')))
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._creates: List[Tuple[Dict[str, Any], Future]] = []
+        self._updates: Dict[str, Tuple[Dict[str, Any], List[Future]]] = {}
+        self._deletes: Dict[str, List[Future]] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._creates) + len(self._updates) + len(self._deletes)
+
+    def create(self, fields: Dict[str, Any]) -> Future:
+        """Queue a record creation"""
+        future = Future()
+        with self._lock:
+            self._creates.append((dict(fields), future))
+            self._schedule()
+        return future
+
+    def update(self, record_id: str, fields: Dict[str, Any]) -> Future:
+        """Queue a record update, merging with any pending update to the same record"""
+        future = Future()
+        with self._lock:
+            if record_id in self._deletes:
+                future.set_exception(ValueError(f"Record {record_id} is pending deletion"))
+                return future
+            pending, futures = self._updates.get(record_id, ({}, []))
+            pending.update(fields)
+            futures.append(future)
+            self._updates[record_id] = (pending, futures)
+            self._schedule()
+        return future
+
+    def delete(self, record_id: str) -> Future:
+        """Queue a record deletion, superseding any pending update to it"""
+        future = Future()
+        with self._lock:
+            superseded = self._updates.pop(record_id, None)
+            self._deletes.setdefault(record_id, []).append(future)
+            self._schedule()
+        if superseded:
+            for pending in superseded[1]:
+                pending.cancel()
+        return future
+
+    def flush(self, priority: Optional[Priority] = None) -> None:
+        """Send every queued mutation now
+
+        Runs at ``priority``, else at the caller's ``request_priority``, else
+        as INTERACTIVE work, since the caller is waiting on it. The automatic
+        flush runs as BULK.
+        """
+        if priority is None:
+            priority = current_priority(Priority.INTERACTIVE)
+        with self._flush_lock, request_priority(priority):
+            with self._lock:
+                if self._timer:
+                    self._timer.cancel()
+                    self._timer = None
+                creates, self._creates = self._creates, []
+                updates, self._updates = self._updates, {}
+                deletes, self._deletes = self._deletes, {}
+
+            for chunk in _chunks(creates):
+                self._send(
+                    lambda: self.table.batch_create([fields for fields, _ in chunk]),
+                    [[future] for _, future in chunk],
+                )
+            update_items = list(updates.items())
+            for chunk in _chunks(update_items):
+                self._send(
+                    lambda: self.table.batch_update(
+                        [{'id': record_id, 'fields': fields} for record_id, (fields, _) in chunk]
+                    ),
+                    [futures for _, (_, futures) in chunk],
+                )
+            delete_items = list(deletes.items())
+            for chunk in _chunks(delete_items):
+                self._send(
+                    lambda: self.table.batch_delete([record_id for record_id, _ in chunk]),
+                    [futures for _, futures in chunk],
+                    deleted=True,
+                )
+
+    def close(self) -> None:
+        """Flush outstanding mutations and stop the flush timer"""
+        self.flush()
+
+    def _schedule(self) -> None:
+        if self._timer is None and self.flush_interval > 0:
+            self._timer = threading.Timer(self.flush_interval, self.flush, kwargs={'priority': Priority.BULK})
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _send(self, call, futures: List[List[Future]], deleted: bool = False) -> None:
+        try:
+            results = call()
+        except Exception as e:
+            for group in futures:
+                for future in group:
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+            return
+
+        if self.store is not None:
+            if deleted:
+                for result in results:
+                    self.store.remove(result['id'])
+            else:
+                self.store.upsert_many(results)
+        for result, group in zip(results, futures):
+            for future in group:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(result)
+
+
+def _chunks(items: List[Any]) -> List[List[Any]]:
+    return [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
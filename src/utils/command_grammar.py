@@ -0,0 +1,100 @@
+"""
+Command grammar shared by the bot and the chat service
+"""
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+
+class CommandMatch:
+    """A matched command: its name and the named groups that matched"""
+
+    def __init__(self, name: str, slots: Dict[str, str]):
+        self.name = name
+        self.slots = slots
+
+    def __repr__(self) -> str:
+        return f"CommandMatch({self.name!r}, {self.slots!r})"
+
+
+class CommandGrammar:
+    """Command patterns routed by the first word of the input
+
+    Each command registers a regex with named groups for its arguments and
+    the words it can start with. Matching looks up the input's first word
+    and only tries the patterns registered under it, so adding commands does
+    not slow down matching the others. Handlers are looked up by command
+    name and called with the named groups as keyword arguments.
+    """
+
+    def __init__(self):
+        """Create an empty grammar"""
+        self._routes: Dict[str, List[Tuple[str, Pattern]]] = defaultdict(list)
+        self._names: List[str] = []
+
+    def register(self, name: str, pattern: str, keywords: Iterable[str]) -> None:
+        """Add a command matched by ``pattern`` for inputs starting with one of ``keywords``"""
+        if name in self._names:
+            raise ValueError(f"Command already registered: {name}")
+        compiled = re.compile(pattern, re.IGNORECASE)
+        for keyword in keywords:
+            self._routes[keyword.lower()].append((name, compiled))
+        self._names.append(name)
+
+    def match(self, text: str) -> Optional[CommandMatch]:
+        """Match ``text`` against the commands for its first word"""
+        text = text.strip()
+        first = text.split(None, 1)[0].lower() if text else ''
+        for name, pattern in self._routes.get(first, ()):
+            match = pattern.match(text)
+            if match:
+                return CommandMatch(name, {key: value for key, value in match.groupdict().items() if value})
+        return None
+
+    @property
+    def names(self) -> List[str]:
+        """Registered command names, in registration order"""
+        return list(self._names)
+
+
+COMMANDS = CommandGrammar()
+COMMANDS.register(
+    'add_task', r'^(?:add|create|new)\s+task:?\s+(?P<title>.+?)(?:\s+by\s+(?P<due_date>.+))?$',
+    ['add', 'create', 'new']
+)
+COMMANDS.register(
+    'list_tasks', r'^(?:list|show|display)\s+(?:all\s+)?tasks(?:\s+(?P<status>.+))?$',
+    ['list', 'show', 'display']
+)
+COMMANDS.register(
+    'update_task', r'^(?:mark|set|update)\s+task\s+["\']?(?P<title>.+?)["\']?\s+as\s+(?P<status>.+)$',
+    ['mark', 'set', 'update']
+)
+COMMANDS.register(
+    'delete_task', r'^(?:delete|remove)\s+task\s+["\']?(?P<title>.+?)["\']?$',
+    ['delete', 'remove']
+)
+COMMANDS.register(
+    'due_tasks', r'^(?:(?:show|list)\s+)?(?:due(?:\s+tasks?)?|what\s+is\s+due)(?:\s+in\s+(?P<days>\d+)\s+days?)?$',
+    ['show', 'list', 'due', 'what']
+)
+COMMANDS.register(
+    'list_repos', r'^(?:list|show|display|my)\s+repos(?:itories)?$',
+    ['list', 'show', 'display', 'my']
+)
+COMMANDS.register(
+    'repo_activity', r'^(?:show|get)\s+activity\s+for\s+(?P<repo>[^\s]+)(?:\s+in\s+last\s+(?P<days>\d+)\s+days?)?$',
+    ['show', 'get']
+)
+COMMANDS.register(
+    'create_issue', r'^create\s+issue\s+in\s+(?P<repo>[^\s]+):\s+(?P<text>.+)$',
+    ['create']
+)
+COMMANDS.register(
+    'add_repo', r'^(?:add|create|new)\s+repo(?:sitory)?\s+(?P<name>.+)$',
+    ['add', 'create', 'new']
+)
+COMMANDS.register(
+    'search_repos', r'^(?:search|find)\s+repo(?:sitorie)?s?\s+(?P<term>.+)$',
+    ['search', 'find']
+)
@@ -0,0 +1,401 @@
+"""
+Local intent classifier for commands that miss the exact command patterns
+"""
+import glob
+import math
+import os
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Seed phrases per intent: the verb/noun alternations of the command patterns,
+# the CLI forms and common paraphrases. Slot text is left out.
+EXAMPLES = {
+    'add_task': [
+        'add task', 'add a task', 'add a new task', 'create task', 'create a task', 'new task',
+        'task add', 'add todo', 'remind me to', 'put task on my list', 'add task by', 'new task due',
+    ],
+    'list_tasks': [
+        'list tasks', 'show tasks', 'show my tasks', 'show all tasks', 'display tasks', 'task list',
+        'list all tasks', 'what are my tasks', 'what tasks do i have', 'my tasks', 'my todo list',
+        'list my todos', 'show tasks in progress', 'show done tasks',
+    ],
+    'update_task': [
+        'mark task as', 'set task as', 'update task as', 'update task status', 'task update',
+        'change task status to', 'set task to', 'move task to', 'mark task done', 'complete task',
+        'finish task', 'start task', 'mark task as in progress', 'mark task as done',
+    ],
+    'delete_task': [
+        'delete task', 'remove task', 'task delete', 'delete the task', 'remove the task',
+        'drop task', 'cancel task', 'get rid of task',
+    ],
+    'due_tasks': [
+        'due tasks', 'show due tasks', 'what is due', 'whats due', 'what is due this week',
+        'task due', 'tasks due in days', 'due soon', 'what do i have due', 'upcoming deadlines',
+        'show deadlines', 'show due', 'list due',
+    ],
+    'list_repos': [
+        'list repos', 'show repos', 'my repos', 'list repositories', 'show my repositories',
+        'repo list', 'display repositories', 'what repositories do i have', 'show all repos',
+    ],
+    'repo_activity': [
+        'show activity for', 'get activity for', 'activity for repo', 'recent activity in',
+        'show activity for in last days', 'what happened in', 'show commits in', 'repo activity',
+    ],
+    'create_issue': [
+        'create issue in', 'open issue in', 'new issue in', 'file issue in', 'file a bug in',
+        'report issue in', 'create an issue in', 'open a new issue in',
+    ],
+    'search_repos': [
+        'search repos', 'find repos', 'search repositories', 'repo search', 'repo find',
+        'find repository', 'search for repo', 'look up repository', 'find repositories named',
+    ],
+    'add_repo': [
+        'add repo', 'add repository', 'create repo', 'new repository', 'repo add',
+        'add a repository', 'track repository',
+    ],
+}
+
+REPO_WORDS = {'repo', 'repos', 'repository', 'repositories'}
+
+# An intent is only considered when the input has one of its anchor words,
+# so open-ended questions that share filler words still go to the LLM
+ANCHORS = {
+    'add_task': {'task', 'todo', 'remind'},
+    'list_tasks': {'tasks', 'task', 'todo', 'todos'},
+    'update_task': {'task', 'mark', 'complete', 'finish', 'status'},
+    'delete_task': {'task'},
+    'due_tasks': {'due', 'deadlines'},
+    'list_repos': REPO_WORDS,
+    'repo_activity': {'activity', 'commits', 'happened'},
+    'create_issue': {'issue', 'bug'},
+    'search_repos': REPO_WORDS,
+    'add_repo': REPO_WORDS,
+}
+
+# Intents that change data. A near miss only reaches them when it opens with a
+# word that opens one of the intent's seed phrases and is not a question;
+# anything else ("why did my task get deleted") goes to the LLM.
+MUTATING = {'add_task', 'update_task', 'delete_task', 'create_issue', 'add_repo'}
+
+# Words shorter than this are never typo-corrected, nor corrected to
+MIN_CORRECTION_LENGTH = 4
+
+REQUIRED_SLOTS = {
+    'add_task': ('title',),
+    'update_task': ('title', 'status'),
+    'delete_task': ('title',),
+    'repo_activity': ('repo',),
+    'create_issue': ('repo', 'text'),
+    'search_repos': ('term',),
+    'add_repo': ('name',),
+}
+
+STATUSES = {
+    'todo': 'Todo', 'to do': 'Todo', 'open': 'Todo', 'reopen': 'Todo', 'not started': 'Todo',
+    'in progress': 'In Progress', 'started': 'In Progress', 'start': 'In Progress', 'doing': 'In Progress',
+    'done': 'Done', 'complete': 'Done', 'completed': 'Done', 'finish': 'Done', 'finished': 'Done',
+    'closed': 'Done',
+}
+
+FILLER = {'a', 'an', 'the', 'my', 'called', 'named', 'for', 'please'}
+# Verbs that follow the noun in the CLI forms ("task add ...", "repo search ...")
+CLI_VERBS = {'add', 'create', 'new', 'list', 'search', 'find', 'lookup', 'delete', 'remove', 'update'}
+TOKEN_RE = re.compile(r"[^\s\"']+|\"[^\"]*\"|'[^']*'")
+QUOTED_RE = re.compile(r"[\"']([^\"']+)[\"']")
+DAYS_RE = re.compile(r'\b(\d+)\b')
+REPO_RE = re.compile(r'[\w.-]+/[\w.-]+')
+COMMAND_FILES = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             'test_*commands.txt')
+
+
+class IntentMatch:
+    """A classified command: the intent, its confidence and the extracted slots"""
+
+    def __init__(self, intent: str, confidence: float, slots: Dict[str, str]):
+        self.intent = intent
+        self.confidence = confidence
+        self.slots = slots
+
+    def __repr__(self) -> str:
+        return f"IntentMatch({self.intent!r}, {self.confidence:.2f}, {self.slots!r})"
+
+
+def command_file_examples(labeler: Callable[[str], Optional[str]],
+                          paths: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+    """Label the lines of the sample command files, skipping lines the labeler rejects"""
+    examples = []
+    for path in paths if paths is not None else sorted(glob.glob(COMMAND_FILES)):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                intent = labeler(line) if line else None
+                if intent:
+                    examples.append((line, intent))
+    return examples
+
+
+def _deletes(word: str) -> Set[str]:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _features(words: List[str]) -> Dict[str, float]:
+    """Character trigrams of each padded word, plus the words themselves"""
+    features: Dict[str, float] = defaultdict(float)
+    for word in words:
+        features['w:' + word] += 1.0
+        padded = f'<{word}>'
+        for i in range(len(padded) - 2):
+            features[padded[i:i + 3]] += 1.0
+    return features
+
+
+class IntentClassifier:
+    """Character n-gram TF-IDF classifier with typo correction and slot extraction
+
+    Input words are first corrected against the command vocabulary (one
+    edit away, via a precomputed deletion index) and words outside it are
+    treated as slot text. The remaining command words are matched against
+    the seed phrases by cosine similarity, and the slots for the winning
+    intent are pulled out of the original text. Inputs below
+    ``min_confidence`` or missing a required slot are not classified, and
+    intents in ``MUTATING`` additionally need a leading command word and no
+    question form. Words seen as slot text in ``examples`` are never
+    corrected.
+    """
+
+    def __init__(self, examples: Iterable[Tuple[str, str]] = (), intents: Optional[Iterable[str]] = None,
+                 min_confidence: Optional[float] = None):
+        """Train on the seed phrases plus ``examples``, limited to ``intents`` if given"""
+        self.intents = set(intents) if intents is not None else set(EXAMPLES)
+        self.min_confidence = min_confidence or float(os.getenv('INTENT_MIN_CONFIDENCE', '0.55'))
+        seeds = [(phrase, intent) for intent, phrases in EXAMPLES.items() for phrase in phrases]
+        labelled = [(phrase, intent) for phrase, intent in seeds + list(examples) if intent in self.intents]
+
+        # Only the seeds define command words; the other examples carry slot text
+        self.vocabulary = {word for phrase, _ in seeds for word in phrase.split()}
+        self.vocabulary |= {word for words in ANCHORS.values() for word in words}
+        self.vocabulary |= {word for status in STATUSES for word in status.split()}
+        # Real words the examples use as slot text, which must not be "corrected"
+        self.slot_words = {word for phrase, _ in labelled for word in re.findall(r"[a-z]+", phrase.lower())
+                           if word not in self.vocabulary}
+        self._corrections: Dict[str, str] = {}
+        for word in sorted(self.vocabulary, key=len, reverse=True):
+            if len(word) >= MIN_CORRECTION_LENGTH:
+                for variant in _deletes(word):
+                    self._corrections.setdefault(variant, word)
+        # Words a mutating command may open with, and their one-deletion typos ("ad task")
+        self._leading: Dict[str, Set[str]] = defaultdict(set)
+        for phrase, intent in seeds:
+            first = phrase.split()[0]
+            self._leading[intent] |= {first} | _deletes(first)
+
+        # Skeletonize the training phrases the same way as the input
+        documents = []
+        for phrase, intent in labelled:
+            words = self._command_words(phrase)
+            if words:
+                documents.append((_features(words), intent))
+        frequency: Dict[str, int] = defaultdict(int)
+        for features, _ in documents:
+            for feature in features:
+                frequency[feature] += 1
+        self._idf = {feature: math.log((1 + len(documents)) / (1 + count)) + 1
+                     for feature, count in frequency.items()}
+        self._intent_of: List[str] = []
+        self._postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for features, intent in documents:
+            vector = self._vector(features)
+            doc = len(self._intent_of)
+            self._intent_of.append(intent)
+            for feature, weight in vector.items():
+                self._postings[feature].append((doc, weight))
+
+    def classify(self, text: str) -> Optional[IntentMatch]:
+        """Classify ``text``, or return None when it should go to the LLM"""
+        words = self._command_words(text)
+        if not words:
+            return None
+        present = set(words)
+        scores: Dict[int, float] = defaultdict(float)
+        for feature, weight in self._vector(_features(words)).items():
+            for doc, doc_weight in self._postings.get(feature, ()):
+                scores[doc] += weight * doc_weight
+
+        best: Dict[str, float] = {}
+        for doc, score in scores.items():
+            intent = self._intent_of[doc]
+            if score > best.get(intent, 0.0) and ANCHORS[intent] & present:
+                best[intent] = score
+        for intent, score in sorted(best.items(), key=lambda item: item[1], reverse=True):
+            if score < self.min_confidence:
+                return None
+            if intent in MUTATING and not self._is_command(intent, text):
+                return None
+            slots = self.extract_slots(intent, text)
+            if all(slots.get(slot) for slot in REQUIRED_SLOTS.get(intent, ())):
+                return IntentMatch(intent, score, slots)
+        return None
+
+    def extract_slots(self, intent: str, text: str) -> Dict[str, str]:
+        """Pull the arguments for ``intent`` out of the original text"""
+        # Only the leading command words are corrected; slot text is taken as written
+        tokens: List[Tuple[str, str]] = []
+        leading = True
+        for match in TOKEN_RE.finditer(text.strip()):
+            word = match.group().strip('"\'').lower()
+            if leading:
+                word = self.correct(word)
+                leading = word in self.vocabulary
+            tokens.append((match.group(), word))
+        lowered = ' '.join(word for _, word in tokens)
+        quoted = QUOTED_RE.search(text)
+
+        if intent in ('add_task', 'update_task', 'delete_task'):
+            lead = self._skip_leading(tokens)
+            start = self._after(tokens, {'task', 'todo'}, limit=5)
+            if start is None:
+                start = lead
+            rest = self._strip_verbs(tokens[start:])
+            if not rest and start > lead + 1:
+                # The noun came after the title: "finish the groceries task"
+                rest = tokens[lead:start - 1]
+            slots: Dict[str, str] = {}
+            if intent == 'add_task':
+                cut = next((i for i, (_, word) in enumerate(rest) if word in ('by', 'due') and i), None)
+                if cut is not None:
+                    slots['due_date'] = ' '.join(raw for raw, _ in rest[cut + 1:])
+                    rest = rest[:cut]
+            elif intent == 'update_task':
+                status, rest = self._trailing_status(rest)
+                slots['status'] = status or self._status_from_verb(tokens[:start])
+            slots['title'] = quoted.group(1) if quoted else self._text(rest)
+            return {slot: value for slot, value in slots.items() if value}
+
+        if intent == 'list_tasks':
+            return {'status': status} if (status := self._find_status(lowered)) else {}
+
+        if intent == 'due_tasks':
+            days = DAYS_RE.search(lowered)
+            if days:
+                return {'days': days.group(1)}
+            if 'today' in lowered or 'tomorrow' in lowered:
+                return {'days': '1'}
+            if 'month' in lowered:
+                return {'days': '30'}
+            return {'days': '7'} if 'week' in lowered else {}
+
+        if intent in ('repo_activity', 'create_issue'):
+            repo = REPO_RE.search(text)
+            slots = {'repo': repo.group().rstrip('.:')} if repo else {}
+            if intent == 'repo_activity':
+                days = DAYS_RE.search(text[repo.end():] if repo else text)
+                if days:
+                    slots['days'] = days.group(1)
+            elif repo:
+                after = text[repo.end():].lstrip(' :-')
+                slots['text'] = after.strip()
+            return slots
+
+        if intent not in ('search_repos', 'add_repo'):
+            return {}
+        # Searches and new repositories take the rest of the input after the repo noun
+        start = self._after(tokens, REPO_WORDS, limit=4)
+        if start is None:
+            return {}
+        value = quoted.group(1) if quoted else self._text(self._strip_verbs(tokens[start:]))
+        return {'term' if intent == 'search_repos' else 'name': value} if value else {}
+
+    def correct(self, word: str) -> str:
+        """Map a word to the command vocabulary if it is at most one edit away
+
+        Short words and words known as slot text are left alone, so "call"
+        does not become "all".
+        """
+        if word in self.vocabulary or word in self.slot_words or len(word) < MIN_CORRECTION_LENGTH:
+            return word
+        if word in self._corrections:
+            return self._corrections[word]
+        for variant in _deletes(word):
+            if variant in self.vocabulary and len(variant) >= MIN_CORRECTION_LENGTH:
+                return variant
+            if variant in self._corrections:
+                return self._corrections[variant]
+        return word
+
+    def _is_command(self, intent: str, text: str) -> bool:
+        """Whether ``text`` reads as an instruction for ``intent`` rather than a question about it"""
+        words = re.findall(r"[a-z]+", QUOTED_RE.sub(' ', text.lower()))
+        while words and words[0] == 'please':
+            words = words[1:]
+        if not words or '?' in QUOTED_RE.sub(' ', text):
+            return False
+        leading = self._leading[intent]
+        return words[0] in leading or self.correct(words[0]) in leading
+
+    def _command_words(self, text: str) -> List[str]:
+        text = QUOTED_RE.sub(' ', text.lower())
+        words = (self.correct(word) for word in re.findall(r"[a-z]+", text))
+        return [word for word in words if word in self.vocabulary]
+
+    def _vector(self, features: Dict[str, float]) -> Dict[str, float]:
+        vector = {feature: count * self._idf.get(feature, 0.0) for feature, count in features.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {feature: weight / norm for feature, weight in vector.items() if weight}
+
+    @staticmethod
+    def _after(tokens: List[Tuple[str, str]], words: Set[str], limit: int) -> Optional[int]:
+        for i, (_, word) in enumerate(tokens[:limit]):
+            if word in words:
+                return i + 1
+        return None
+
+    def _skip_leading(self, tokens: List[Tuple[str, str]]) -> int:
+        i = 0
+        while i < len(tokens) and tokens[i][1] in self.vocabulary:
+            i += 1
+        return i
+
+    @staticmethod
+    def _strip_verbs(tokens: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        while tokens and tokens[0][1] in CLI_VERBS:
+            tokens = tokens[1:]
+        return tokens
+
+    @staticmethod
+    def _text(tokens: List[Tuple[str, str]]) -> str:
+        while tokens and tokens[0][1] in FILLER:
+            tokens = tokens[1:]
+        return ' '.join(raw.strip('"\'') for raw, _ in tokens).strip(' .?!')
+
+    @staticmethod
+    def _find_status(lowered: str) -> Optional[str]:
+        for phrase in sorted(STATUSES, key=len, reverse=True):
+            if re.search(rf'\b{phrase}\b', lowered):
+                return STATUSES[phrase]
+        return None
+
+    @staticmethod
+    def _trailing_status(tokens: List[Tuple[str, str]]) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+        for i in range(len(tokens) - 1, 0, -1):
+            if tokens[i][1] in ('as', 'to'):
+                status = STATUSES.get(' '.join(word for _, word in tokens[i + 1:]))
+                if status:
+                    return status, tokens[:i]
+        # Or a bare trailing status: "mark task groceries done"
+        for size in (2, 1):
+            status = STATUSES.get(' '.join(word for _, word in tokens[-size:]))
+            if status and len(tokens) > size:
+                return status, tokens[:-size]
+        return None, tokens
+
+    @staticmethod
+    def _status_from_verb(tokens: List[Tuple[str, str]]) -> Optional[str]:
+        for _, word in tokens:
+            if word in ('complete', 'finish', 'done', 'close'):
+                return 'Done'
+            if word == 'start':
+                return 'In Progress'
+            if word == 'reopen':
+                return 'Todo'
+        return None
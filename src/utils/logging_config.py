@@ -0,0 +1,144 @@
+"""
+Process-wide logging through a background queue
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+from .tracing import current_span
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that are not extra fields passed by the caller
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional['DroppingQueueHandler'] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Format each record as one JSON object, including extra fields and trace ids"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller
+
+    Records are frozen on the calling thread (message, exception text and
+    the current trace ids) and formatted by the listener's handlers. When the
+    queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        active = current_span()
+        if active is not None:
+            record.trace_id = active.trace.trace_id
+            record.span_id = active.span_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(level: Optional[str] = None, log_file: Optional[str] = None, fmt: Optional[str] = None,
+                      max_bytes: Optional[int] = None, backup_count: Optional[int] = None,
+                      console: bool = True) -> None:
+    """Route all logging through a queue to rotating file and console handlers
+
+    Loggers only put records on a bounded queue; a listener thread does the
+    file and console I/O, so logging never blocks a request. Settings come
+    from ``LOG_LEVEL``, ``LOG_FILE`` (empty for no file), ``LOG_FORMAT``
+    (text or json), ``LOG_MAX_BYTES``, ``LOG_BACKUP_COUNT`` and
+    ``LOG_QUEUE_SIZE``. Calling it again does nothing until
+    ``shutdown_logging()``.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    log_file = log_file if log_file is not None else os.getenv('LOG_FILE', 'bot.log')
+    fmt = (fmt or os.getenv('LOG_FORMAT', 'text')).lower()
+    if fmt not in ('text', 'json'):
+        raise ValueError(f"Unknown log format: {fmt}. Must be one of: ['text', 'json']")
+    formatter = JSONFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT)
+
+    handlers: List[logging.Handler] = []
+    if log_file:
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=max_bytes if max_bytes is not None else int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+            backupCount=backup_count if backup_count is not None else int(os.getenv('LOG_BACKUP_COUNT', '5')),
+            encoding='utf-8',
+            delay=True
+        )
+        handlers.append(file_handler)
+    if console:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv('LOG_QUEUE_SIZE', '10000')))
+    _queue_handler = DroppingQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and remove the pipeline from the root logger"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    _queue_handler = None
+
+
+def dropped_records() -> int:
+    """Count of records dropped because the queue was full"""
+    return _queue_handler.dropped if _queue_handler else 0
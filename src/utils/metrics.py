@@ -0,0 +1,320 @@
+"""
+In-process metrics served in the Prometheus text format
+"""
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .tracing import Span, start_span
+
+# Content type of the text exposition format served on /metrics
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds, in seconds, of latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+class Registry:
+    """Metric families rendered together for ``/metrics``"""
+
+    def __init__(self):
+        """Create an empty registry"""
+        self._metrics: Dict[str, 'Metric'] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: 'Metric') -> None:
+        """Add a metric family, whose name must be unique in the registry"""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def unregister(self, metric: 'Metric') -> None:
+        """Remove a metric family"""
+        with self._lock:
+            if self._metrics.get(metric.name) is metric:
+                del self._metrics[metric.name]
+
+    def get(self, name: str) -> Optional['Metric']:
+        """Get a registered metric family by name"""
+        return self._metrics.get(name)
+
+    def exposition(self) -> str:
+        """Render every family in the Prometheus text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return ''.join(line for metric in metrics for line in metric.collect())
+
+
+REGISTRY = Registry()
+
+
+class CounterValue:
+    """One labelled counter"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add ``amount``"""
+        with self._lock:
+            self.value += amount
+
+
+class GaugeValue(CounterValue):
+    """One labelled gauge"""
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Subtract ``amount``"""
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Set the current value"""
+        with self._lock:
+            self.value = value
+
+
+class LatencyHistogram:
+    """One labelled histogram with fixed buckets"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """Create an empty histogram"""
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency"""
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+
+    def cumulative(self) -> Tuple[List[int], float]:
+        """Get the cumulative count per bucket, ending with +Inf, and the sum"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        running = 0
+        for i, count in enumerate(counts):
+            running += count
+            counts[i] = running
+        return counts, total
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the cumulative count per bucket upper bound, with the total count and sum"""
+        counts, total = self.cumulative()
+        buckets = dict(zip([str(b) for b in self.buckets] + ['+Inf'], counts))
+        return {'buckets': buckets, 'count': counts[-1], 'sum': round(total, 6)}
+
+
+class Metric:
+    """A metric family: one value per combination of label values"""
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[Registry] = REGISTRY):
+        """Create the family, registering it unless ``registry`` is None"""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values: str):
+        """Get the value for these label values, creating it on first use"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._create())
+        return child
+
+    def collect(self) -> Iterator[str]:
+        """Yield the family's exposition lines"""
+        yield f"# HELP {self.name} {_escape(self.documentation)}\n"
+        yield f"# TYPE {self.name} {self.kind}\n"
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            yield from self._samples(values, child)
+
+    def _create(self):
+        raise NotImplementedError
+
+    def _samples(self, values: Tuple[str, ...], child) -> Iterator[str]:
+        yield f"{self.name}{self._label_text(values)} {_number(child.value)}\n"
+
+    def _label_text(self, values: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(f'{extra[0]}="{extra[1]}"')
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter(Metric):
+    """Counter family; names conventionally end in ``_total``"""
+    kind = 'counter'
+    _create = CounterValue
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add to the unlabelled counter"""
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    """Gauge family"""
+    kind = 'gauge'
+    _create = GaugeValue
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge"""
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    """Histogram family sharing one set of buckets"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[Registry] = REGISTRY, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """Create the family, registering it unless ``registry`` is None"""
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, seconds: float) -> None:
+        """Record a latency in the unlabelled histogram"""
+        self.labels().observe(seconds)
+
+    def _create(self) -> LatencyHistogram:
+        return LatencyHistogram(self.buckets)
+
+    def _samples(self, values: Tuple[str, ...], child: LatencyHistogram) -> Iterator[str]:
+        counts, total = child.cumulative()
+        for bound, count in zip([str(b) for b in self.buckets] + ['+Inf'], counts):
+            yield f"{self.name}_bucket{self._label_text(values, ('le', bound))} {count}\n"
+        yield f"{self.name}_sum{self._label_text(values)} {_number(total)}\n"
+        yield f"{self.name}_count{self._label_text(values)} {counts[-1]}\n"
+
+
+CALLS = Counter('gitaccountable_calls_total', 'Calls by component and operation', ('component', 'operation'))
+ERRORS = Counter('gitaccountable_errors_total', 'Calls that raised, by component and operation',
+                 ('component', 'operation'))
+LATENCY = Histogram('gitaccountable_latency_seconds', 'Call latency in seconds, by component and operation',
+                    ('component', 'operation'))
+IN_FLIGHT = Gauge('gitaccountable_in_flight', 'Calls currently running, by component and operation',
+                  ('component', 'operation'))
+
+
+class Operation:
+    """The counters, histogram and gauge of one component and operation"""
+
+    def __init__(self, component: str, operation: str):
+        """Look up the metric values once, so recording a call is a few additions"""
+        self.name = operation
+        self.span_name = f"{component}.{operation}"
+        self.calls = CALLS.labels(component, operation)
+        self.errors = ERRORS.labels(component, operation)
+        self.latency = LATENCY.labels(component, operation)
+        self.in_flight = IN_FLIGHT.labels(component, operation)
+
+    def begin(self) -> float:
+        """Record the start of a call, returning its start time"""
+        self.in_flight.inc()
+        return time.perf_counter()
+
+    def end(self, start: float, failed: bool = False) -> None:
+        """Record the end of a call started at ``start``"""
+        self.latency.observe(time.perf_counter() - start)
+        self.in_flight.dec()
+        self.calls.inc()
+        if failed:
+            self.errors.inc()
+
+
+_operations: Dict[Tuple[str, str], Operation] = {}
+
+
+def operation(component: str, name: str) -> Operation:
+    """Get the metrics of one component and operation"""
+    op = _operations.get((component, name))
+    if op is None:
+        op = _operations.setdefault((component, name), Operation(component, name))
+    return op
+
+
+@contextmanager
+def track(component: str, name: str, kind: str = 'internal', **attributes: Any) -> Iterator[Optional[Span]]:
+    """Record the block as one call of an operation, counting exceptions as errors
+
+    When the request is traced the block also runs in a ``component.name``
+    span, which is yielded so the caller can add attributes.
+    """
+    op = operation(component, name)
+    start = op.begin()
+    active = start_span(op.span_name, kind, attributes)
+    error = None
+    try:
+        yield active
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        # Also reached when a generator holding the block is closed early
+        if active:
+            active.finish(error)
+        op.end(start, error is not None)
+
+
+def instrumented(component: str, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator recording each call of a function as an operation of ``component``
+
+    The operation is named after the function unless ``name`` is given, and
+    traced requests get a span per call. A generator function is timed from
+    its first to its last item.
+    """
+    def decorate(func: Callable) -> Callable:
+        op = operation(component, name or func.__name__)
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator(*args, **kwargs):
+                with track(component, op.name):
+                    return (yield from func(*args, **kwargs))
+            return generator
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = op.begin()
+            active = start_span(op.span_name)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if active:
+                    active.finish(e)
+                op.end(start, True)
+                raise
+            if active:
+                active.finish()
+            op.end(start)
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,216 @@
+"""
+Streaming renderers for task and repository reports
+"""
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+STATUS_EMOJI = {
+    "Todo": "📋",
+    "In Progress": "⏳",
+    "Done": "✅"
+}
+PRIORITY_EMOJI = {
+    "High": "🔴",
+    "Medium": "🟡",
+    "Low": "🟢"
+}
+ACTIVITY_KEYS = ('commits', 'pull_requests', 'issues')
+
+
+def render(chunks: Iterable[str]) -> str:
+    """Join rendered chunks into one string"""
+    return ''.join(chunks)
+
+
+def strip_trailing(chunks: Iterable[str]) -> Iterator[str]:
+    """Pass chunks through, dropping the whitespace at the very end of the output
+
+    Renderers can then end every block with a separator, as if building a
+    string to ``strip()``, without knowing which block comes last.
+    """
+    pending = ''
+    for chunk in chunks:
+        body = chunk.rstrip()
+        if body:
+            yield pending + body
+            pending = chunk[len(body):]
+        else:
+            pending += chunk
+
+
+class TextRenderer:
+    """Plain text reports, as shown in the chat"""
+    name = 'text'
+    mimetype = 'text/plain'
+
+    def message(self, text: str) -> Iterator[str]:
+        """Render a reply that is not a report, such as an empty result"""
+        yield text
+
+    def error(self, text: str) -> Iterator[str]:
+        """Render an error reply"""
+        yield text
+
+    def task_list(self, tasks: Iterable[Dict[str, Any]], note: Optional[str] = None) -> Iterator[str]:
+        """Render tasks with their status, priority and due date, then an optional note"""
+        yield from strip_trailing(self._task_list(tasks))
+        if note:
+            yield from self._note(note)
+
+    def due_tasks(self, tasks: Iterable[Dict[str, Any]], days: int) -> Iterator[str]:
+        """Render the tasks due in the next ``days`` days"""
+        return strip_trailing(self._due_tasks(tasks, days))
+
+    def repositories(self, repos: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Render a user's GitHub repositories"""
+        return strip_trailing(self._repositories(repos))
+
+    def repo_activity(self, repo_name: str, days: int, activity: Dict[str, List[Dict[str, Any]]]) -> Iterator[str]:
+        """Render a repository's recent commits, pull requests and issues"""
+        return strip_trailing(self._repo_activity(repo_name, days, activity))
+
+    def _note(self, note: str) -> Iterator[str]:
+        yield f"\n\n{note}"
+
+    def _task_list(self, tasks: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        for task in tasks:
+            fields = task['fields']
+            status = fields.get('Status', 'Todo')
+            priority = fields.get('Priority', 'Medium')
+            yield (f"{STATUS_EMOJI.get(status, '📋')} {fields['Title']}\n"
+                   f"   Priority: {PRIORITY_EMOJI.get(priority, '🟡')} {priority}\n"
+                   f"   Due: {fields.get('Due Date', 'No due date')}\n"
+                   f"   Status: {status}\n\n")
+
+    def _due_tasks(self, tasks: Iterable[Dict[str, Any]], days: int) -> Iterator[str]:
+        yield f"Tasks due in the next {days} days:\n\n"
+        for task in tasks:
+            fields = task['fields']
+            yield (f"📅 {fields.get('Title', 'Untitled')}\n"
+                   f"   Due: {fields.get('Due Date', 'No due date')}\n"
+                   f"   Priority: {fields.get('Priority', 'Medium')}\n"
+                   f"   Status: {fields.get('Status', 'Not started')}\n\n")
+
+    def _repositories(self, repos: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        yield "Your GitHub repositories:\n\n"
+        for repo in repos:
+            description = f"   {repo['description']}\n" if repo['description'] else ''
+            yield (f"📁 {repo['name']}\n{description}"
+                   f"   Language: {repo['language'] or 'N/A'}\n"
+                   f"   Stars: {repo['stars']} | Forks: {repo['forks']}\n\n")
+
+    def _repo_activity(self, repo_name: str, days: int, activity: Dict[str, List[Dict[str, Any]]]) -> Iterator[str]:
+        yield f"Activity for {repo_name} in the last {days} days:\n\n"
+        yield "🔨 Recent Commits:\n"
+        for commit in activity['commits']:
+            yield (f"   [{commit['sha']}] {commit['message']}\n"
+                   f"   by {commit['author']} on {commit['date'][:10]}\n\n")
+        yield "🔄 Pull Requests:\n"
+        for pr in activity['pull_requests']:
+            yield f"   #{pr['number']} {pr['title']}\n   Status: {pr['state']}\n\n"
+        yield "❗ Issues:\n"
+        for issue in activity['issues']:
+            yield f"   #{issue['number']} {issue['title']}\n   Status: {issue['state']}\n\n"
+
+
+class MarkdownRenderer(TextRenderer):
+    """Markdown reports with one list item per entry"""
+    name = 'markdown'
+    mimetype = 'text/markdown'
+
+    def _note(self, note: str) -> Iterator[str]:
+        yield f"\n\n_{note}_"
+
+    def _task_list(self, tasks: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        for task in tasks:
+            fields = task['fields']
+            status = fields.get('Status', 'Todo')
+            priority = fields.get('Priority', 'Medium')
+            yield (f"- {STATUS_EMOJI.get(status, '📋')} **{fields['Title']}** — "
+                   f"{PRIORITY_EMOJI.get(priority, '🟡')} {priority} · "
+                   f"due {fields.get('Due Date', 'no due date')} · {status}\n")
+
+    def _due_tasks(self, tasks: Iterable[Dict[str, Any]], days: int) -> Iterator[str]:
+        yield f"### Tasks due in the next {days} days\n\n"
+        for task in tasks:
+            fields = task['fields']
+            yield (f"- 📅 **{fields.get('Title', 'Untitled')}** — due {fields.get('Due Date', 'no due date')} · "
+                   f"{fields.get('Priority', 'Medium')} · {fields.get('Status', 'Not started')}\n")
+
+    def _repositories(self, repos: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        yield "### Your GitHub repositories\n\n"
+        for repo in repos:
+            description = f": {repo['description']}" if repo['description'] else ''
+            yield (f"- 📁 **{repo['name']}**{description}  \n"
+                   f"  {repo['language'] or 'N/A'} · ★ {repo['stars']} · forks {repo['forks']}\n")
+
+    def _repo_activity(self, repo_name: str, days: int, activity: Dict[str, List[Dict[str, Any]]]) -> Iterator[str]:
+        yield f"### Activity for {repo_name} in the last {days} days\n\n"
+        yield "#### 🔨 Recent Commits\n\n"
+        for commit in activity['commits']:
+            yield f"- `{commit['sha']}` {commit['message']} — {commit['author']}, {commit['date'][:10]}\n"
+        yield "\n#### 🔄 Pull Requests\n\n"
+        for pr in activity['pull_requests']:
+            yield f"- #{pr['number']} {pr['title']} ({pr['state']})\n"
+        yield "\n#### ❗ Issues\n\n"
+        for issue in activity['issues']:
+            yield f"- #{issue['number']} {issue['title']} ({issue['state']})\n"
+
+
+class JSONRenderer:
+    """JSON documents, written an entry at a time"""
+    name = 'json'
+    mimetype = 'application/json'
+
+    def message(self, text: str) -> Iterator[str]:
+        """Render a reply as ``{"message": ...}``"""
+        yield json.dumps({'message': text})
+
+    def error(self, text: str) -> Iterator[str]:
+        """Render an error as ``{"error": ...}``"""
+        yield json.dumps({'error': text})
+
+    def task_list(self, tasks: Iterable[Dict[str, Any]], note: Optional[str] = None) -> Iterator[str]:
+        """Render tasks as ``{"tasks": [...]}``, with the note under ``"note"``"""
+        yield '{"tasks": '
+        yield from self._array(tasks)
+        yield f', "note": {json.dumps(note)}}}' if note else '}'
+
+    def due_tasks(self, tasks: Iterable[Dict[str, Any]], days: int) -> Iterator[str]:
+        """Render due tasks as ``{"days": n, "tasks": [...]}``"""
+        yield f'{{"days": {int(days)}, "tasks": '
+        yield from self._array(tasks)
+        yield '}'
+
+    def repositories(self, repos: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Render repositories as ``{"repos": [...]}``"""
+        yield '{"repos": '
+        yield from self._array(repos)
+        yield '}'
+
+    def repo_activity(self, repo_name: str, days: int, activity: Dict[str, List[Dict[str, Any]]]) -> Iterator[str]:
+        """Render activity as ``{"repo": ..., "days": n, "commits": [...], ...}``"""
+        yield f'{{"repo": {json.dumps(repo_name)}, "days": {int(days)}'
+        for key in ACTIVITY_KEYS:
+            yield f', "{key}": '
+            yield from self._array(activity[key])
+        yield '}'
+
+    @staticmethod
+    def _array(items: Iterable[Any]) -> Iterator[str]:
+        separator = '['
+        for item in items:
+            yield separator + json.dumps(item)
+            separator = ', '
+        yield '[]' if separator == '[' else ']'
+
+
+RENDERERS = {renderer.name: renderer for renderer in (TextRenderer(), MarkdownRenderer(), JSONRenderer())}
+
+
+def get_renderer(name: Optional[str] = None):
+    """Get the renderer for an output format, plain text by default"""
+    try:
+        return RENDERERS[(name or 'text').lower()]
+    except KeyError:
+        raise ValueError(f"Unknown format: {name}. Must be one of: {list(RENDERERS)}")
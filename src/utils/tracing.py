@@ -0,0 +1,329 @@
+"""
+Lightweight request tracing with JSON lines and OTLP exporters
+"""
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Spans kept per trace; later spans are counted but dropped
+MAX_SPANS = int(os.getenv('TRACE_MAX_SPANS', '1000'))
+
+# W3C trace context header: version-traceid-parentid-flags
+TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+# OTLP span kinds
+SPAN_KINDS = {'internal': 1, 'server': 2, 'client': 3}
+
+_current: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+class Trace:
+    """The spans recorded for one sampled request"""
+
+    def __init__(self, tracer: 'Tracer', trace_id: str):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.spans: List['Span'] = []
+        self.dropped = 0
+
+    def add(self, span: 'Span') -> None:
+        """Keep a finished span, up to ``MAX_SPANS``"""
+        if len(self.spans) < self.tracer.max_spans:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+
+class Span:
+    """One timed operation in a trace"""
+
+    def __init__(self, name: str, trace: Trace, parent: Optional['Span'] = None, parent_id: Optional[str] = None,
+                 kind: str = 'internal', attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace = trace
+        self.parent = parent
+        self.parent_id = parent.span_id if parent else parent_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+        self._token = _current.set(self)
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, trace_id={self.trace.trace_id!r}, span_id={self.span_id!r})"
+
+    @property
+    def traceparent(self) -> str:
+        """W3C ``traceparent`` header continuing the trace from this span"""
+        return f"00-{self.trace.trace_id}-{self.span_id}-01"
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Duration in milliseconds, once finished"""
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute, such as a status code"""
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """End the span, recording ``error`` if the operation raised"""
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Finished in another context, e.g. a generator closed elsewhere
+            _current.set(self.parent)
+        self.trace.add(self)
+        if self.parent is None:
+            self.trace.tracer.export(self.trace)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The span as one JSON-serializable record"""
+        return {
+            'trace_id': self.trace.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'start': self.start_ns / 1e9,
+            'duration_ms': self.duration_ms,
+            'attributes': self.attributes,
+            'error': self.error
+        }
+
+
+def current_span() -> Optional[Span]:
+    """The span the caller is running in, if its request is being traced"""
+    return _current.get()
+
+
+def start_span(name: str, kind: str = 'internal', attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+    """Open a child of the current span; None, at the cost of one lookup, when not tracing
+
+    The caller must ``finish()`` the span it gets back.
+    """
+    parent = _current.get()
+    if parent is None:
+        return None
+    return Span(name, parent.trace, parent, kind=kind, attributes=attributes)
+
+
+@contextmanager
+def span(name: str, kind: str = 'internal', **attributes: Any) -> Iterator[Optional[Span]]:
+    """Run the block in a child span of the current span, if there is one"""
+    active = start_span(name, kind, attributes)
+    if active is None:
+        yield None
+        return
+    error = None
+    try:
+        yield active
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        active.finish(error)
+
+
+@contextmanager
+def start_trace(name: str, traceparent: Optional[str] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Open the root span of a request, if the tracer samples it
+
+    A valid ``traceparent`` header continues the caller's trace, and its
+    sampled flag is honoured instead of rolling the sample rate.
+    """
+    root = get_tracer().begin(name, traceparent, attributes)
+    if root is None:
+        yield None
+        return
+    error = None
+    try:
+        yield root
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        root.finish(error)
+
+
+class JSONLinesExporter:
+    """Append spans to a file, one JSON object per line"""
+    name = 'jsonl'
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('TRACE_FILE', 'traces.jsonl')
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        """Write a finished trace"""
+        lines = ''.join(json.dumps(span.to_dict(), default=str) + '\n' for span in spans)
+        with self._lock, open(self.path, 'a') as f:
+            f.write(lines)
+
+
+class OTLPExporter:
+    """Send spans to an OpenTelemetry collector over OTLP/HTTP with JSON encoding"""
+    name = 'otlp'
+
+    def __init__(self, endpoint: Optional[str] = None, service_name: Optional[str] = None, timeout: float = 5.0):
+        endpoint = (endpoint or os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT', 'http://localhost:4318')).rstrip('/')
+        self.url = endpoint if endpoint.endswith('/v1/traces') else f"{endpoint}/v1/traces"
+        self.service_name = service_name or os.getenv('OTEL_SERVICE_NAME', 'gitaccountable')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def export(self, spans: List[Span]) -> None:
+        """Post a finished trace to the collector"""
+        response = self.session.post(self.url, json=self.payload(spans), timeout=self.timeout)
+        response.raise_for_status()
+
+    def payload(self, spans: List[Span]) -> Dict[str, Any]:
+        """The OTLP ``ExportTraceServiceRequest`` for ``spans``"""
+        return {'resourceSpans': [{
+            'resource': {'attributes': [_otlp_attribute('service.name', self.service_name)]},
+            'scopeSpans': [{
+                'scope': {'name': __name__},
+                'spans': [self._span(span) for span in spans]
+            }]
+        }]}
+
+    @staticmethod
+    def _span(span: Span) -> Dict[str, Any]:
+        record = {
+            'traceId': span.trace.trace_id,
+            'spanId': span.span_id,
+            'name': span.name,
+            'kind': SPAN_KINDS.get(span.kind, 1),
+            'startTimeUnixNano': str(span.start_ns),
+            'endTimeUnixNano': str(span.end_ns),
+            'attributes': [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+            'status': {'code': 2, 'message': span.error} if span.error else {'code': 1}
+        }
+        if span.parent_id:
+            record['parentSpanId'] = span.parent_id
+        return record
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+EXPORTERS = {'jsonl': JSONLinesExporter, 'otlp': OTLPExporter}
+
+
+class Tracer:
+    """Sample requests and hand their finished traces to an exporter
+
+    A fraction ``sample_rate`` of requests is traced. Unsampled requests open
+    no spans at all, so instrumented code only pays for one context variable
+    lookup per call. Traces are exported from a background thread; when its
+    queue is full, traces are dropped rather than slowing requests down.
+    """
+
+    def __init__(self, exporter=None, sample_rate: float = 1.0, max_spans: int = MAX_SPANS, queue_size: int = 1000):
+        """Create a tracer; without an exporter nothing is ever sampled"""
+        self.exporter = exporter
+        self.sample_rate = sample_rate if exporter is not None else 0.0
+        self.max_spans = max_spans
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def begin(self, name: str, traceparent: Optional[str] = None,
+              attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+        """Open a root span, or return None when the request is not sampled"""
+        if self.exporter is None:
+            return None
+        match = TRACEPARENT_RE.match(traceparent.strip().lower()) if traceparent else None
+        if match:
+            trace_id, parent_id, flags = match.groups()
+            if not int(flags, 16) & 1:
+                return None
+        elif random.random() < self.sample_rate:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        else:
+            return None
+        # The root span has no parent Span in this process, so it exports the trace
+        return Span(name, Trace(self, trace_id), parent_id=parent_id, kind='server', attributes=attributes)
+
+    def export(self, trace: Trace) -> None:
+        """Queue a finished trace for the exporter"""
+        try:
+            self._queue.put_nowait(trace.spans)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name='trace-exporter', daemon=True)
+                    self._worker.start()
+
+    def flush(self) -> None:
+        """Wait until every queued trace has been exported"""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            spans = self._queue.get()
+            try:
+                self.exporter.export(spans)
+            except Exception as e:
+                logger.warning(f"Error exporting trace: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+
+def create_tracer() -> Tracer:
+    """Build the tracer from the environment
+
+    ``TRACE_EXPORTER`` (jsonl or otlp) enables tracing and
+    ``TRACE_SAMPLE_RATE`` sets the fraction of requests traced.
+    """
+    name = os.getenv('TRACE_EXPORTER', '').strip().lower()
+    if not name:
+        return Tracer()
+    if name not in EXPORTERS:
+        raise ValueError(f"Unknown trace exporter: {name}. Must be one of: {list(EXPORTERS)}")
+    return Tracer(EXPORTERS[name](), sample_rate=float(os.getenv('TRACE_SAMPLE_RATE', '0.01')))
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer, built from the environment on first use"""
+    global _tracer
+    if _tracer is None:
+        _tracer = create_tracer()
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Replace the process-wide tracer; None rebuilds it from the environment"""
+    global _tracer
+    _tracer = tracer
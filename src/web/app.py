@@ -2,18 +2,25 @@
 Web server for AI Accountability Bot
 """
 import os
+import json
 import logging
-from flask import Flask, jsonify, request, send_from_directory, session
+from functools import wraps
+from itertools import islice
+from flask import Flask, Response, jsonify, request, send_from_directory, session, stream_with_context
 from src.core.chat import ChatService
 from src.core.bot import AIAccountabilityBot
 from src.managers.task_manager import TaskManager
 from src.managers.airtable_manager import AirtableManager
-from src.managers.github_manager import GitHubManager
 from src.web.auth import auth_bp, login_required
+from src.web.github_pool import github_managers
+from src.web.health import HealthMonitor, airtable_probe, github_probe, openai_probe
+from src.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+from src.utils.logging_config import configure_logging
+from src.utils.tracing import start_trace
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by whatever starts the server (gunicorn.conf.py, the
+# ASGI lifespan or __main__ below), never on import
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -28,6 +35,10 @@ REQUIRED_ENV_VARS = [
     'OPENAI_API_KEY'
 ]
 
+# Page sizes for /tasks
+TASKS_PAGE_SIZE = 50
+TASKS_MAX_PAGE_SIZE = 500
+
 # Check for required environment variables
 missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
 if missing_vars:
@@ -61,8 +72,20 @@ try:
     # Initialize services
     airtable_manager = AirtableManager()
     task_manager = TaskManager(airtable_manager)
-    chat_service = ChatService(api_key=os.getenv('OPENAI_API_KEY'))
+    chat_service = ChatService(
+        api_key=os.getenv('OPENAI_API_KEY'),
+        airtable_manager=airtable_manager,
+        task_manager=task_manager
+    )
     bot = AIAccountabilityBot(task_manager, chat_service)
+
+    # Probes start with the first health check, so importing the app makes no requests
+    health_monitor = HealthMonitor([
+        airtable_probe(airtable_manager),
+        openai_probe(chat_service),
+        github_probe()
+    ])
+    REGISTRY.register(health_monitor.latency)
     logger.info("Services initialized successfully")
 except Exception as e:
     logger.error(f"Failed to initialize services: {str(e)}")
@@ -82,33 +105,44 @@ def home():
 
 @app.route('/health')
 def health():
-    """Health check endpoint"""
-    try:
-        airtable_health = airtable_manager.is_healthy()
-        chat_health = chat_service.is_healthy()
-        github_health = True  # GitHub health is per-user
-        
-        return jsonify({
-            "status": "healthy" if all([airtable_health, chat_health]) else "unhealthy",
-            "services": {
-                "airtable": airtable_health,
-                "chat": chat_health,
-                "github": github_health
-            }
-        })
-    except Exception as e:
-        logger.error(f"Error in health check: {str(e)}")
-        return jsonify({
-            "status": "error",
-            "message": str(e),
-            "services": {
-                "airtable": False,
-                "chat": False,
-                "github": False
-            }
-        }), 500
+    """Health check endpoint, answered from the last background probe round"""
+    health_monitor.start()
+    return jsonify(health_monitor.report())
+
+@app.route('/health/live')
+def health_live():
+    """Liveness check: the process is up and serving requests"""
+    return jsonify(health_monitor.liveness())
+
+@app.route('/health/ready')
+def health_ready():
+    """Readiness check: every critical dependency passed its last probe"""
+    health_monitor.start()
+    return jsonify(health_monitor.report()), 200 if health_monitor.is_ready() else 503
+
+@app.route('/metrics')
+def metrics():
+    """Call counts, errors, latencies and in-flight calls in the Prometheus text format"""
+    return Response(REGISTRY.exposition(), content_type=METRICS_CONTENT_TYPE)
+
+def traced(view):
+    """Decorator running a view in the root span of a sampled request trace
+
+    The response carries a ``traceparent`` header naming the trace.
+    """
+    @wraps(view)
+    def decorated_function(*args, **kwargs):
+        with start_trace(f"{request.method} {request.path}", request.headers.get('traceparent'),
+                         **{'http.request.method': request.method, 'url.path': request.path}) as root:
+            response = app.make_response(view(*args, **kwargs))
+            if root:
+                root.set_attribute('http.response.status_code', response.status_code)
+                response.headers['traceparent'] = root.traceparent
+            return response
+    return decorated_function
 
 @app.route('/command', methods=['POST'])
+@traced
 @login_required
 def command():
     """Handle bot commands"""
@@ -120,12 +154,20 @@ def command():
                 "message": "No command provided"
             }), 400
 
-        # Initialize GitHub manager if we have a token
+        # Reports are rendered as text unless a format is requested
+        try:
+            user_bot = bot.with_format(data.get('format'))
+        except ValueError as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400
+
+        # Bind the user's pooled GitHub manager to a per-request view of the bot
         if 'github_token' in session:
-            github_manager = GitHubManager(session['github_token']['access_token'])
-            bot.github_manager = github_manager
+            user_bot = user_bot.with_github(github_managers.get(session['github_token']['access_token']))
 
-        result = bot.process_command(data['command'])
+        result = user_bot.process_command(data['command'])
         return jsonify({
             "status": "success",
             "result": result
@@ -137,12 +179,114 @@ def command():
             "message": str(e)
         }), 500
 
+@app.route('/command/stream', methods=['POST'])
+@login_required
+def command_stream():
+    """Handle bot commands, streaming the response as Server-Sent Events"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data.get('command'):
+        return jsonify({
+            "status": "error",
+            "message": "No command provided"
+        }), 400
+
+    try:
+        user_bot = bot.with_format(data.get('format'))
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    if 'github_token' in session:
+        user_bot = user_bot.with_github(github_managers.get(session['github_token']['access_token']))
+
+    # Reports arrive a block at a time, free-form answers a token at a time
+    def events():
+        try:
+            for chunk in user_bot.stream_command(data['command']):
+                yield f"data: {json.dumps({'token': chunk})}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming command: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Stop proxies from buffering the stream
+    })
+
+@app.route('/tasks', methods=['GET'])
+@login_required
+def list_tasks():
+    """List tasks a page at a time, or stream them as NDJSON
+
+    Query parameters: ``status``, ``sort`` (``due_date``, ``title`` or
+    ``created``; prefix ``-`` for descending), ``due_before``, ``due_after``,
+    ``limit`` and ``cursor`` (the ``next_cursor`` of the previous page).
+    With ``format=ndjson`` or ``Accept: application/x-ndjson`` tasks are
+    streamed one JSON object per line; without a ``limit`` every match is
+    streamed, otherwise a final ``{"next_cursor": ...}`` line follows a
+    full page.
+    """
+    ndjson = (request.args.get('format') == 'ndjson'
+              or 'application/x-ndjson' in request.headers.get('Accept', ''))
+    sort = request.args.get('sort', 'due_date')
+    descending = sort.startswith('-')
+    sort = sort.lstrip('-')
+    limit = request.args.get('limit', None if ndjson else TASKS_PAGE_SIZE, type=int)
+    if limit is not None:
+        limit = max(1, min(limit, TASKS_MAX_PAGE_SIZE))
+
+    try:
+        tasks = task_manager.iter_tasks(
+            status=request.args.get('status'),
+            sort=sort,
+            descending=descending,
+            cursor=request.args.get('cursor'),
+            due_before=request.args.get('due_before'),
+            due_after=request.args.get('due_after')
+        )
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error listing tasks: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+    if ndjson:
+        def lines():
+            last = None
+            for count, task in enumerate(tasks):
+                if limit is not None and count == limit:
+                    yield json.dumps({'next_cursor': task_manager.task_cursor(last, sort)}) + '\n'
+                    return
+                yield json.dumps(task) + '\n'
+                last = task
+
+        return Response(stream_with_context(lines()), mimetype='application/x-ndjson', headers={
+            'X-Accel-Buffering': 'no'
+        })
+
+    # One task past the page tells whether there is a next one
+    page = list(islice(tasks, limit + 1))
+    next_cursor = task_manager.task_cursor(page[limit - 1], sort) if len(page) > limit else None
+    return jsonify({
+        "status": "success",
+        "tasks": page[:limit],
+        "next_cursor": next_cursor
+    })
+
 @app.route('/repos', methods=['GET'])
 @login_required
 def list_repos():
     """List user's GitHub repositories"""
     try:
-        github_manager = GitHubManager(session['github_token']['access_token'])
+        github_manager = github_managers.get(session['github_token']['access_token'])
         repos = github_manager.get_repositories()
         return jsonify({
             "status": "success",
@@ -161,7 +305,7 @@ def repo_activity(repo_name):
     """Get repository activity"""
     try:
         days = request.args.get('days', 7, type=int)
-        github_manager = GitHubManager(session['github_token']['access_token'])
+        github_manager = github_managers.get(session['github_token']['access_token'])
         activity = github_manager.get_repo_activity(repo_name, days)
         return jsonify({
             "status": "success",
@@ -179,5 +323,6 @@ def serve_static(filename):
     return send_from_directory('static', filename)
 
 if __name__ == '__main__':
+    configure_logging()
     port = int(os.environ.get('PORT', 8000))
     app.run(host='0.0.0.0', port=port)
@@ -0,0 +1,366 @@
+"""
+ASGI server for AI Accountability Bot
+
+Serves the command, health and repository endpoints on an event loop, so
+one worker keeps many slow OpenAI and GitHub calls in flight at once.
+OpenAI is awaited natively through the async client; Airtable and GitHub
+calls run in the shared I/O pool. Every other route (the UI, OAuth and
+static files) is served by the Flask app, which shares its session cookie
+with these endpoints.
+
+Run with ``uvicorn src.web.asgi:app`` or
+``gunicorn -k uvicorn.workers.UvicornWorker src.web.asgi:app``.
+"""
+import json
+import logging
+import os
+import re
+from functools import wraps
+from http.cookies import SimpleCookie
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from itsdangerous import BadSignature
+
+from src.core.chat import AsyncChatService
+from src.managers.async_adapters import AsyncAirtableManager, AsyncGitHubManager, AsyncTaskManager, iterate_io, run_io
+from src.managers.github_activity import shutdown_pools
+from src.utils.logging_config import configure_logging
+from src.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+from src.utils.tracing import Span, start_trace
+from src.web.app import app as flask_app, airtable_manager, bot, chat_service, health_monitor, task_manager
+from src.web.github_pool import github_managers
+
+logger = logging.getLogger(__name__)
+
+async_airtable = AsyncAirtableManager(airtable_manager)
+async_tasks = AsyncTaskManager(task_manager)
+async_chat = AsyncChatService(chat_service)
+
+
+class Request:
+    """The parts of an ASGI HTTP request the async routes use"""
+
+    def __init__(self, scope: Dict[str, Any], receive: Callable, send: Callable, params: Dict[str, str]):
+        self.scope = scope
+        self.receive = receive
+        self.send = send
+        self.params = params
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope.get('headers', [])}
+        self.args = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        self._session: Optional[Dict[str, Any]] = None
+        # Root span when the request is traced
+        self.trace: Optional[Span] = None
+
+    @property
+    def session(self) -> Dict[str, Any]:
+        """The Flask session stored in the signed session cookie"""
+        if self._session is None:
+            self._session = {}
+            cookies = SimpleCookie()
+            cookies.load(self.headers.get('cookie', ''))
+            morsel = cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+            if morsel:
+                serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+                try:
+                    self._session = serializer.loads(
+                        morsel.value, max_age=int(flask_app.permanent_session_lifetime.total_seconds())
+                    )
+                except BadSignature:
+                    logger.warning("Ignoring session cookie with an invalid signature")
+        return self._session
+
+    @property
+    def url_root(self) -> str:
+        """Scheme and host the request was made to"""
+        host = self.headers.get('host') or '{}:{}'.format(*self.scope.get('server') or ('localhost', 80))
+        return f"{self.scope.get('scheme', 'http')}://{host}"
+
+    async def json(self) -> Any:
+        """Read and decode the JSON request body"""
+        body = b''
+        more_body = True
+        while more_body:
+            message = await self.receive()
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+        return json.loads(body) if body else None
+
+    async def respond(self, status: int, body: bytes, content_type: str) -> None:
+        """Send a complete response"""
+        headers = [(b'content-type', content_type.encode()), (b'content-length', str(len(body)).encode())]
+        if self.trace:
+            self.trace.set_attribute('http.response.status_code', status)
+            headers.append((b'traceparent', self.trace.traceparent.encode()))
+        await self.send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers
+        })
+        await self.send({'type': 'http.response.body', 'body': body})
+
+    async def respond_json(self, payload: Dict[str, Any], status: int = 200) -> None:
+        """Send ``payload`` as the JSON response"""
+        await self.respond(status, json.dumps(payload).encode(), 'application/json')
+
+    async def respond_events(self, events: AsyncIterator[str]) -> None:
+        """Send ``events`` as a Server-Sent Events stream"""
+        await self.send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no')  # Stop proxies from buffering the stream
+            ]
+        })
+        async for event in events:
+            await self.send({'type': 'http.response.body', 'body': event.encode(), 'more_body': True})
+        await self.send({'type': 'http.response.body', 'body': b''})
+
+
+Handler = Callable[[Request], Awaitable[None]]
+
+
+def login_required(handler: Handler) -> Handler:
+    """Decorator to require login"""
+    @wraps(handler)
+    async def decorated_function(request: Request) -> None:
+        if 'github_token' not in request.session:
+            logger.warning("Unauthenticated access attempt")
+            return await request.respond_json({
+                'status': 'error',
+                'message': 'Authentication required',
+                'login_url': f"{request.url_root}/auth/login"
+            }, 401)
+        return await handler(request)
+    return decorated_function
+
+
+def traced(handler: Handler) -> Handler:
+    """Decorator running a route in the root span of a sampled request trace"""
+    @wraps(handler)
+    async def decorated_function(request: Request) -> None:
+        method, path = request.scope['method'], request.scope['path']
+        with start_trace(f"{method} {path}", request.headers.get('traceparent'),
+                         **{'http.request.method': method, 'url.path': path}) as root:
+            request.trace = root
+            return await handler(request)
+    return decorated_function
+
+
+async def user_bot_for(request: Request):
+    """Per-request view of the bot bound to the user's pooled GitHub manager"""
+    if 'github_token' not in request.session:
+        return bot
+    github_manager = await run_io(github_managers.get, request.session['github_token']['access_token'])
+    return bot.with_github(github_manager)
+
+
+async def process_command(user_bot, text: str) -> str:
+    """Answer a command in the I/O pool"""
+    return await run_io(user_bot.process_command, text)
+
+
+async def stream_command(user_bot, text: str) -> AsyncIterator[str]:
+    """Like ``process_command``, yielding reports as they render and free-form answers token by token
+
+    Commands stream from the bot's own generator in the I/O pool, as the
+    Flask route does; free-form input is awaited on the async OpenAI client.
+    """
+    if bot.chat_service is None or user_bot.handles(text):
+        async for chunk in iterate_io(user_bot.stream_command, text):
+            yield chunk
+        return
+    async for token in async_chat.stream_chat(text):
+        yield token
+
+
+async def health(request: Request) -> None:
+    """Health check endpoint, answered from the last background probe round"""
+    health_monitor.start()
+    await request.respond_json(health_monitor.report())
+
+
+async def health_live(request: Request) -> None:
+    """Liveness check: the event loop is up and serving requests"""
+    await request.respond_json(health_monitor.liveness())
+
+
+async def health_ready(request: Request) -> None:
+    """Readiness check: every critical dependency passed its last probe"""
+    health_monitor.start()
+    await request.respond_json(health_monitor.report(), 200 if health_monitor.is_ready() else 503)
+
+
+async def metrics(request: Request) -> None:
+    """Call counts, errors, latencies and in-flight calls in the Prometheus text format"""
+    await request.respond(200, REGISTRY.exposition().encode(), METRICS_CONTENT_TYPE)
+
+
+@traced
+@login_required
+async def command(request: Request) -> None:
+    """Handle bot commands"""
+    try:
+        data = await request.json()
+        if not data or 'command' not in data:
+            return await request.respond_json({
+                "status": "error",
+                "message": "No command provided"
+            }, 400)
+
+        try:
+            user_bot = (await user_bot_for(request)).with_format(data.get('format'))
+        except ValueError as e:
+            return await request.respond_json({
+                "status": "error",
+                "message": str(e)
+            }, 400)
+
+        result = await process_command(user_bot, data['command'])
+        await request.respond_json({
+            "status": "success",
+            "result": result
+        })
+    except Exception as e:
+        logger.error(f"Error processing command: {str(e)}")
+        await request.respond_json({
+            "status": "error",
+            "message": str(e)
+        }, 500)
+
+
+@login_required
+async def command_stream(request: Request) -> None:
+    """Handle bot commands, streaming the response as Server-Sent Events"""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or not data.get('command'):
+        return await request.respond_json({
+            "status": "error",
+            "message": "No command provided"
+        }, 400)
+
+    try:
+        user_bot = (await user_bot_for(request)).with_format(data.get('format'))
+    except ValueError as e:
+        return await request.respond_json({
+            "status": "error",
+            "message": str(e)
+        }, 400)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for chunk in stream_command(user_bot, data['command']):
+                yield f"data: {json.dumps({'token': chunk})}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming command: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+
+    await request.respond_events(events())
+
+
+@login_required
+async def list_repos(request: Request) -> None:
+    """List user's GitHub repositories"""
+    try:
+        github_manager = await run_io(github_managers.get, request.session['github_token']['access_token'])
+        repos = await AsyncGitHubManager(github_manager).get_repositories()
+        await request.respond_json({
+            "status": "success",
+            "repos": repos
+        })
+    except Exception as e:
+        logger.error(f"Error listing repositories: {str(e)}")
+        await request.respond_json({
+            "status": "error",
+            "message": str(e)
+        }, 500)
+
+
+@login_required
+async def repo_activity(request: Request) -> None:
+    """Get repository activity"""
+    try:
+        try:
+            days = int(request.args.get('days', 7))
+        except ValueError:
+            days = 7
+        github_manager = await run_io(github_managers.get, request.session['github_token']['access_token'])
+        activity = await AsyncGitHubManager(github_manager).get_repo_activity(request.params['repo_name'], days)
+        await request.respond_json({
+            "status": "success",
+            "activity": activity
+        })
+    except Exception as e:
+        logger.error(f"Error getting repository activity: {str(e)}")
+        await request.respond_json({
+            "status": "error",
+            "message": str(e)
+        }, 500)
+
+
+ROUTES: List[Tuple[Tuple[str, ...], re.Pattern, Handler]] = [
+    (('GET',), re.compile(r'^/health$'), health),
+    (('GET',), re.compile(r'^/health/live$'), health_live),
+    (('GET',), re.compile(r'^/health/ready$'), health_ready),
+    (('GET',), re.compile(r'^/metrics$'), metrics),
+    (('POST',), re.compile(r'^/command$'), command),
+    (('POST',), re.compile(r'^/command/stream$'), command_stream),
+    (('GET',), re.compile(r'^/repos$'), list_repos),
+    (('GET',), re.compile(r'^/repos/(?P<repo_name>.+)/activity$'), repo_activity),
+]
+
+
+class AsyncApp:
+    """ASGI app serving ``ROUTES`` natively and everything else through Flask"""
+
+    def __init__(self, routes: List[Tuple[Tuple[str, ...], re.Pattern, Handler]], fallback: Callable):
+        self.routes = routes
+        self.fallback = fallback
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] == 'http':
+            # Servers pass the path already percent-decoded
+            path = scope['path']
+            for methods, pattern, handler in self.routes:
+                match = pattern.match(path)
+                if match and scope['method'] in methods:
+                    return await handler(Request(scope, receive, send, match.groupdict()))
+        return await self.fallback(scope, receive, send)
+
+    async def lifespan(self, receive: Callable, send: Callable) -> None:
+        """Configure logging on startup; flush queued writes and close GitHub clients and threads on shutdown"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                configure_logging()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                try:
+                    await async_tasks.flush()
+                    await async_airtable.flush()
+                    await run_io(github_managers.clear)
+                    await run_io(shutdown_pools)
+                    health_monitor.stop()
+                except Exception as e:
+                    logger.error(f"Error shutting down: {str(e)}")
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+app = AsyncApp(ROUTES, WsgiToAsgi(flask_app))
+
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.environ.get('PORT', 8000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
@@ -9,8 +9,8 @@ from flask import Blueprint, redirect, session, url_for, jsonify, request, curre
 from requests_oauthlib import OAuth2Session
 from functools import wraps
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from src.web.github_pool import github_managers
+
 logger = logging.getLogger(__name__)
 
 # GitHub OAuth settings
@@ -137,7 +137,9 @@ def github_callback():
 @auth_bp.route('/logout')
 def logout():
     """Log out user"""
-    session.pop('github_token', None)
+    token = session.pop('github_token', None)
+    if token:
+        github_managers.discard(token['access_token'])
     logger.info("User logged out")
     return redirect(url_for('home', _external=True))
 
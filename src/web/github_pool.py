@@ -0,0 +1,114 @@
+"""
+Per-token pool of GitHub managers shared across web requests
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from src.managers.github_manager import GitHubManager, create_github_manager
+
+
+def token_key(access_token: str) -> str:
+    """Pool key for a token, so raw tokens are never held as dict keys"""
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+class GitHubManagerPool:
+    """Bounded LRU of GitHubManager instances, one per access token
+
+    A user's manager, with its warm HTTP session and cache counters, is reused
+    across requests. Managers idle for longer than ``idle_timeout`` seconds are
+    evicted, as is the least recently used one once ``max_size`` is reached.
+    Managers are never shared between tokens.
+    """
+
+    def __init__(self, factory: Callable[[str], GitHubManager] = create_github_manager,
+                 max_size: Optional[int] = None, idle_timeout: Optional[float] = None):
+        """Create an empty pool building managers with ``factory``"""
+        self.factory = factory
+        self.max_size = max_size or int(os.getenv('GITHUB_POOL_SIZE', '256'))
+        self.idle_timeout = idle_timeout or float(os.getenv('GITHUB_POOL_IDLE_TIMEOUT', '1800'))
+        # token hash -> (manager, last used)
+        self._managers: 'OrderedDict[str, Tuple[GitHubManager, float]]' = OrderedDict()
+        self._building: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, access_token: str) -> GitHubManager:
+        """Get the manager for ``access_token``, building it on first use"""
+        key = token_key(access_token)
+        manager = self._checkout(key)
+        if manager is not None:
+            return manager
+
+        # Build outside the pool lock, but only once per token
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        with building:
+            manager = self._checkout(key)
+            if manager is None:
+                manager = self.factory(access_token)
+                self._checkin(key, manager)
+        with self._lock:
+            self._building.pop(key, None)
+        return manager
+
+    def discard(self, access_token: str) -> None:
+        """Drop and close the manager for ``access_token``, e.g. on logout"""
+        with self._lock:
+            entry = self._managers.pop(token_key(access_token), None)
+        if entry:
+            entry[0].close()
+
+    def evict_idle(self) -> int:
+        """Close managers idle for longer than the timeout, returning how many"""
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = []
+        with self._lock:
+            while self._managers:
+                key, (manager, last_used) = next(iter(self._managers.items()))
+                if last_used > cutoff:
+                    break
+                del self._managers[key]
+                evicted.append(manager)
+        for manager in evicted:
+            manager.close()
+        return len(evicted)
+
+    def clear(self) -> None:
+        """Close every pooled manager"""
+        with self._lock:
+            managers = [manager for manager, _ in self._managers.values()]
+            self._managers.clear()
+        for manager in managers:
+            manager.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._managers)
+
+    def _checkout(self, key: str) -> Optional[GitHubManager]:
+        self.evict_idle()
+        with self._lock:
+            entry = self._managers.get(key)
+            if entry is None:
+                return None
+            self._managers[key] = (entry[0], time.monotonic())
+            self._managers.move_to_end(key)
+            return entry[0]
+
+    def _checkin(self, key: str, manager: GitHubManager) -> None:
+        evicted = []
+        with self._lock:
+            self._managers[key] = (manager, time.monotonic())
+            self._managers.move_to_end(key)
+            while len(self._managers) > self.max_size:
+                evicted.append(self._managers.popitem(last=False)[1][0])
+        for old in evicted:
+            old.close()
+
+
+# Process-wide pool used by the web routes and cleared on logout
+github_managers = GitHubManagerPool()
@@ -0,0 +1,190 @@
+"""
+Background dependency probes behind the health endpoints
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from src.core.chat import CHAT_MODEL
+from src.managers.github_client import GITHUB_API_URL
+from src.managers.rate_limiter import Priority, request_priority
+from src.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+PROBE_INTERVAL = float(os.getenv('HEALTH_PROBE_INTERVAL', '30'))
+PROBE_TIMEOUT = float(os.getenv('HEALTH_PROBE_TIMEOUT', '5'))
+
+
+class Probe:
+    """A named dependency check, unhealthy when ``check`` returns falsy or raises
+
+    Readiness only depends on critical probes; the others are reported but
+    never take the instance out of rotation.
+    """
+
+    def __init__(self, name: str, check: Callable[[], Any], critical: bool = True, timeout: Optional[float] = None):
+        self.name = name
+        self.check = check
+        self.critical = critical
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"Probe({self.name!r}, critical={self.critical})"
+
+
+def airtable_probe(airtable_manager) -> Probe:
+    """Probe Airtable at interactive priority, so a busy rate limiter cannot make the instance unready"""
+    def check() -> bool:
+        with request_priority(Priority.INTERACTIVE):
+            return airtable_manager.is_healthy()
+    return Probe('airtable', check)
+
+
+def openai_probe(chat_service) -> Probe:
+    """Probe OpenAI by looking up the chat model, which uses no tokens"""
+    def check() -> bool:
+        return chat_service.is_healthy() and bool(chat_service.client.models.retrieve(CHAT_MODEL))
+    return Probe('chat', check)
+
+
+def github_probe(timeout: float = PROBE_TIMEOUT, base_url: Optional[str] = None) -> Probe:
+    """Probe GitHub's rate limit endpoint, which does not count against the limit
+
+    ``base_url`` defaults to ``GITHUB_API_URL``, as for the GitHub clients.
+    GitHub access is per user, so an outage degrades those features without
+    making the instance unready.
+    """
+    base_url = (base_url or os.getenv('GITHUB_API_URL', GITHUB_API_URL)).rstrip('/')
+
+    def check() -> bool:
+        return requests.get(f"{base_url}/rate_limit", timeout=timeout).status_code < 500
+    return Probe('github', check, critical=False)
+
+
+class HealthMonitor:
+    """Run dependency probes in a background thread and keep the last report
+
+    Every ``interval`` seconds all probes run concurrently, each given
+    ``timeout`` seconds. A probe still running from an earlier round is not
+    started again, so a hung dependency never piles up threads. Health
+    endpoints read the last published report, which is swapped in whole and
+    never blocks on a dependency.
+    """
+
+    def __init__(self, probes: List[Probe], interval: Optional[float] = None, timeout: Optional[float] = None):
+        """Create a monitor; probing starts with ``start()``"""
+        self.probes = list(probes)
+        self.interval = interval if interval is not None else PROBE_INTERVAL
+        self.timeout = timeout if timeout is not None else PROBE_TIMEOUT
+        # Results older than this mean the probe loop has stalled
+        self.max_age = 3 * self.interval + self.timeout
+        # Registered on /metrics by the app that owns the monitor
+        self.latency = Histogram('gitaccountable_health_probe_latency_seconds', 'Health probe latency in seconds',
+                                 ('probe',), registry=None)
+        self.histograms = {probe.name: self.latency.labels(probe.name) for probe in self.probes}
+        self.started_at = time.time()
+        self._pool = ThreadPoolExecutor(max_workers=max(len(self.probes), 1), thread_name_prefix='health-probe')
+        self._inflight: Dict[str, Future] = {}
+        self._report: Dict[str, Any] = {
+            'status': 'starting',
+            'checked_at': None,
+            'services': {probe.name: False for probe in self.probes},
+            'probes': {}
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start probing in the background; later calls do nothing"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop probing, without waiting for probes still in flight"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.timeout + 1)
+        self._pool.shutdown(wait=False)
+
+    def report(self) -> Dict[str, Any]:
+        """Get the last published report"""
+        return self._report
+
+    def is_ready(self) -> bool:
+        """Whether every critical probe passed in a recent round"""
+        report = self._report
+        return (report['status'] == 'healthy'
+                and time.time() - report['checked_at'] <= self.max_age)
+
+    def liveness(self) -> Dict[str, Any]:
+        """Liveness only says the process is serving; it never depends on other services"""
+        return {'status': 'alive', 'uptime': round(time.time() - self.started_at, 3)}
+
+    def run_probes(self) -> Dict[str, Any]:
+        """Run every probe once and publish the results"""
+        started = time.monotonic()
+        futures = {}
+        for probe in self.probes:
+            future = self._inflight.get(probe.name)
+            if future is None or future.done():
+                future = self._inflight[probe.name] = self._pool.submit(self._check, probe)
+            futures[probe.name] = future
+
+        results = {}
+        for probe in self.probes:
+            timeout = probe.timeout if probe.timeout is not None else self.timeout
+            try:
+                healthy, latency, error = futures[probe.name].result(max(started + timeout - time.monotonic(), 0))
+            except FutureTimeout:
+                healthy, latency, error = False, timeout, f"Timed out after {timeout:g}s"
+            self.histograms[probe.name].observe(latency)
+            results[probe.name] = {
+                'healthy': healthy,
+                'critical': probe.critical,
+                'latency_ms': round(latency * 1000, 3),
+                'error': error
+            }
+        return self._publish(results)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_probes()
+            except Exception as e:
+                logger.error(f"Error running health probes: {str(e)}")
+            self._stop.wait(self.interval)
+
+    @staticmethod
+    def _check(probe: Probe):
+        start = time.monotonic()
+        try:
+            healthy, error = bool(probe.check()), None
+            if not healthy:
+                error = "Check failed"
+        except Exception as e:
+            healthy, error = False, str(e)
+        if not healthy:
+            logger.warning(f"Health probe {probe.name} failed: {error}")
+        return healthy, time.monotonic() - start, error
+
+    def _publish(self, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        for name, result in results.items():
+            result['latency'] = self.histograms[name].snapshot()
+        healthy = all(result['healthy'] for result in results.values() if result['critical'])
+        self._report = {
+            'status': 'healthy' if healthy else 'unhealthy',
+            'checked_at': time.time(),
+            'services': {name: result['healthy'] for name, result in results.items()},
+            'probes': results
+        }
+        return self._report
@@ -46,7 +46,7 @@ async function sendCommand() {
         responseArea.textContent = 'Processing...';
         responseArea.className = 'bg-gray-50 rounded-md p-4 min-h-[100px] whitespace-pre-wrap';
         
-        const response = await fetch('/command', {
+        const response = await fetch('/command/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -54,24 +54,49 @@ async function sendCommand() {
             body: JSON.stringify({ command: command })
         });
 
-        const data = await response.json();
-        
         // If not authenticated, redirect to login
         if (response.status === 401) {
+            const data = await response.json();
             window.location.href = data.login_url || '/auth/login';
             return;
         }
-        
-        // Update response area
-        responseArea.textContent = data.status === 'success' 
-            ? (typeof data.result === 'string' ? data.result : JSON.stringify(data.result, null, 2))
-            : `Error: ${data.message || 'Unknown error'}`;
+
+        if (!response.ok) {
+            const data = await response.json();
+            responseArea.textContent = `Error: ${data.message || 'Unknown error'}`;
+            responseArea.classList.add('text-red-600');
+            return;
+        }
+
+        // Render tokens as Server-Sent Events arrive
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let status = 'success';
+        responseArea.textContent = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            for (const event of events) {
+                const type = (event.match(/^event: (.*)$/m) || [])[1] || 'message';
+                const data = JSON.parse((event.match(/^data: (.*)$/m) || [])[1] || '{}');
+                if (type === 'message') {
+                    responseArea.textContent += data.token;
+                } else if (type === 'error') {
+                    status = 'error';
+                    responseArea.textContent = `Error: ${data.message || 'Unknown error'}`;
+                }
+            }
+        }
             
         // Add status class
-        responseArea.classList.add(data.status === 'success' ? 'text-green-600' : 'text-red-600');
+        responseArea.classList.add(status === 'success' ? 'text-green-600' : 'text-red-600');
 
         // Clear input on success
-        if (data.status === 'success' && commandInput) {
+        if (status === 'success' && commandInput) {
             commandInput.value = '';
         }
 
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+TaskManager and AirtableManager benchmarks against the local Airtable stand-in
+
+Run with ``python -m pytest tests/benchmarks --benchmark-only`` (add
+``--benchmark-autosave`` and ``--benchmark-compare`` to catch regressions
+between runs). Each benchmark runs at 100, 10k and 100k records.
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.managers.airtable_manager import AirtableManager
+from src.managers.task_manager import TaskManager
+from tests.fake_airtable import FakeAirtable, sample_repositories, sample_tasks
+
+SIZES = [100, 10_000, 100_000]
+
+# Rounds for benchmarks that move the whole table over HTTP
+BULK_ROUNDS = 3
+
+
+@pytest.fixture(scope='module')
+def fake():
+    with FakeAirtable() as server:
+        yield server
+
+
+@pytest.fixture(scope='module', params=SIZES, ids=str)
+def base(request, fake):
+    base_id = f"appBench{request.param:09d}"
+    fake.seed(base_id, 'Tasks', sample_tasks(request.param))
+    fake.seed(base_id, 'GitHub Repositories', sample_repositories(request.param))
+    with patch.dict(os.environ, fake.environ(base_id)):
+        yield base_id
+    del fake.bases[base_id]
+
+
+@pytest.fixture(scope='module')
+def airtable_manager(base):
+    manager = AirtableManager()
+    manager.sync.refresh(full=True)
+    # Keep the mirror still so reads measure the local index only
+    manager.sync.interval = manager.sync.sweep_interval = float('inf')
+    return manager
+
+
+@pytest.fixture(scope='module')
+def task_manager(airtable_manager):
+    manager = TaskManager(airtable_manager)
+    manager.sync.refresh(full=True)
+    manager.sync.interval = manager.sync.sweep_interval = float('inf')
+    return manager
+
+
+@pytest.mark.benchmark(group='tasks.full_sync')
+def test_task_full_sync(benchmark, task_manager):
+    benchmark.pedantic(task_manager.sync.refresh, kwargs={'full': True}, rounds=BULK_ROUNDS)
+
+
+@pytest.mark.benchmark(group='tasks.delta_sync')
+def test_task_delta_sync(benchmark, fake, base, task_manager):
+    # 1% of tasks change; every refresh pulls them through the watermark formula
+    table = fake.table(base, 'Tasks')
+    tomorrow = (datetime.now() + timedelta(days=1)).isoformat()
+    for record_id in list(table.records)[::100]:
+        table.write(record_id, {'Last Updated': tomorrow})
+    benchmark.pedantic(task_manager.sync.refresh, rounds=BULK_ROUNDS)
+
+
+@pytest.mark.benchmark(group='tasks.get_due_tasks')
+def test_get_due_tasks(benchmark, task_manager):
+    tasks = benchmark(task_manager.get_due_tasks, 7)
+    assert tasks
+
+
+@pytest.mark.benchmark(group='tasks.get_tasks_by_status')
+def test_get_tasks_by_status(benchmark, task_manager):
+    assert benchmark(task_manager.get_tasks_by_status, 'In Progress')
+
+
+@pytest.mark.benchmark(group='tasks.find_task_by_title')
+def test_find_task_by_title(benchmark, task_manager):
+    assert benchmark(task_manager.find_task_by_title, 'task 42')
+
+
+@pytest.mark.benchmark(group='tasks.list_page')
+def test_list_first_page(benchmark, task_manager):
+    def first_page():
+        tasks = task_manager.iter_tasks(status='Todo', sort='due_date')
+        return [task for task, _ in zip(tasks, range(20))]
+
+    assert len(benchmark(first_page)) == 20
+
+
+@pytest.mark.benchmark(group='tasks.create_task')
+def test_create_task(benchmark, task_manager):
+    record = benchmark(task_manager.create_task, 'Benchmark task', 'Created over HTTP')
+    assert record['id'].startswith('rec')
+
+
+@pytest.mark.benchmark(group='tasks.deferred_creates')
+def test_deferred_creates(benchmark, task_manager):
+    def create_and_flush():
+        futures = [task_manager.create_task(f"Deferred {i}", '', defer=True) for i in range(50)]
+        task_manager.flush()
+        return [future.result() for future in futures]
+
+    assert len(benchmark.pedantic(create_and_flush, rounds=BULK_ROUNDS)) == 50
+
+
+@pytest.mark.benchmark(group='airtable.full_sync')
+def test_repository_full_sync(benchmark, airtable_manager):
+    benchmark.pedantic(airtable_manager.sync.refresh, kwargs={'full': True}, rounds=BULK_ROUNDS)
+
+
+@pytest.mark.benchmark(group='airtable.search_local')
+def test_search_repositories_local(benchmark, airtable_manager):
+    assert benchmark(airtable_manager.search_repositories, 'data pipeline')
+
+
+@pytest.mark.benchmark(group='airtable.search_server')
+def test_search_repositories_server(benchmark, airtable_manager):
+    airtable_manager.local_search = False
+    try:
+        results = benchmark.pedantic(airtable_manager.search_repositories, args=('data pipeline',),
+                                     rounds=BULK_ROUNDS)
+    finally:
+        airtable_manager.local_search = True
+    assert results
+
+
+@pytest.mark.benchmark(group='airtable.get_repository_by_name')
+def test_get_repository_by_name(benchmark, airtable_manager):
+    assert benchmark(airtable_manager.get_repository_by_name, 'repo-42')
@@ -0,0 +1,681 @@
+"""
+Local stand-in for the Airtable REST API used by TaskManager and AirtableManager
+"""
+import argparse
+import inspect
+import json
+import re
+import secrets
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Airtable's limits on page size and records per write
+MAX_PAGE_SIZE = 100
+MAX_RECORDS_PER_REQUEST = 10
+
+# Unfinished list iterators kept for their offsets
+MAX_ITERATORS = 100
+
+
+class FormulaError(ValueError):
+    """A formula the stand-in cannot parse or does not implement"""
+
+
+class _CellError(Exception):
+    """A formula that evaluates to #ERROR! for one record, which then does not match"""
+
+
+_TOKEN_RE = re.compile(r"""\s*(?:
+      (?P<field>\{[^}]*\})
+    | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    | (?P<number>\d+(?:\.\d+)?)
+    | (?P<op>>=|<=|!=|=|>|<|&|\+|-|\*|/|\(|\)|,)
+    | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""", re.VERBOSE | re.DOTALL)
+
+_ESCAPES = {'n': '\n', 't': '\t'}
+
+
+def _tokenize(formula: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    while pos < len(formula):
+        match = _TOKEN_RE.match(formula, pos)
+        if match is None:
+            if formula[pos:].strip():
+                raise FormulaError(f"Unexpected character at {pos}: {formula[pos:pos + 20]!r}")
+            break
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+    return tokens
+
+
+def _truthy(value: Any) -> bool:
+    return value not in (None, '', 0, False) and value != []
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _number(value: Any) -> float:
+    if value in (None, ''):
+        return 0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise _CellError(f"Not a number: {value!r}")
+
+
+def _date(value: Any) -> datetime:
+    if not value:
+        raise _CellError("Blank date")
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        raise _CellError(f"Not a date: {value!r}")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _find(needle: Any, haystack: Any, start: Any = 0) -> int:
+    return _text(haystack).find(_text(needle), max(int(_number(start)) - 1, 0)) + 1
+
+
+def _is_same(first: Any, second: Any, unit: Any = None) -> bool:
+    first, second = _date(first), _date(second)
+    if unit in ('day', 'days'):
+        return first.date() == second.date()
+    return first == second
+
+
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    'AND': lambda *values: all(_truthy(value) for value in values),
+    'OR': lambda *values: any(_truthy(value) for value in values),
+    'NOT': lambda value: not _truthy(value),
+    'IF': lambda condition, then, otherwise=None: then if _truthy(condition) else otherwise,
+    'FIND': _find,
+    'LOWER': lambda value: _text(value).lower(),
+    'UPPER': lambda value: _text(value).upper(),
+    'TRIM': lambda value: _text(value).strip(),
+    'LEN': lambda value: len(_text(value)),
+    'IS_BEFORE': lambda first, second: _date(first) < _date(second),
+    'IS_AFTER': lambda first, second: _date(first) > _date(second),
+    'IS_SAME': _is_same,
+    'BLANK': lambda: None,
+    'TRUE': lambda: True,
+    'FALSE': lambda: False,
+}
+
+
+def _compare(op: str) -> Callable[[Any, Any], bool]:
+    def compare(left: Any, right: Any) -> bool:
+        # Blanks compare as 0 against numbers and as '' against text
+        if isinstance(left, (int, float)) or isinstance(right, (int, float)):
+            left, right = _number(left), _number(right)
+        else:
+            left, right = _text(left), _text(right)
+        if op == '=':
+            return left == right
+        if op == '!=':
+            return left != right
+        if op == '>':
+            return left > right
+        if op == '<':
+            return left < right
+        if op == '>=':
+            return left >= right
+        return left <= right
+    return compare
+
+
+def _divide(left: Any, right: Any) -> float:
+    if not _number(right):
+        raise _CellError("Division by zero")
+    return _number(left) / _number(right)
+
+
+_ARITHMETIC = {
+    '+': lambda left, right: _number(left) + _number(right),
+    '-': lambda left, right: _number(left) - _number(right),
+    '*': lambda left, right: _number(left) * _number(right),
+    '/': _divide,
+    '&': lambda left, right: _text(left) + _text(right),
+}
+
+
+Expression = Callable[[Dict[str, Any]], Any]
+
+
+class _Parser:
+    """Recursive descent over Airtable formula syntax, compiling to closures over a record"""
+
+    def __init__(self, formula: str):
+        self.formula = formula
+        self.tokens = _tokenize(formula)
+        self.pos = 0
+
+    def parse(self) -> Expression:
+        expression = self.comparison()
+        if self.pos != len(self.tokens):
+            raise FormulaError(f"Unexpected {self.tokens[self.pos][1]!r} in {self.formula!r}")
+        return expression
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) else None
+
+    def take(self, expected: Optional[str] = None) -> Tuple[str, str]:
+        if self.pos >= len(self.tokens):
+            raise FormulaError(f"Unexpected end of {self.formula!r}")
+        token = self.tokens[self.pos]
+        if expected is not None and token[1] != expected:
+            raise FormulaError(f"Expected {expected!r}, got {token[1]!r} in {self.formula!r}")
+        self.pos += 1
+        return token
+
+    def binary(self, operators: Iterable[str], operand: Callable[[], Expression],
+               combine: Callable[[str], Callable[[Any, Any], Any]]) -> Expression:
+        left = operand()
+        while self.peek() in operators and self.tokens[self.pos][0] == 'op':
+            func = combine(self.take()[1])
+            right = operand()
+            left = (lambda l, r, f: lambda record: f(l(record), r(record)))(left, right, func)
+        return left
+
+    def comparison(self) -> Expression:
+        return self.binary(('=', '!=', '>', '<', '>=', '<='), self.concatenation, _compare)
+
+    def concatenation(self) -> Expression:
+        return self.binary(('&',), self.additive, _ARITHMETIC.__getitem__)
+
+    def additive(self) -> Expression:
+        return self.binary(('+', '-'), self.multiplicative, _ARITHMETIC.__getitem__)
+
+    def multiplicative(self) -> Expression:
+        return self.binary(('*', '/'), self.unary, _ARITHMETIC.__getitem__)
+
+    def unary(self) -> Expression:
+        if self.peek() == '-':
+            self.take()
+            operand = self.unary()
+            return lambda record: -_number(operand(record))
+        return self.primary()
+
+    def primary(self) -> Expression:
+        kind, value = self.take()
+        if kind == 'number':
+            number = float(value) if '.' in value else int(value)
+            return lambda record: number
+        if kind == 'string':
+            text = re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)), value[1:-1], flags=re.DOTALL)
+            return lambda record: text
+        if kind == 'field':
+            name = value[1:-1]
+            return lambda record: record['fields'].get(name)
+        if value == '(':
+            expression = self.comparison()
+            self.take(')')
+            return expression
+        if kind == 'name':
+            return self.call(value.upper())
+        raise FormulaError(f"Unexpected {value!r} in {self.formula!r}")
+
+    def call(self, name: str) -> Expression:
+        args: List[Expression] = []
+        if self.peek() == '(':
+            self.take('(')
+            if self.peek() != ')':
+                args.append(self.comparison())
+                while self.peek() == ',':
+                    self.take(',')
+                    args.append(self.comparison())
+            self.take(')')
+        elif name not in ('TRUE', 'FALSE'):
+            raise FormulaError(f"Expected '(' after {name} in {self.formula!r}")
+        if name == 'RECORD_ID' and not args:
+            return lambda record: record['id']
+        func = _FUNCTIONS.get(name)
+        if func is None:
+            raise FormulaError(f"Unsupported function {name} in {self.formula!r}")
+        try:
+            inspect.signature(func).bind(*args)
+        except TypeError:
+            raise FormulaError(f"Wrong number of arguments to {name} in {self.formula!r}")
+        return lambda record: func(*(arg(record) for arg in args))
+
+
+@lru_cache(maxsize=256)
+def compile_formula(formula: str) -> Callable[[Dict[str, Any]], bool]:
+    """Compile a ``filterByFormula`` into a predicate over records
+
+    Supports field references, string and number literals, comparison,
+    arithmetic and ``&``, and the functions in ``_FUNCTIONS`` plus
+    ``RECORD_ID()`` - enough for every formula the managers emit.
+    """
+    expression = _Parser(formula).parse()
+
+    def matches(record: Dict[str, Any]) -> bool:
+        try:
+            return _truthy(expression(record))
+        except _CellError:
+            return False
+    return matches
+
+
+class _RequestError(Exception):
+    def __init__(self, status: int, error_type: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+        self.message = message
+
+
+def _error(error_type: str, message: str) -> Dict[str, Any]:
+    return {'error': {'type': error_type, 'message': message}}
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # Blanks first, then numbers, then text, as Airtable sorts ascending
+    if value in (None, ''):
+        return (0, 0)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (1, value)
+    return (2, _text(value).lower())
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+class FakeTable:
+    """One table's records, in creation order"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a record, returning it as the API would"""
+        record = {'id': f"rec{secrets.token_hex(7)}", 'createdTime': _now(),
+                  'fields': {key: value for key, value in fields.items() if value is not None}}
+        self.records[record['id']] = record
+        return record
+
+    def write(self, record_id: str, fields: Dict[str, Any], replace: bool = False) -> Dict[str, Any]:
+        """Update a record's fields; None clears a field
+
+        Records are replaced rather than mutated, so list iterators in
+        progress keep the version they started with.
+        """
+        current = self.records[record_id]
+        merged = {} if replace else dict(current['fields'])
+        for key, value in fields.items():
+            if value is None:
+                merged.pop(key, None)
+            else:
+                merged[key] = value
+        record = {**current, 'fields': merged}
+        self.records[record_id] = record
+        return record
+
+    def get(self, record_id: str) -> Dict[str, Any]:
+        """Get a record or raise a 404"""
+        record = self.records.get(record_id)
+        if record is None:
+            raise _RequestError(404, 'NOT_FOUND', f"Could not find record {record_id}")
+        return record
+
+
+class FakeAirtable:
+    """The Airtable REST API, served from memory on a local port
+
+    Speaks the subset of the wire protocol pyairtable uses: record get,
+    create, update and delete, their batch forms (at most 10 records), and
+    listing with ``pageSize``/``offset`` pagination, ``fields[]``, ``sort``,
+    ``maxRecords`` and ``filterByFormula`` (see ``compile_formula``), over
+    GET or the ``listRecords`` POST fallback. Every request waits
+    ``latency`` seconds; more than ``rate_limit`` requests per second to a
+    base, or any request after ``throttle()``, gets a 429. Requests are
+    recorded in ``requests`` as ``(method, path)``.
+    """
+
+    def __init__(self, latency: float = 0.0, rate_limit: Optional[float] = None, api_key: Optional[str] = None):
+        """Create the stand-in; ``api_key`` None accepts any bearer token"""
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.api_key = api_key
+        self.bases: Dict[str, Dict[str, FakeTable]] = defaultdict(dict)
+        self.requests: List[Tuple[str, str]] = []
+        self.throttled = 0
+        self._forced_throttles = 0
+        self._recent: Dict[str, Deque[float]] = defaultdict(deque)
+        self._iterators: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'FakeAirtable':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Endpoint URL to give pyairtable, e.g. via ``AIRTABLE_ENDPOINT_URL``"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> 'FakeAirtable':
+        """Serve on a background thread; port 0 picks a free port"""
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        name='fake-airtable', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def table(self, base_id: str, name: str) -> FakeTable:
+        """Get a table, creating it empty on first use"""
+        with self._lock:
+            table = self.bases[base_id].get(name)
+            if table is None:
+                table = self.bases[base_id][name] = FakeTable(name)
+            return table
+
+    def seed(self, base_id: str, name: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert records directly, without going through HTTP"""
+        table = self.table(base_id, name)
+        with self._lock:
+            return [table.add(fields) for fields in rows]
+
+    def environ(self, base_id: str, rate_limit: float = 1000.0) -> Dict[str, str]:
+        """Environment pointing AirtableManager and TaskManager at ``base_id`` here
+
+        The client-side rate limit is raised so local runs are not paced at
+        Airtable's 5 requests per second.
+        """
+        return {
+            'AIRTABLE_ENDPOINT_URL': self.url,
+            'AIRTABLE_API_KEY': self.api_key or 'keyFakeAirtable',
+            'AIRTABLE_BASE_ID': base_id,
+            'AIRTABLE_RATE_LIMIT': str(rate_limit),
+        }
+
+    def throttle(self, count: int = 1) -> None:
+        """Answer the next ``count`` requests with 429"""
+        with self._lock:
+            self._forced_throttles += count
+
+    def handle(self, method: str, target: str, body: Optional[Dict[str, Any]],
+               authorization: Optional[str]) -> Tuple[int, Dict[str, Any]]:
+        """Answer one request, returning the status and JSON payload"""
+        url = urlsplit(target)
+        with self._lock:
+            self.requests.append((method, url.path))
+        if self.latency:
+            time.sleep(self.latency)
+
+        token = authorization[len('Bearer '):] if authorization and authorization.startswith('Bearer ') else None
+        if not token or (self.api_key and token != self.api_key):
+            return 401, _error('AUTHENTICATION_REQUIRED', 'Authentication required')
+        parts = [unquote(part) for part in url.path.split('/') if part]
+        if len(parts) < 3 or parts[0] != 'v0':
+            return 404, _error('NOT_FOUND', f"Unknown path {url.path}")
+        if self._throttled(parts[1]):
+            return 429, _error('RATE_LIMIT_REACHED', 'Rate limit exceeded. Please try again later')
+
+        with self._lock:
+            table = self.bases.get(parts[1], {}).get(parts[2])
+            if table is None:
+                return 404, _error('TABLE_NOT_FOUND', f"Could not find table {parts[2]} in base {parts[1]}")
+            try:
+                return 200, self._route(method, table, parts[3:], parse_qs(url.query, keep_blank_values=True),
+                                        body or {})
+            except _RequestError as e:
+                return e.status, _error(e.error_type, e.message)
+
+    def _route(self, method: str, table: FakeTable, rest: List[str], query: Dict[str, List[str]],
+               body: Dict[str, Any]) -> Dict[str, Any]:
+        if not rest:
+            if method == 'GET':
+                return self._list(table, _list_options(query))
+            if method == 'POST':
+                return self._create(table, body)
+            if method in ('PATCH', 'PUT'):
+                return self._update(table, body, replace=method == 'PUT')
+            if method == 'DELETE':
+                return self._delete(table, query.get('records[]', []))
+        elif rest == ['listRecords'] and method == 'POST':
+            return self._list(table, body)
+        elif len(rest) == 1:
+            if method == 'GET':
+                return table.get(rest[0])
+            if method in ('PATCH', 'PUT'):
+                table.get(rest[0])
+                return table.write(rest[0], body.get('fields', {}), replace=method == 'PUT')
+            if method == 'DELETE':
+                table.get(rest[0])
+                del table.records[rest[0]]
+                return {'id': rest[0], 'deleted': True}
+        raise _RequestError(404, 'NOT_FOUND', f"Unsupported {method} on table {table.name}")
+
+    def _list(self, table: FakeTable, options: Dict[str, Any]) -> Dict[str, Any]:
+        page_size = int(options.get('pageSize') or MAX_PAGE_SIZE)
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise _RequestError(422, 'INVALID_PAGE_SIZE', f"pageSize must be between 1 and {MAX_PAGE_SIZE}")
+        offset = options.get('offset')
+        if offset:
+            iterator, _, position = offset.partition('/')
+            records = self._iterators.get(iterator)
+            if records is None or not position.isdigit():
+                raise _RequestError(422, 'LIST_RECORDS_ITERATOR_NOT_AVAILABLE', 'Iterator not available')
+            start = int(position)
+        else:
+            iterator, records, start = None, self._select(table, options), 0
+
+        end = start + page_size
+        fields = options.get('fields')
+        page = records[start:end]
+        if fields:
+            page = [{**record, 'fields': {name: record['fields'][name] for name in fields
+                                          if name in record['fields']}} for record in page]
+        response: Dict[str, Any] = {'records': page}
+        if end < len(records):
+            if iterator is None:
+                iterator = f"itr{secrets.token_hex(7)}"
+                self._iterators[iterator] = records
+                while len(self._iterators) > MAX_ITERATORS:
+                    del self._iterators[next(iter(self._iterators))]
+            response['offset'] = f"{iterator}/{end}"
+        elif iterator is not None:
+            self._iterators.pop(iterator, None)
+        return response
+
+    @staticmethod
+    def _select(table: FakeTable, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+        records = list(table.records.values())
+        formula = options.get('filterByFormula')
+        if formula:
+            try:
+                matches = compile_formula(formula)
+            except FormulaError as e:
+                raise _RequestError(422, 'INVALID_FILTER_BY_FORMULA', str(e))
+            records = [record for record in records if matches(record)]
+        for order in reversed(options.get('sort') or []):
+            field = order['field']
+            records.sort(key=lambda record: _sort_key(record['fields'].get(field)),
+                         reverse=order.get('direction') == 'desc')
+        max_records = options.get('maxRecords')
+        return records[:int(max_records)] if max_records else records
+
+    @staticmethod
+    def _check_batch(records: List[Any]) -> None:
+        if len(records) > MAX_RECORDS_PER_REQUEST:
+            raise _RequestError(422, 'INVALID_RECORDS',
+                                f"At most {MAX_RECORDS_PER_REQUEST} records per request, got {len(records)}")
+
+    def _create(self, table: FakeTable, body: Dict[str, Any]) -> Dict[str, Any]:
+        if 'records' not in body:
+            return table.add(body.get('fields', {}))
+        self._check_batch(body['records'])
+        return {'records': [table.add(record.get('fields', {})) for record in body['records']]}
+
+    def _update(self, table: FakeTable, body: Dict[str, Any], replace: bool) -> Dict[str, Any]:
+        if body.get('performUpsert'):
+            raise _RequestError(422, 'INVALID_REQUEST_UNKNOWN', 'performUpsert is not supported by the stand-in')
+        records = body.get('records', [])
+        self._check_batch(records)
+        for record in records:
+            table.get(record.get('id', ''))
+        return {'records': [table.write(record['id'], record.get('fields', {}), replace) for record in records]}
+
+    def _delete(self, table: FakeTable, record_ids: List[str]) -> Dict[str, Any]:
+        self._check_batch(record_ids)
+        for record_id in record_ids:
+            table.get(record_id)
+        for record_id in record_ids:
+            del table.records[record_id]
+        return {'records': [{'id': record_id, 'deleted': True} for record_id in record_ids]}
+
+    def _throttled(self, base_id: str) -> bool:
+        with self._lock:
+            if self._forced_throttles:
+                self._forced_throttles -= 1
+                self.throttled += 1
+                return True
+            if self.rate_limit:
+                now = time.monotonic()
+                recent = self._recent[base_id]
+                while recent and now - recent[0] >= 1:
+                    recent.popleft()
+                if len(recent) >= self.rate_limit:
+                    self.throttled += 1
+                    return True
+                recent.append(now)
+            return False
+
+
+def _list_options(query: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Turn list records query parameters into the ``listRecords`` body form"""
+    options: Dict[str, Any] = {}
+    sort: Dict[int, Dict[str, str]] = defaultdict(dict)
+    for name, values in query.items():
+        match = re.fullmatch(r'sort\[(\d+)\]\[(field|direction)\]', name)
+        if match:
+            sort[int(match.group(1))][match.group(2)] = values[-1]
+        elif name == 'fields[]':
+            options['fields'] = values
+        else:
+            options[name] = values[-1]
+    if sort:
+        options['sort'] = [sort[index] for index in sorted(sort)]
+    return options
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            status, payload = 422, _error('INVALID_REQUEST_BODY', 'Could not parse request body')
+        else:
+            status, payload = self.server.fake.handle(self.command, self.path, body,
+                                                      self.headers.get('Authorization'))
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _dispatch
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def sample_tasks(count: int, today: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """Task fields in the shape TaskManager writes, due from 10 days ago to 7 weeks ahead"""
+    today = today or datetime.now()
+    statuses = ('Todo', 'In Progress', 'Done')
+    priorities = ('High', 'Medium', 'Low')
+    for i in range(count):
+        yield {
+            'Title': f"Task {i}",
+            'Description': f"Benchmark task number {i}",
+            'Status': statuses[i % 3],
+            'Priority': priorities[i % 3],
+            'Due Date': (today + timedelta(days=i % 60 - 10)).strftime('%Y-%m-%d'),
+            'Created Date': (today - timedelta(days=i % 90)).strftime('%Y-%m-%d'),
+            'Last Updated': (today - timedelta(hours=i % 720)).isoformat(),
+        }
+
+
+def sample_repositories(count: int, today: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """Repository fields in the shape AirtableManager writes"""
+    today = today or datetime.now()
+    topics = ('api gateway', 'mobile client', 'data pipeline', 'web dashboard', 'machine learning')
+    for i in range(count):
+        yield {
+            'Repository Name': f"repo-{i}",
+            'Description': f"Service {i} for the {topics[i % len(topics)]}",
+            'Created At': (today - timedelta(days=i % 365)).isoformat(),
+            'Last Updated': (today - timedelta(hours=i % 720)).isoformat(),
+        }
+
+
+def main() -> None:
+    """Serve a seeded stand-in until interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--base', default='appFakeAirtable00')
+    parser.add_argument('--tasks', type=int, default=100, help='tasks to seed in the Tasks table')
+    parser.add_argument('--repositories', type=int, default=100, help='records to seed in GitHub Repositories')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second per base before 429')
+    args = parser.parse_args()
+
+    fake = FakeAirtable(latency=args.latency, rate_limit=args.rate_limit)
+    fake.seed(args.base, 'Tasks', sample_tasks(args.tasks))
+    fake.seed(args.base, 'GitHub Repositories', sample_repositories(args.repositories))
+    fake.start(port=args.port)
+    print(f"AIRTABLE_ENDPOINT_URL={fake.url} AIRTABLE_BASE_ID={args.base}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+In-process stand-in for the OpenAI client used by ChatService
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+
+class FakeCompletions:
+    def __init__(self, owner: 'FakeOpenAI'):
+        self.owner = owner
+
+    def create(self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs: Any):
+        self.owner.calls.append({'model': model, 'messages': messages, 'stream': stream, **kwargs})
+        if self.owner.error:
+            raise self.owner.error
+        reply = self.owner.reply_for(messages[-1]['content'])
+        if stream:
+            return self._stream(reply)
+        message = SimpleNamespace(role='assistant', content=reply)
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason='stop')])
+
+    def _stream(self, reply: str) -> Iterator[SimpleNamespace]:
+        time.sleep(self.owner.first_token_delay)
+        # Like the API, the first chunk carries the role and the last one no content
+        yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(role='assistant', content=''))])
+        for token in self.owner.tokenize(reply):
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=token))])
+            time.sleep(self.owner.token_delay)
+        yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=None),
+                                                       finish_reason='stop')])
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs: Any):
+        self.owner.calls.append({'model': model, 'messages': messages, 'stream': stream, **kwargs})
+        if self.owner.error:
+            raise self.owner.error
+        reply = self.owner.reply_for(messages[-1]['content'])
+        if stream:
+            return self._stream(reply)
+        await asyncio.sleep(self.owner.first_token_delay)
+        message = SimpleNamespace(role='assistant', content=reply)
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason='stop')])
+
+    async def _stream(self, reply: str) -> AsyncIterator[SimpleNamespace]:
+        await asyncio.sleep(self.owner.first_token_delay)
+        yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(role='assistant', content=''))])
+        for token in self.owner.tokenize(reply):
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=token))])
+            await asyncio.sleep(self.owner.token_delay)
+        yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=None),
+                                                       finish_reason='stop')])
+
+
+class FakeEmbeddings:
+    def __init__(self, owner: 'FakeOpenAI'):
+        self.owner = owner
+
+    def create(self, model: str, input: str, **kwargs: Any):
+        self.owner.calls.append({'model': model, 'input': input})
+        vector = [float(input.count(letter)) for letter in 'abcdefghijklmnopqrstuvwxyz']
+        return SimpleNamespace(data=[SimpleNamespace(index=0, embedding=vector)])
+
+
+class FakeOpenAI:
+    """Mimics ``OpenAI().chat.completions`` and ``OpenAI().embeddings``
+
+    Replies come from ``replies`` (keyed by the user message) or ``default``.
+    Streams are split into word tokens, after ``first_token_delay`` seconds
+    and ``token_delay`` seconds apart. Every request is kept in ``calls``.
+    """
+
+    def __init__(self, replies: Optional[Dict[str, str]] = None, default: str = 'OK',
+                 first_token_delay: float = 0.0, token_delay: float = 0.0,
+                 error: Optional[Exception] = None):
+        self.api_key = 'sk-fake'
+        self.replies = replies or {}
+        self.default = default
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.error = error
+        self.calls: List[Dict[str, Any]] = []
+        self.chat = SimpleNamespace(completions=FakeCompletions(self))
+        self.embeddings = FakeEmbeddings(self)
+
+    def reply_for(self, prompt: str) -> str:
+        return self.replies.get(prompt, self.default)
+
+    @staticmethod
+    def tokenize(reply: str) -> List[str]:
+        words = reply.split(' ')
+        return [word if i == 0 else ' ' + word for i, word in enumerate(words)]
+
+
+class FakeAsyncOpenAI(FakeOpenAI):
+    """Mimics ``AsyncOpenAI().chat.completions``, sleeping on the event loop"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.chat = SimpleNamespace(completions=FakeAsyncCompletions(self))
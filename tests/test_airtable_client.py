@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import os
+import runpy
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers import airtable_client
+from src.managers.airtable_client import close_all, create_api, get_api
+from src.managers.airtable_manager import AirtableManager
+from src.managers.task_manager import TaskManager
+
+
+class TestAirtableClients(unittest.TestCase):
+    def setUp(self):
+        # Start from an empty registry and put the original clients back afterwards
+        patcher = patch.dict(airtable_client._clients, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.dict(os.environ, {'AIRTABLE_API_KEY': 'keyPooled', 'AIRTABLE_BASE_ID': 'appPooled'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_managers_share_one_client_per_key_and_base(self):
+        airtable_manager = AirtableManager()
+        task_manager = TaskManager()
+
+        self.assertIs(airtable_manager.api, task_manager.api)
+        self.assertIs(TaskManager(airtable_manager).api, airtable_manager.api)
+        self.assertIs(get_api('keyPooled', 'appPooled'), airtable_manager.api)
+        self.assertIsNot(get_api('keyPooled', 'appOther'), airtable_manager.api)
+        self.assertIsNot(get_api('keyOther', 'appPooled'), airtable_manager.api)
+        self.assertEqual(len(airtable_client._clients), 3)
+
+    def test_pool_size_is_applied(self):
+        with patch.dict(os.environ, {'AIRTABLE_POOL_SIZE': '3'}):
+            api = create_api('keyPooled')
+
+        for url in ('https://api.airtable.com', 'http://localhost:8080'):
+            options = api.session.get_adapter(url).poolmanager.connection_pool_kw
+            self.assertEqual(options['maxsize'], 3)
+            self.assertTrue(options['block'])
+        self.assertEqual(create_api('keyPooled').session.get_adapter('https://api.airtable.com')
+                         .poolmanager.connection_pool_kw['maxsize'], 10)
+
+    def test_close_all_closes_sessions_and_clears_the_registry(self):
+        apis = [get_api('keyPooled', 'appPooled'), get_api('keyPooled', 'appOther')]
+        closes = [patch.object(api.session, 'close', wraps=api.session.close) for api in apis]
+        mocks = [close.start() for close in closes]
+        for close in closes:
+            self.addCleanup(close.stop)
+
+        close_all()
+
+        for mock in mocks:
+            mock.assert_called_once_with()
+        self.assertEqual(airtable_client._clients, {})
+        self.assertIsNot(get_api('keyPooled', 'appPooled'), apis[0])
+
+    def test_gunicorn_workers_reopen_pooled_clients(self):
+        api = get_api('keyPooled', 'appPooled')
+        config = runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                             'gunicorn.conf.py'))
+        with patch('src.utils.logging_config.configure_logging') as configure_logging:
+            config['post_fork'](None, None)
+
+        configure_logging.assert_called_once_with()
+        self.assertNotIn(('keyPooled', 'appPooled'), airtable_client._clients)
+        self.assertIsNot(TaskManager().api, api)
+
+
+if __name__ == '__main__':
+    unittest.main()
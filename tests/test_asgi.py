@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import os
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.core.chat import AsyncChatService, ChatService
+from src.core.response_cache import ResponseCache
+from tests.fake_openai import FakeAsyncOpenAI, FakeOpenAI
+
+
+async def call(app, method, path, body=None, cookie=None, query=b''):
+    """Send one HTTP request through the ASGI app and collect the response"""
+    headers = [(b'host', b'testserver')]
+    if cookie:
+        headers.append((b'cookie', cookie.encode()))
+    scope = {'type': 'http', 'method': method, 'path': path, 'raw_path': path.encode(),
+             'query_string': query, 'headers': headers, 'scheme': 'http', 'root_path': '',
+             'server': ('testserver', 80), 'client': ('127.0.0.1', 1234),
+             'http_version': '1.1', 'asgi': {'version': '3.0'}}
+    requests = [{'type': 'http.request', 'body': json.dumps(body).encode() if body is not None else b'',
+                 'more_body': False}]
+    response = {'status': None, 'headers': {}, 'body': b''}
+
+    async def receive():
+        if requests:
+            return requests.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = {name.decode().lower(): value.decode() for name, value in message['headers']}
+        else:
+            response['body'] += message.get('body', b'')
+
+    await app(scope, receive, send)
+    return response
+
+
+class TestAsyncChatService(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeAsyncOpenAI(default='Plan three focus blocks')
+        self.service = ChatService('sk-test', airtable_manager=MagicMock(), task_manager=MagicMock(),
+                                   response_cache=ResponseCache(':memory:'), client=FakeOpenAI())
+        self.chat = AsyncChatService(self.service, client=self.client)
+
+    def test_completions_share_the_response_cache(self):
+        self.assertEqual(asyncio.run(self.chat.chat_with_gpt('help me plan')), 'Plan three focus blocks')
+        self.assertEqual(self.service.chat_with_gpt('Help me plan?'), 'Plan three focus blocks')
+        self.assertEqual(len(self.client.calls), 1)
+        self.assertEqual(self.service.client.calls, [])
+
+    def test_streams_tokens(self):
+        async def collect():
+            return [token async for token in self.chat.stream_chat('help me plan')]
+
+        tokens = asyncio.run(collect())
+        self.assertEqual(''.join(tokens), 'Plan three focus blocks')
+        self.assertGreater(len(tokens), 1)
+
+    def test_commands_run_without_the_llm(self):
+        self.service.task_manager.iter_tasks.return_value = iter([])
+        response = asyncio.run(self.chat.handle_natural_task_command('list tasks'))
+        self.assertIn('No', response)
+        self.assertEqual(self.client.calls, [])
+
+    def test_errors_are_reported(self):
+        self.client.error = Exception('timeout')
+        self.assertEqual(asyncio.run(self.chat.chat_with_gpt('help')), 'Error communicating with ChatGPT: timeout')
+
+
+class TestAsgiApp(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        env = {name: 'test' for name in ('GITHUB_CLIENT_ID', 'GITHUB_CLIENT_SECRET', 'GITHUB_REDIRECT_URI',
+                                          'FLASK_SECRET_KEY', 'OPENAI_API_KEY', 'AIRTABLE_API_KEY',
+                                          'AIRTABLE_BASE_ID')}
+        env['OPENAI_RESPONSE_CACHE'] = ':memory:'
+        with patch.dict(os.environ, env):
+            from src.web import asgi
+        cls.asgi = asgi
+        serializer = asgi.flask_app.session_interface.get_signing_serializer(asgi.flask_app)
+        cls.cookie = 'session=' + serializer.dumps({'github_token': {'access_token': 'token'}})
+
+    def setUp(self):
+        self.task_manager = MagicMock()
+        self.task_manager.iter_tasks.return_value = iter([])
+        self.openai = FakeAsyncOpenAI(default='Plan three focus blocks')
+        service = ChatService('sk-test', airtable_manager=MagicMock(), task_manager=self.task_manager,
+                              response_cache=ResponseCache(':memory:'), client=FakeOpenAI())
+        self.github = MagicMock()
+        self.github.get_repositories.return_value = [{'name': 'hello'}]
+        pool = MagicMock()
+        pool.get.return_value = self.github
+        for name, value in (('bot', AIAccountabilityBot(self.task_manager, service)),
+                            ('async_chat', AsyncChatService(service, client=self.openai)),
+                            ('github_managers', pool)):
+            patcher = patch.object(self.asgi, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def request(self, *args, **kwargs):
+        response = asyncio.run(call(self.asgi.app, *args, **kwargs))
+        return response, response['body'].decode()
+
+    def test_requires_login(self):
+        response, body = self.request('POST', '/command', {'command': 'list tasks'})
+        self.assertEqual(response['status'], 401)
+        self.assertEqual(json.loads(body)['login_url'], 'http://testserver/auth/login')
+
+    def test_commands_run_in_the_io_pool(self):
+        response, body = self.request('POST', '/command', {'command': 'list tasks'}, cookie=self.cookie)
+        self.assertEqual(response['status'], 200)
+        self.assertEqual(json.loads(body), {'status': 'success', 'result': 'No tasks found'})
+        self.assertEqual(self.openai.calls, [])
+
+    def test_rejects_missing_command(self):
+        response, _ = self.request('POST', '/command', {}, cookie=self.cookie)
+        self.assertEqual(response['status'], 400)
+
+    def test_commands_cannot_run_from_a_link(self):
+        # GETs fall through to Flask's static files
+        response, _ = self.request('GET', '/command/stream', cookie=self.cookie, query=b'command=delete+task+Ship')
+        self.assertEqual(response['status'], 404)
+        response, _ = self.request('POST', '/command/stream', cookie=self.cookie, query=b'command=hello')
+        self.assertEqual(response['status'], 400)
+        self.task_manager.delete_task.assert_not_called()
+
+    def test_free_form_requests_are_served_concurrently(self):
+        self.openai.first_token_delay = 0.2
+
+        async def burst():
+            return await asyncio.gather(*[
+                call(self.asgi.app, 'POST', '/command/stream', {'command': f'how should I plan day {i}'},
+                     cookie=self.cookie)
+                for i in range(50)
+            ])
+
+        start = time.monotonic()
+        responses = asyncio.run(burst())
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(len(self.openai.calls), 50)
+        self.assertTrue(all(response['body'].endswith(b'event: done\ndata: {}\n\n') for response in responses))
+
+    def test_unmatched_commands_do_not_call_the_llm(self):
+        response, body = self.request('POST', '/command', {'command': 'how should I plan my day'},
+                                      cookie=self.cookie)
+        self.assertEqual(response['status'], 200)
+        self.assertIn('not sure how to handle', json.loads(body)['result'])
+        self.assertEqual(self.openai.calls, [])
+
+    def test_streams_server_sent_events(self):
+        response, body = self.request('POST', '/command/stream', {'command': 'help me plan'}, cookie=self.cookie)
+
+        self.assertEqual(response['headers']['content-type'], 'text/event-stream; charset=utf-8')
+        events = [event for event in body.split('\n\n') if event]
+        tokens = [json.loads(event[len('data: '):])['token'] for event in events[:-1]]
+        self.assertEqual(''.join(tokens), 'Plan three focus blocks')
+        self.assertEqual(events[-1], 'event: done\ndata: {}')
+
+    def test_reports_stream_as_they_render(self):
+        self.task_manager.iter_tasks.return_value = iter([{'Name': 'Ship'}, {'Name': 'Review'}])
+        response, body = self.request('POST', '/command/stream', {'command': 'list tasks', 'format': 'json'},
+                                      cookie=self.cookie)
+
+        events = [event for event in body.split('\n\n') if event]
+        chunks = [json.loads(event[len('data: '):])['token'] for event in events[:-1]]
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual([task['Name'] for task in json.loads(''.join(chunks))['tasks']], ['Ship', 'Review'])
+        self.assertEqual(events[-1], 'event: done\ndata: {}')
+        self.assertEqual(self.openai.calls, [])
+
+    def test_repository_routes_use_the_pooled_manager(self):
+        self.github.get_repo_activity.return_value = {'commits': []}
+
+        _, body = self.request('GET', '/repos', cookie=self.cookie)
+        self.assertEqual(json.loads(body)['repos'], [{'name': 'hello'}])
+        _, body = self.request('GET', '/repos/octocat/hello/activity', cookie=self.cookie, query=b'days=3')
+        self.assertEqual(json.loads(body)['activity'], {'commits': []})
+        self.github.get_repo_activity.assert_called_once_with('octocat/hello', 3)
+
+    def test_paths_are_not_decoded_twice(self):
+        # The server has already decoded %2525 to %25
+        self.github.get_repo_activity.return_value = {'commits': []}
+        self.request('GET', '/repos/octocat/100%25/activity', cookie=self.cookie)
+        self.github.get_repo_activity.assert_called_once_with('octocat/100%25', 7)
+
+    def test_other_routes_are_served_by_flask(self):
+        response, _ = self.request('GET', '/missing.txt')
+        self.assertEqual(response['status'], 404)
+
+    def test_lifespan_flushes_writes_on_shutdown(self):
+        async def run():
+            messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+            sent = []
+
+            async def receive():
+                return messages.pop(0)
+
+            async def send(message):
+                sent.append(message['type'])
+
+            await self.asgi.app({'type': 'lifespan'}, receive, send)
+            return sent
+
+        with patch.object(self.asgi.async_tasks, 'manager') as tasks, \
+                patch.object(self.asgi.async_airtable, 'manager') as airtable, \
+                patch.object(self.asgi, 'health_monitor') as health_monitor, \
+                patch.object(self.asgi, 'configure_logging') as configure_logging:
+            sent = asyncio.run(run())
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+        configure_logging.assert_called_once_with()
+        tasks.flush.assert_called_once_with()
+        airtable.flush.assert_called_once_with()
+        health_monitor.stop.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
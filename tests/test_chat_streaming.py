@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.core.chat import ChatService
+from src.core.response_cache import ResponseCache
+from tests.fake_openai import FakeOpenAI
+
+
+def make_service(client):
+    return ChatService('sk-test', airtable_manager=MagicMock(), task_manager=MagicMock(),
+                       response_cache=ResponseCache(':memory:'), client=client)
+
+
+class TestChatStreaming(unittest.TestCase):
+    def test_yields_tokens_as_they_arrive(self):
+        client = FakeOpenAI(default='I can manage your tasks', token_delay=0.05)
+        service = make_service(client)
+
+        start = time.monotonic()
+        stream = service.stream_chat('what can you do')
+        first = next(stream)
+        first_latency = time.monotonic() - start
+        rest = list(stream)
+
+        self.assertEqual(first, 'I')
+        self.assertEqual(first + ''.join(rest), 'I can manage your tasks')
+        self.assertLess(first_latency, 0.05)
+        self.assertTrue(client.calls[0]['stream'])
+
+    def test_streamed_responses_are_cached(self):
+        client = FakeOpenAI(default='I can manage your tasks')
+        service = make_service(client)
+
+        ''.join(service.stream_chat('help'))
+        self.assertEqual(list(service.stream_chat('Help?')), ['I can manage your tasks'])
+        self.assertEqual(service.chat_with_gpt('help'), 'I can manage your tasks')
+        self.assertEqual(len(client.calls), 1)
+
+    def test_errors_end_the_stream_with_a_message(self):
+        service = make_service(FakeOpenAI(error=Exception('timeout')))
+        self.assertEqual(list(service.stream_chat('help')), ['Error communicating with ChatGPT: timeout'])
+
+
+class TestBotStreaming(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeOpenAI(default='Sure, here is an idea')
+        self.task_manager = MagicMock()
+        self.task_manager.iter_tasks.return_value = iter([])
+        self.bot = AIAccountabilityBot(self.task_manager, make_service(self.client))
+
+    def test_commands_are_answered_in_one_chunk(self):
+        self.assertEqual(list(self.bot.stream_command('list tasks')), ['No tasks found'])
+        self.assertEqual(self.client.calls, [])
+
+    def test_free_form_input_streams_from_chat(self):
+        chunks = list(self.bot.stream_command('how should I plan my week'))
+        self.assertEqual(''.join(chunks), 'Sure, here is an idea')
+        self.assertGreater(len(chunks), 1)
+
+
+class TestCommandStreamRoute(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        env = {name: 'test' for name in ('GITHUB_CLIENT_ID', 'GITHUB_CLIENT_SECRET', 'GITHUB_REDIRECT_URI',
+                                          'FLASK_SECRET_KEY', 'OPENAI_API_KEY', 'AIRTABLE_API_KEY',
+                                          'AIRTABLE_BASE_ID')}
+        env['OPENAI_RESPONSE_CACHE'] = ':memory:'
+        with patch.dict(os.environ, env):
+            from src.web import app as app_module
+        cls.app_module = app_module
+
+    def setUp(self):
+        task_manager = MagicMock()
+        bot = AIAccountabilityBot(task_manager, make_service(FakeOpenAI(default='Plan three focus blocks')))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for patcher in (patch.object(self.app_module, 'bot', bot),
+                        patch.dict(os.environ, {'GITHUB_CACHE_DIR': tmp.name})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = self.app_module.app.test_client()
+
+    def login(self):
+        with self.client.session_transaction() as session:
+            session['github_token'] = {'access_token': 'token', 'token_type': 'bearer', 'scope': []}
+
+    def test_requires_login(self):
+        response = self.client.post('/command/stream', json={'command': 'hello'})
+        self.assertEqual(response.status_code, 401)
+
+    def test_streams_tokens_as_server_sent_events(self):
+        self.login()
+        response = self.client.post('/command/stream', json={'command': 'help me plan'})
+
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = [event for event in response.get_data(as_text=True).split('\n\n') if event]
+        tokens = [json.loads(event[len('data: '):])['token'] for event in events[:-1]]
+        self.assertEqual(''.join(tokens), 'Plan three focus blocks')
+        self.assertEqual(events[-1], 'event: done\ndata: {}')
+
+    def test_rejects_missing_command(self):
+        self.login()
+        response = self.client.post('/command/stream', json={})
+        self.assertEqual(response.status_code, 400)
+
+    def test_commands_cannot_run_from_a_link(self):
+        self.login()
+        # GETs fall through to the static files
+        response = self.client.get('/command/stream?command=delete+task+Ship')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.post('/command/stream?command=hello').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.core.chat import ChatService
+from src.core.response_cache import ResponseCache
+from src.utils.command_grammar import COMMANDS, CommandGrammar
+from tests.fake_openai import FakeOpenAI
+
+
+class TestCommandGrammar(unittest.TestCase):
+    def assertCommand(self, command, expected, **slots):
+        match = COMMANDS.match(command)
+        self.assertIsNotNone(match, command)
+        self.assertEqual((match.name, match.slots), (expected, slots), command)
+
+    def test_task_commands(self):
+        self.assertCommand('Add task: Review pull requests by Friday', 'add_task',
+                           title='Review pull requests', due_date='Friday')
+        self.assertCommand('list tasks', 'list_tasks')
+        self.assertCommand('show all tasks Done', 'list_tasks', status='Done')
+        self.assertCommand("mark task 'Review pull requests' as Done", 'update_task',
+                           title='Review pull requests', status='Done')
+        self.assertCommand('delete task "groceries"', 'delete_task', title='groceries')
+
+    def test_due_forms_of_bot_and_chat(self):
+        self.assertCommand('due tasks in 3 days', 'due_tasks', days='3')
+        self.assertCommand('show due tasks', 'due_tasks')
+        self.assertCommand('list due', 'due_tasks')
+        self.assertCommand('what is due in 1 day', 'due_tasks', days='1')
+
+    def test_repository_commands(self):
+        self.assertCommand('my repos', 'list_repos')
+        self.assertCommand('display repositories', 'list_repos')
+        self.assertCommand('show activity for octocat/hello in last 3 days', 'repo_activity',
+                           repo='octocat/hello', days='3')
+        self.assertCommand('create issue in octocat/hello: Login fails', 'create_issue',
+                           repo='octocat/hello', text='Login fails')
+        self.assertCommand('add repository test-repo', 'add_repo', name='test-repo')
+        self.assertCommand('find repos accountable', 'search_repos', term='accountable')
+
+    def test_unmatched_input(self):
+        self.assertIsNone(COMMANDS.match('how do I stay focused'))
+        self.assertIsNone(COMMANDS.match(''))
+
+    def test_only_patterns_for_the_first_word_are_tried(self):
+        grammar = CommandGrammar()
+        grammar.register('ping', r'^ping$', ['ping'])
+        grammar.register('greet', r'^(?:hi|ping)\b.*$', ['hi'])
+
+        self.assertEqual(grammar.match('hi there').name, 'greet')
+        self.assertEqual(grammar.match('ping').name, 'ping')
+        self.assertIsNone(grammar.match('ping there'))
+        self.assertEqual(grammar.names, ['ping', 'greet'])
+
+    def test_duplicate_names_are_rejected(self):
+        grammar = CommandGrammar()
+        grammar.register('ping', r'^ping$', ['ping'])
+        with self.assertRaises(ValueError):
+            grammar.register('ping', r'^pong$', ['pong'])
+
+
+class TestSharedDispatch(unittest.TestCase):
+    def setUp(self):
+        self.task_manager = MagicMock()
+        self.task_manager.get_due_tasks.return_value = []
+        self.chat = ChatService('sk-test', airtable_manager=MagicMock(), task_manager=self.task_manager,
+                                response_cache=ResponseCache(':memory:'), client=FakeOpenAI())
+        self.bot = AIAccountabilityBot(self.task_manager, self.chat)
+
+    def test_bot_dispatches_by_name(self):
+        self.assertEqual(self.bot.process_command('list due'), 'No tasks due in the next 7 days')
+        self.task_manager.get_due_tasks.assert_called_once_with(7)
+
+    def test_bot_ignores_commands_it_has_no_handler_for(self):
+        # Repository tracking is a chat command; the bot leaves it unhandled
+        self.assertFalse(self.bot.handles('add repo test-repo'))
+        self.assertIn("not sure how to handle", self.bot.process_command('add repo test-repo'))
+        self.chat.airtable.create_repository.assert_not_called()
+
+    def test_chat_dispatches_repository_commands(self):
+        self.assertEqual(self.chat.handle_natural_task_command('add repo test-repo'), 'Added repository: test-repo')
+        self.chat.airtable.create_repository.assert_called_once_with('test-repo', 'Added via command')
+
+    def test_chat_dispatches_due_in_days(self):
+        self.assertEqual(self.chat.handle_natural_task_command('what is due in 3 days'),
+                         'No tasks due in the next 3 days.')
+
+
+if __name__ == '__main__':
+    unittest.main()
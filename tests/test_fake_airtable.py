@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+import functools
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers.airtable_client import create_api
+from src.managers.airtable_manager import AirtableManager
+from src.managers.rate_limiter import get_scheduler
+from src.managers.task_manager import TaskManager
+from src.utils.metrics import operation
+from tests.fake_airtable import FakeAirtable, FormulaError, compile_formula, sample_repositories, sample_tasks
+
+
+class FakeAirtableTestCase(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeAirtable().start()
+        self.addCleanup(self.fake.stop)
+        # A base per test, so no client or scheduler is shared with another test
+        self.base_id = f"app{self.id().rsplit('.', 1)[-1][-14:]}"
+        patcher = patch.dict(os.environ, self.fake.environ(self.base_id))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.table = create_api('keyFakeAirtable').table(self.base_id, 'Tasks')
+
+    def requests_to(self, method):
+        return [path for m, path in self.fake.requests if m == method]
+
+
+class TestWireProtocol(FakeAirtableTestCase):
+    def test_listing_is_paginated(self):
+        self.fake.seed(self.base_id, 'Tasks', sample_tasks(250))
+        records = self.table.all()
+        self.assertEqual([r['fields']['Title'] for r in records], [f"Task {i}" for i in range(250)])
+        self.assertEqual(len(self.requests_to('GET')), 3)
+        self.assertEqual([len(page) for page in self.table.iterate(page_size=40, max_records=90)], [40, 40, 10])
+
+    def test_fields_sort_and_first(self):
+        self.fake.seed(self.base_id, 'Tasks', sample_tasks(5))
+        records = self.table.all(fields=['Title'], sort=['-Title'])
+        self.assertEqual([r['fields'] for r in records][0], {'Title': 'Task 4'})
+        self.assertEqual(self.table.first()['fields']['Title'], 'Task 0')
+
+    def test_batch_writes_are_chunked(self):
+        self.fake.table(self.base_id, 'Tasks')
+        created = self.table.batch_create([{'Title': f"Task {i}"} for i in range(25)])
+        self.assertEqual(len(self.requests_to('POST')), 3)
+        self.table.batch_update([{'id': r['id'], 'fields': {'Status': 'Done'}} for r in created[:12]])
+        self.table.batch_delete([r['id'] for r in created[12:]])
+        records = self.table.all()
+        self.assertEqual(len(records), 12)
+        self.assertTrue(all(r['fields'] == {'Title': r['fields']['Title'], 'Status': 'Done'} for r in records))
+
+    def test_oversized_batches_and_unknown_records_are_rejected(self):
+        self.fake.table(self.base_id, 'Tasks')
+        with self.assertRaises(requests.exceptions.HTTPError) as raised:
+            self.table.api.request('post', self.table.url, json={'records': [{'fields': {}}] * 11})
+        self.assertEqual(raised.exception.response.status_code, 422)
+        with self.assertRaises(requests.exceptions.HTTPError) as raised:
+            self.table.get('recMissing')
+        self.assertEqual(raised.exception.response.status_code, 404)
+
+    def test_long_formulas_fall_back_to_list_records(self):
+        self.fake.seed(self.base_id, 'Tasks', sample_tasks(3))
+        titles = ', '.join(f"{{Title}} = 'Task {i}'" for i in range(1, 2000))
+        records = self.table.all(formula=f"OR({titles})")
+        self.assertEqual(len(records), 2)
+        self.assertEqual(self.requests_to('POST'), [f"/v0/{self.base_id}/Tasks/listRecords"])
+
+    def test_fallbacks_count_as_one_request(self):
+        self.fake.seed(self.base_id, 'Tasks', sample_tasks(3))
+        scheduler = get_scheduler(self.base_id)
+        calls = {method: operation('airtable_api', method).calls for method in ('GET', 'POST')}
+        before = {method: counter.value for method, counter in calls.items()}
+        titles = ', '.join(f"{{Title}} = 'Task {i}'" for i in range(1, 2000))
+        self.table.all(formula=f"OR({titles})")
+        self.assertEqual(scheduler.metrics()['waits']['interactive']['granted'], 1)
+        self.assertEqual({method: counter.value - before[method] for method, counter in calls.items()},
+                         {'GET': 1, 'POST': 0})
+
+    def test_throttled_requests_are_retried(self):
+        self.fake.seed(self.base_id, 'Tasks', sample_tasks(1))
+        scheduler = get_scheduler(self.base_id)
+        self.fake.throttle(2)
+        with patch.object(scheduler, 'penalize', functools.partial(scheduler.penalize, 0.01)):
+            self.assertEqual(len(self.table.all()), 1)
+        self.assertEqual(self.fake.throttled, 2)
+        self.assertEqual(scheduler.metrics()['throttled'], 2)
+
+    def test_rate_limit_and_latency(self):
+        self.fake.table(self.base_id, 'Tasks')
+        self.fake.rate_limit = 2
+        self.fake.latency = 0.05
+        session = requests.Session()
+        session.headers['Authorization'] = 'Bearer key'
+        start = time.monotonic()
+        statuses = [session.get(f"{self.table.url}").status_code for _ in range(3)]
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        self.assertEqual(statuses, [200, 200, 429])
+        self.assertEqual(session.get(f"{self.fake.url}/v0/{self.base_id}/Tasks",
+                                     headers={'Authorization': ''}).status_code, 401)
+
+
+class TestFormulas(unittest.TestCase):
+    def setUp(self):
+        self.record = {'id': 'rec1', 'fields': {'Repository Name': 'Alpha-API', 'Description': "It's live",
+                                                'Last Updated': '2024-01-05T10:00:00'}}
+
+    def test_formulas_the_managers_emit(self):
+        search = "OR(FIND(LOWER('{0}'), LOWER({{Repository Name}})) > 0, FIND(LOWER('{0}'), LOWER({{Description}})) > 0)"
+        self.assertTrue(compile_formula(search.format('api'))(self.record))
+        self.assertTrue(compile_formula(search.format("it\\'s"))(self.record))
+        self.assertFalse(compile_formula(search.format('beta'))(self.record))
+        self.assertTrue(compile_formula("NOT(IS_BEFORE({Last Updated}, '2024-01-05'))")(self.record))
+        self.assertFalse(compile_formula("NOT(IS_BEFORE({Last Updated}, '2024-01-06'))")(self.record))
+
+    def test_errors_exclude_the_record(self):
+        self.assertFalse(compile_formula("IS_AFTER({Missing}, '2024-01-01')")(self.record))
+        self.assertTrue(compile_formula("AND(RECORD_ID() = 'rec1', LEN({Description}) = 9, 1 + 2 * 3 = 7)")(self.record))
+
+    def test_unsupported_formulas_are_rejected(self):
+        for formula in ("REGEX_MATCH({Title}, 'a')", "NOT(1, 2)", "AND(", "{Title} @ 1"):
+            with self.assertRaises(FormulaError):
+                compile_formula(formula)
+
+
+class TestManagersOffline(FakeAirtableTestCase):
+    def test_task_manager_round_trip(self):
+        self.fake.seed(self.base_id, 'Tasks', sample_tasks(30))
+        task_manager = TaskManager(AirtableManager())
+        self.assertEqual(len(task_manager.get_tasks_by_status('Todo')), 10)
+
+        task = task_manager.create_task('Write report', 'Quarterly numbers', due_date='2000-01-01')
+        task_manager.update_task_status(task['id'], 'In Progress')
+        self.assertEqual(task_manager.find_task_by_title('write report')['fields']['Status'], 'In Progress')
+        self.assertIn(task['id'], [t['id'] for t in task_manager.get_due_tasks(days=0)])
+
+        task_manager.sync.refresh()
+        self.assertEqual(task_manager.sync.stats['delta_pulls'], 1)
+        task_manager.delete_task(task['id'])
+        self.assertEqual(len(self.fake.table(self.base_id, 'Tasks').records), 30)
+
+    def test_delta_syncs_only_pull_records_written_since(self):
+        self.fake.seed(self.base_id, 'Tasks', sample_tasks(30))
+        task_manager = TaskManager(AirtableManager())
+        task_manager.get_tasks_by_status('Todo')
+
+        task = task_manager.create_task('Write report', 'Quarterly numbers')
+        task_manager.sync.refresh()
+        self.assertEqual(task_manager.sync.watermark, task['fields']['Last Updated'])
+
+        # Only the record at the watermark comes back, not everything touched today
+        pulled = task_manager.sync.stats['records_pulled']
+        task_manager.sync.refresh()
+        self.assertEqual(task_manager.sync.stats['records_pulled'] - pulled, 1)
+
+    def test_deferred_writes_are_batched(self):
+        self.fake.table(self.base_id, 'Tasks')
+        task_manager = TaskManager(AirtableManager())
+        futures = [task_manager.create_task(f"Task {i}", '', defer=True) for i in range(15)]
+        task_manager.flush()
+        self.assertTrue(all(future.result()['id'].startswith('rec') for future in futures))
+        self.assertEqual(len(self.requests_to('POST')), 2)
+
+    def test_server_side_repository_search(self):
+        self.fake.seed(self.base_id, 'GitHub Repositories', sample_repositories(20))
+        airtable_manager = AirtableManager()
+        airtable_manager.local_search = False
+        results = airtable_manager.search_repositories('Mobile Client')
+        self.assertEqual(len(results), 4)
+        self.assertTrue(airtable_manager.is_healthy())
+
+
+    def test_local_search_failures_fall_back_to_the_server(self):
+        self.fake.seed(self.base_id, 'GitHub Repositories', sample_repositories(20))
+        airtable_manager = AirtableManager()
+        with patch.object(airtable_manager.store, 'search', side_effect=RuntimeError('index corrupt')), \
+                self.assertLogs('src.managers.airtable_manager', 'WARNING') as logs:
+            results = airtable_manager.search_repositories('Mobile Client')
+        self.assertEqual(len(results), 4)
+        self.assertIn('index corrupt', logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+import os
+import sys
+import threading
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers import github_activity
+from src.managers.github_activity import ActivityStream, shutdown_pools
+from src.managers.github_client import GitHubClient
+
+
+def make_commit(sha, date):
+    return {'sha': f'{sha:040d}', 'commit': {'message': f'Commit {sha}', 'author': {'name': 'octo', 'date': date}}}
+
+
+class FakeGitHubClient:
+    """Serves numbered pages per path, with Link headers, through GitHubClient's pagination"""
+    base_url = 'https://api.github.test'
+    url = GitHubClient.url
+    iter_pages = GitHubClient.iter_pages
+    iter_items = GitHubClient.iter_items
+
+    def __init__(self, pages, errors=None):
+        self.pages = pages
+        self.errors = errors or {}
+        self.fetched = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def get_page(self, url):
+        path, _, query = url[len(self.base_url):].partition('?')
+        page = int(dict(part.split('=') for part in query.split('&')).get('page', 1))
+        with self._lock:
+            self.fetched.append((path, page))
+            self.threads.add(threading.current_thread().name)
+        if path in self.errors:
+            raise self.errors[path]
+        pages = self.pages[path]
+        links = {}
+        if page < len(pages):
+            links['next'] = f"{self.base_url}{path}?{query}&page={page + 1}"
+            links['last'] = f"{self.base_url}{path}?{query}&page={len(pages)}"
+        return pages[page - 1], links
+
+
+def make_item(number, updated_at, is_pr=False):
+    item = {'number': number, 'title': f'Item {number}', 'state': 'open',
+            'created_at': '2024-01-01T00:00:00Z', 'updated_at': updated_at}
+    if is_pr:
+        item['pull_request'] = {'url': f'https://api.github.com/pulls/{number}'}
+    return item
+
+
+class TestActivityStream(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.consumed = []
+        self.stream = ActivityStream(
+            self.client, 'octo/repo', datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+        )
+
+    def serve(self, items):
+        def iter_items(path, params, prefetch=None):
+            for item in items:
+                self.consumed.append(item['number'])
+                yield item
+        self.client.iter_items.side_effect = iter_items
+
+    def test_pulls_stop_at_first_stale_entry(self):
+        self.serve([make_item(3, '2024-05-02T00:00:00Z'), make_item(2, '2024-05-01T13:00:00Z'),
+                    make_item(1, '2024-04-01T00:00:00Z'), make_item(0, '2023-01-01T00:00:00Z')])
+
+        pulls = list(self.stream.pull_requests())
+
+        self.assertEqual([pr['number'] for pr in pulls], [3, 2])
+        self.assertEqual(self.consumed, [3, 2, 1])
+        self.assertEqual(pulls[0]['updated_at'], '2024-05-02T00:00:00+00:00')
+
+    def test_issues_use_since_and_skip_pull_requests(self):
+        self.serve([make_item(5, '2024-05-02T00:00:00Z', is_pr=True), make_item(4, '2024-05-01T18:00:00Z'),
+                    make_item(3, '2024-05-01T06:00:00Z')])
+
+        issues = list(self.stream.issues())
+
+        self.assertEqual([issue['number'] for issue in issues], [4])
+        params = self.client.iter_items.call_args.args[1]
+        self.assertEqual(params['since'], '2024-05-01T00:00:00Z')
+
+
+class TestConcurrentCollect(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(shutdown_pools)
+        self.since = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+        self.pages = {
+            '/repos/octo/repo/commits': [[make_commit(i, f'2024-05-0{9 - i // 2}T00:00:00Z') for i in range(p, p + 2)]
+                                         for p in (0, 2, 4)],
+            '/repos/octo/repo/pulls': [[make_item(9, '2024-05-03T00:00:00Z'), make_item(8, '2024-05-02T00:00:00Z')],
+                                       [make_item(7, '2024-04-01T00:00:00Z'), make_item(6, '2024-03-01T00:00:00Z')],
+                                       [make_item(5, '2024-02-01T00:00:00Z')]],
+            '/repos/octo/repo/issues': [[make_item(19, '2024-05-04T00:00:00Z'),
+                                         make_item(18, '2024-05-03T00:00:00Z', is_pr=True)],
+                                        [make_item(17, '2024-05-02T00:00:00Z')]]
+        }
+
+    def test_streams_are_fetched_in_parallel_and_in_order(self):
+        client = FakeGitHubClient(self.pages)
+        activity = ActivityStream(client, 'octo/repo', self.since, concurrent=True).collect()
+
+        self.assertEqual([c['message'] for c in activity['commits']], [f'Commit {i}' for i in range(6)])
+        self.assertEqual([pr['number'] for pr in activity['pull_requests']], [9, 8])
+        self.assertEqual([issue['number'] for issue in activity['issues']], [19, 17])
+        # Pull requests are paged sequentially and stop at the first stale entry
+        self.assertNotIn(('/repos/octo/repo/pulls', 3), client.fetched)
+        self.assertTrue(any(name.startswith('github-stream') for name in client.threads))
+        self.assertTrue(any(name.startswith('github-page') for name in client.threads))
+
+    def test_stream_errors_propagate(self):
+        client = FakeGitHubClient(self.pages, errors={'/repos/octo/repo/issues': ConnectionError('GitHub down')})
+        with self.assertRaises(ConnectionError):
+            ActivityStream(client, 'octo/repo', self.since, concurrent=True).collect()
+
+    def test_pools_are_created_lazily_and_shut_down(self):
+        shutdown_pools()
+        ActivityStream(MagicMock(), 'octo/repo', self.since)
+        self.assertIsNone(github_activity._pools)
+
+        stream = ActivityStream(FakeGitHubClient(self.pages), 'octo/repo', self.since, concurrent=True)
+        stream_pool, page_pool = stream.pools
+        shutdown_pools()
+        self.assertIsNone(github_activity._pools)
+        with self.assertRaises(RuntimeError):
+            stream_pool.submit(print)
+        self.assertIsNot(ActivityStream(MagicMock(), 'octo/repo', self.since, concurrent=True).pools[1], page_pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
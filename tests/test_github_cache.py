@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers.github_client import GitHubClient, HTTPCache, _page_urls, _retry_delay, cache_path
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    max_age = 0
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+        page = 2 if 'page=2' in self.path else 1
+        etag = f'"repos-page-{page}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('Cache-Control', f'private, max-age={self.max_age}')
+            self.end_headers()
+            return
+
+        body = json.dumps([{'name': f'repo-{page}'}]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', f'private, max-age={self.max_age}')
+        if page == 1:
+            host = f'http://{self.server.server_address[0]}:{self.server.server_address[1]}'
+            self.send_header('Link', f'<{host}/user/repos?page=2>; rel="next", '
+                                     f'<{host}/user/repos?page=2>; rel="last"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestGitHubClientCache(unittest.TestCase):
+    def setUp(self):
+        FakeGitHubHandler.max_age = 0
+        FakeGitHubHandler.requests_seen = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHubHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.cache = HTTPCache(':memory:')
+        self.client = GitHubClient('token-a', cache=self.cache, base_url=f'http://{host}:{port}')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_revalidates_with_etag_and_serves_304_from_cache(self):
+        first = list(self.client.iter_items('/user/repos'))
+        second = list(self.client.iter_items('/user/repos'))
+
+        self.assertEqual(first, second)
+        self.assertEqual([r['name'] for r in second], ['repo-1', 'repo-2'])
+        self.assertEqual(self.client.stats, {'hits': 0, 'misses': 2, 'not_modified': 2})
+        self.assertEqual(FakeGitHubHandler.requests_seen[2][1], '"repos-page-1"')
+
+    def test_fresh_entries_skip_the_network(self):
+        FakeGitHubHandler.max_age = 60
+        list(self.client.iter_items('/user/repos'))
+        list(self.client.iter_items('/user/repos'))
+
+        self.assertEqual(self.client.stats['hits'], 2)
+        self.assertEqual(len(FakeGitHubHandler.requests_seen), 2)
+
+    def test_entries_are_scoped_per_token(self):
+        list(self.client.iter_items('/user/repos'))
+        other = GitHubClient('token-b', cache=self.cache, base_url=self.client.base_url)
+        list(other.iter_items('/user/repos'))
+
+        self.assertEqual(other.stats['misses'], 2)
+        self.assertIsNone(FakeGitHubHandler.requests_seen[-1][1])
+
+    def test_prefetch_fetches_remaining_pages(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            repos = list(self.client.iter_items('/user/repos', prefetch=pool))
+
+        self.assertEqual([r['name'] for r in repos], ['repo-1', 'repo-2'])
+
+
+class TestHTTPCacheEviction(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'github_cache.sqlite')
+
+    def put(self, cache, key):
+        cache.put(key, f'"{key}"', None, None, [key], 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = HTTPCache(self.path, max_entries=3)
+        for key in ('a', 'b', 'c'):
+            self.put(cache, key)
+            time.sleep(0.001)
+        cache.get('a')
+        self.put(cache, 'd')
+
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a')['body'], ['a'])
+
+    def test_unused_entries_expire(self):
+        cache = HTTPCache(self.path, ttl=60)
+        self.put(cache, 'old')
+        with patch('src.managers.github_client.time.time', return_value=time.time() + 120):
+            self.put(cache, 'new')
+        self.assertIsNone(cache.get('old'))
+        self.assertEqual(len(cache), 1)
+
+    def test_caches_from_before_eviction_are_upgraded(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE responses (key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,'
+                     ' link TEXT, body TEXT, expires REAL)')
+        conn.execute("INSERT INTO responses VALUES ('a', NULL, NULL, NULL, '[1]', 0)")
+        conn.commit()
+        conn.close()
+
+        cache = HTTPCache(self.path)
+        self.assertEqual(cache.get('a')['body'], [1])
+        self.put(cache, 'b')
+        self.assertEqual(len(cache), 2)
+
+    def test_relative_paths_live_in_the_cache_directory(self):
+        with patch.dict(os.environ, {'GITHUB_CACHE_DIR': os.path.join(self.tmp.name, 'cache')}):
+            self.assertEqual(cache_path('github.sqlite'), os.path.join(self.tmp.name, 'cache', 'github.sqlite'))
+            self.assertTrue(os.path.isdir(os.path.join(self.tmp.name, 'cache')))
+        self.assertEqual(cache_path(':memory:'), ':memory:')
+        self.assertEqual(cache_path(self.path), self.path)
+
+
+class TestGitHubClientHelpers(unittest.TestCase):
+    def test_page_urls_from_last_link(self):
+        urls = _page_urls('https://api.github.com/repos/o/r/commits?per_page=100&page=3')
+        self.assertEqual(urls, [
+            'https://api.github.com/repos/o/r/commits?page=2&per_page=100',
+            'https://api.github.com/repos/o/r/commits?page=3&per_page=100',
+        ])
+
+    def test_retry_delay_honours_secondary_limits(self):
+        response = MagicMock(status_code=403, headers={'Retry-After': '7'}, text='')
+        self.assertEqual(_retry_delay(response), 7.0)
+        response = MagicMock(status_code=403, headers={}, text='You have exceeded a secondary rate limit')
+        self.assertEqual(_retry_delay(response), 60.0)
+        response = MagicMock(status_code=404, headers={}, text='')
+        self.assertIsNone(_retry_delay(response))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'github_graphql')
+
+
+class RecordedGraphQLHandler(BaseHTTPRequestHandler):
+    """Replays recorded GraphQL responses in order and keeps the requests"""
+    responses = []
+    requests_seen = []
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.requests_seen.append(json.loads(self.rfile.read(length)))
+        body = json.dumps(self.responses.pop(0)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def load_fixture(name):
+    recent = (datetime.now(timezone.utc) - timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.loads(f.read().replace('{{recent}}', recent))
+
+
+class TestGitHubGraphQLManager(unittest.TestCase):
+    def setUp(self):
+        os.environ['GITHUB_HTTP_CACHE'] = ':memory:'
+        from src.managers.github_graphql import GitHubGraphQLManager
+
+        RecordedGraphQLHandler.requests_seen = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RecordedGraphQLHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.manager = GitHubGraphQLManager('token', base_url=f'http://{host}:{port}')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        os.environ.pop('GITHUB_HTTP_CACHE', None)
+
+    def test_get_repositories_matches_rest_shape(self):
+        RecordedGraphQLHandler.responses = load_fixture('repositories.json')
+
+        repos = self.manager.get_repositories()
+
+        self.assertEqual(repos[0], {
+            'name': 'GitAccountable',
+            'full_name': 'octocat/GitAccountable',
+            'description': 'AI accountability bot',
+            'url': 'https://github.com/octocat/GitAccountable',
+            'language': 'Python',
+            'stars': 42,
+            'forks': 7
+        })
+        self.assertIsNone(repos[1]['language'])
+        self.assertEqual(RecordedGraphQLHandler.requests_seen[1]['variables']['after'],
+                         'Y3Vyc29yOnYyOpHOAAAAAQ==')
+
+    def test_get_repo_activity_pages_only_open_connections(self):
+        RecordedGraphQLHandler.responses = load_fixture('activity.json')
+
+        activity = self.manager.get_repo_activity('octocat/GitAccountable', days=7)
+
+        self.assertEqual(set(activity), {'commits', 'pull_requests', 'issues'})
+        self.assertEqual(activity['commits'][0]['sha'], '5f3c2a1')
+        self.assertEqual([pr['number'] for pr in activity['pull_requests']], [12, 11])
+        self.assertEqual(activity['pull_requests'][0]['state'], 'closed')
+        self.assertEqual(activity['issues'][0]['state'], 'open')
+        self.assertTrue(activity['issues'][0]['updated_at'].endswith('+00:00'))
+
+        # One round trip for all three streams, then only the PR stream is paged;
+        # it stops at the stale PR without a third request
+        self.assertEqual(len(RecordedGraphQLHandler.requests_seen), 2)
+        follow_up = RecordedGraphQLHandler.requests_seen[1]
+        self.assertIn('pullRequests', follow_up['query'])
+        self.assertNotIn('issues', follow_up['query'])
+        self.assertEqual(follow_up['variables']['c0_pull_requests'], 'Y3Vyc29yOnByMQ==')
+
+    def test_page_size_shrinks_with_connections(self):
+        self.assertEqual(self.manager._page_size(3), 100)
+        self.assertEqual(self.manager._page_size(30), 33)
+        self.manager.rate_limit_remaining = 100
+        self.assertEqual(self.manager._page_size(30), 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.web.github_pool import GitHubManagerPool, token_key
+
+
+class TestGitHubManagerPool(unittest.TestCase):
+    def setUp(self):
+        self.built = []
+
+        def factory(token):
+            manager = MagicMock(token=token)
+            self.built.append(manager)
+            return manager
+
+        self.pool = GitHubManagerPool(factory=factory, max_size=2, idle_timeout=60)
+
+    def test_reuses_manager_per_token(self):
+        first = self.pool.get('token-a')
+        self.assertIs(self.pool.get('token-a'), first)
+        self.assertIsNot(self.pool.get('token-b'), first)
+        self.assertEqual(len(self.built), 2)
+
+    def test_keys_are_token_hashes(self):
+        self.pool.get('token-a')
+        self.assertEqual(list(self.pool._managers), [token_key('token-a')])
+        self.assertNotIn('token-a', token_key('token-a'))
+
+    def test_evicts_least_recently_used(self):
+        a = self.pool.get('token-a')
+        self.pool.get('token-b')
+        self.pool.get('token-a')
+        self.pool.get('token-c')
+
+        self.assertEqual(len(self.pool), 2)
+        self.assertIs(self.pool.get('token-a'), a)
+        self.built[1].close.assert_called_once()
+
+    def test_evicts_idle_managers(self):
+        with patch('src.web.github_pool.time.monotonic', return_value=1000.0):
+            a = self.pool.get('token-a')
+        with patch('src.web.github_pool.time.monotonic', return_value=1100.0):
+            self.assertEqual(self.pool.evict_idle(), 1)
+        a.close.assert_called_once()
+        self.assertEqual(len(self.pool), 0)
+
+    def test_discard_closes_manager(self):
+        a = self.pool.get('token-a')
+        self.pool.discard('token-a')
+        a.close.assert_called_once()
+        self.assertIsNot(self.pool.get('token-a'), a)
+
+    def test_concurrent_first_use_builds_once(self):
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(self.pool.get('token-a'))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.built), 1)
+        self.assertTrue(all(result is self.built[0] for result in results))
+
+
+class TestBotWithGitHub(unittest.TestCase):
+    def test_view_does_not_mutate_shared_bot(self):
+        bot = AIAccountabilityBot(task_manager=MagicMock())
+        manager = MagicMock()
+        manager.get_repositories.return_value = [{'name': 'hello', 'description': None,
+                                                  'language': 'Python', 'stars': 1, 'forks': 0}]
+
+        view = bot.with_github(manager)
+
+        self.assertIsNone(bot.github_manager)
+        self.assertIs(view.task_manager, bot.task_manager)
+        self.assertIn('hello', view.process_command('list repos'))
+        self.assertIn('connect', bot.process_command('list repos').lower())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers.rate_limiter import Priority, current_priority
+from src.web.health import HealthMonitor, Probe, airtable_probe, github_probe
+
+
+class TestHealthMonitor(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = {'airtable': 0, 'hung': 0}
+
+    def tearDown(self):
+        self.release.set()
+
+    def airtable(self):
+        self.calls['airtable'] += 1
+        return True
+
+    def hung(self):
+        self.calls['hung'] += 1
+        self.release.wait(5)
+        return True
+
+    def monitor(self, *probes, **kwargs):
+        monitor = HealthMonitor(list(probes), interval=kwargs.pop('interval', 60), timeout=kwargs.pop('timeout', 0.2))
+        self.addCleanup(monitor.stop)
+        return monitor
+
+    def test_not_ready_before_the_first_round(self):
+        monitor = self.monitor(Probe('airtable', self.airtable))
+        self.assertEqual(monitor.report()['status'], 'starting')
+        self.assertFalse(monitor.is_ready())
+        self.assertEqual(monitor.liveness()['status'], 'alive')
+
+    def test_reports_are_served_from_memory(self):
+        monitor = self.monitor(Probe('airtable', self.airtable), Probe('chat', lambda: False))
+        monitor.run_probes()
+        for _ in range(1000):
+            report = monitor.report()
+        self.assertEqual(self.calls['airtable'], 1)
+        self.assertEqual(report['status'], 'unhealthy')
+        self.assertEqual(report['services'], {'airtable': True, 'chat': False})
+        self.assertEqual(report['probes']['chat']['error'], 'Check failed')
+        self.assertEqual(report['probes']['airtable']['latency']['count'], 1)
+
+    def test_non_critical_failures_keep_the_instance_ready(self):
+        def github():
+            raise ConnectionError('unreachable')
+
+        monitor = self.monitor(Probe('airtable', self.airtable), Probe('github', github, critical=False))
+        report = monitor.run_probes()
+        self.assertTrue(monitor.is_ready())
+        self.assertEqual(report['probes']['github']['error'], 'unreachable')
+
+    def test_hung_probes_time_out_without_piling_up(self):
+        monitor = self.monitor(Probe('airtable', self.airtable), Probe('hung', self.hung))
+        for _ in range(3):
+            start = time.monotonic()
+            report = monitor.run_probes()
+            self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(report['probes']['hung']['error'], 'Timed out after 0.2s')
+        self.assertEqual((self.calls['airtable'], self.calls['hung']), (3, 1))
+        self.assertFalse(monitor.is_ready())
+
+    def test_stale_results_are_not_ready(self):
+        monitor = self.monitor(Probe('airtable', self.airtable))
+        monitor.run_probes()
+        self.assertTrue(monitor.is_ready())
+        with patch('src.web.health.time.time', return_value=time.time() + monitor.max_age + 1):
+            self.assertFalse(monitor.is_ready())
+
+    def test_background_thread_probes_on_an_interval(self):
+        monitor = self.monitor(Probe('airtable', self.airtable), interval=0.05)
+        monitor.start()
+        monitor.start()
+        deadline = time.monotonic() + 5
+        while self.calls['airtable'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreaterEqual(self.calls['airtable'], 3)
+
+    def test_airtable_probe_uses_the_manager(self):
+        manager = MagicMock()
+        manager.is_healthy.side_effect = lambda: current_priority() is Priority.INTERACTIVE
+        self.assertTrue(airtable_probe(manager).check())
+
+    def test_github_probe_uses_the_configured_api(self):
+        with patch.dict(os.environ, {'GITHUB_API_URL': 'https://ghe.example.com/api/v3/'}), \
+                patch('src.web.health.requests.get') as get:
+            get.return_value.status_code = 200
+            self.assertTrue(github_probe(timeout=1).check())
+        get.assert_called_once_with('https://ghe.example.com/api/v3/rate_limit', timeout=1)
+
+
+class TestHealthRoutes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        env = {name: 'test' for name in ('GITHUB_CLIENT_ID', 'GITHUB_CLIENT_SECRET', 'GITHUB_REDIRECT_URI',
+                                          'FLASK_SECRET_KEY', 'OPENAI_API_KEY', 'AIRTABLE_API_KEY',
+                                          'AIRTABLE_BASE_ID')}
+        env['OPENAI_RESPONSE_CACHE'] = ':memory:'
+        with patch.dict(os.environ, env):
+            from src.web import app as app_module
+        cls.app_module = app_module
+
+    def setUp(self):
+        self.airtable = MagicMock(return_value=True)
+        self.monitor = HealthMonitor([Probe('airtable', self.airtable)], interval=60, timeout=1)
+        self.addCleanup(self.monitor.stop)
+        patcher = patch.object(self.app_module, 'health_monitor', self.monitor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = self.app_module.app.test_client()
+
+    def test_liveness_never_probes(self):
+        response = self.client.get('/health/live')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'alive')
+        self.airtable.assert_not_called()
+
+    def test_readiness(self):
+        self.monitor.run_probes()
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['services'], {'airtable': True})
+
+        self.airtable.return_value = False
+        self.monitor.run_probes()
+        self.assertEqual(self.client.get('/health/ready').status_code, 503)
+        self.assertEqual(self.client.get('/health').get_json()['status'], 'unhealthy')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.core.chat import ChatService
+from src.core.response_cache import ResponseCache
+from src.utils.intent_classifier import IntentClassifier, command_file_examples
+from tests.fake_openai import FakeOpenAI
+
+
+class TestIntentClassifier(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = IntentClassifier()
+
+    def assertIntent(self, command, intent, **slots):
+        match = self.classifier.classify(command)
+        self.assertIsNotNone(match, command)
+        self.assertEqual((match.intent, match.slots), (intent, slots), command)
+
+    def test_typos(self):
+        self.assertIntent('shwo my tasks', 'list_tasks')
+        self.assertIntent('ad task buy milk by friday', 'add_task', title='buy milk', due_date='friday')
+        self.assertIntent('list my repositores', 'list_repos')
+        self.assertIntent('show activty for octocat/hello in last 3 days', 'repo_activity',
+                          repo='octocat/hello', days='3')
+
+    def test_paraphrases(self):
+        self.assertIntent("remove the task 'Review pull requests'", 'delete_task', title='Review pull requests')
+        self.assertIntent('set the task groceries to complete', 'update_task', title='groceries', status='Done')
+        self.assertIntent('finish the groceries task', 'update_task', title='groceries', status='Done')
+        self.assertIntent("what's due this week", 'due_tasks', days='7')
+        self.assertIntent('open an issue in octocat/hello: login broken', 'create_issue',
+                          repo='octocat/hello', text='login broken')
+
+    def test_cli_forms(self):
+        self.assertIntent('task add Build Auth', 'add_task', title='Build Auth')
+        self.assertIntent('task list Todo', 'list_tasks', status='Todo')
+        self.assertIntent('repo serach Test-Repository', 'search_repos', term='Test-Repository')
+
+    def test_open_questions_fall_through(self):
+        for text in ('what is the weather today', 'tell me a joke', 'I need to buy milk',
+                     'can you help me with my code', 'delete task'):
+            self.assertIsNone(self.classifier.classify(text), text)
+
+    def test_questions_never_reach_data_changing_intents(self):
+        for text in ('explain how to create issue in owner/repo: stuff', 'should I delete task foo or keep it?',
+                     'why did my task get deleted', 'what does mark task as done mean?',
+                     'delete task foo?', 'how do I add task reminders'):
+            self.assertIsNone(self.classifier.classify(text), text)
+        self.assertIntent('please remove the task groceries', 'delete_task', title='groceries')
+
+    def test_slot_words_are_not_corrected(self):
+        self.assertIntent('remind me to call mom', 'add_task', title='call mom')
+        self.assertEqual(self.classifier.correct('call'), 'call')
+        self.assertEqual(self.classifier.correct('delte'), 'delete')
+        self.assertEqual(self.classifier.correct('shwo'), 'show')
+        self.assertEqual(self.classifier.correct('shop'), 'show')
+        classifier = IntentClassifier(examples=[('add task shop for groceries', 'add_task')])
+        self.assertEqual(classifier.correct('shop'), 'shop')
+
+    def test_limited_intents(self):
+        classifier = IntentClassifier(intents={'list_tasks'})
+        self.assertIsNone(classifier.classify('list my repos'))
+
+    def test_command_file_examples(self):
+        examples = command_file_examples(lambda line: 'list_tasks' if 'tasks' in line else None)
+        self.assertIn(('show my tasks', 'list_tasks'), examples)
+
+    def test_classifies_in_well_under_a_millisecond(self):
+        start = time.perf_counter()
+        for _ in range(200):
+            self.classifier.classify('mark task Review PRs done')
+        self.assertLess((time.perf_counter() - start) / 200, 0.001)
+
+
+class TestIntentRouting(unittest.TestCase):
+    def setUp(self):
+        self.task_manager = MagicMock()
+        self.task_manager.find_task_by_title.return_value = {'id': 'rec1', 'fields': {'Title': 'groceries'}}
+        self.task_manager.update_task_status.return_value = {'id': 'rec1', 'fields': {'Title': 'groceries'}}
+        self.openai = FakeOpenAI(default='LLM answer')
+        self.chat = ChatService('sk-test', airtable_manager=MagicMock(), task_manager=self.task_manager,
+                                response_cache=ResponseCache(':memory:'), client=self.openai)
+        self.bot = AIAccountabilityBot(self.task_manager, self.chat)
+
+    def test_bot_routes_near_misses_locally(self):
+        response = self.bot.process_command('finish the groceries task')
+
+        self.assertIn("Updated task 'groceries' to Done", response)
+        self.task_manager.update_task_status.assert_called_once_with('rec1', 'Done')
+        self.assertEqual(self.openai.calls, [])
+
+    def test_bot_views_dispatch_to_their_own_github_manager(self):
+        github = MagicMock()
+        github.get_repositories.return_value = []
+        self.assertEqual(self.bot.with_github(github).process_command('shwo my repos'), 'No repositories found')
+
+    def test_bot_streams_free_form_input_from_the_llm(self):
+        self.assertIn("not sure how to handle", self.bot.process_command('how do I stay focused'))
+        self.assertEqual(self.openai.calls, [])
+        self.assertEqual(''.join(self.bot.stream_command('how do I stay focused')), 'LLM answer')
+
+    def test_bot_sends_questions_about_changes_to_the_llm(self):
+        for text in ('explain how to create issue in owner/repo: stuff', 'should I delete task foo or keep it?',
+                     'why did my task get deleted', 'what does mark task as done mean?'):
+            self.assertIsNone(self.bot._route(text), text)
+        self.assertEqual(''.join(self.bot.stream_command('why did my task get deleted')), 'LLM answer')
+        self.task_manager.delete_task.assert_not_called()
+        self.task_manager.update_task_status.assert_not_called()
+
+    def test_chat_routes_near_misses_locally(self):
+        response = self.chat.handle_natural_task_command('mark task groceries done')
+
+        self.assertEqual(response, "Updated task 'groceries' status to Done")
+        self.assertEqual(self.openai.calls, [])
+
+    def test_chat_repository_command_typos(self):
+        self.chat.airtable.search_repositories.return_value = [{'fields': {'Repository Name': 'test-repo'}}]
+        self.assertEqual(self.chat.handle_repository_command('serach', 'test'), '- test-repo')
+        self.chat.airtable.search_repositories.assert_called_once_with('test')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import glob
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+import unittest
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.logging_config import (DroppingQueueHandler, JSONFormatter, configure_logging, dropped_records,
+                                      shutdown_logging)
+from src.utils.tracing import Tracer, set_tracer, start_trace
+
+
+class NullExporter:
+    def export(self, spans):
+        pass
+
+
+class TestLoggingConfig(unittest.TestCase):
+    def setUp(self):
+        # Importing the web app configures logging for the whole process
+        shutdown_logging()
+        self.addCleanup(shutdown_logging)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'bot.log')
+        self.logger = logging.getLogger('tests.logging_config')
+
+    def read_json(self):
+        shutdown_logging()
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_json_records_carry_extras_and_exceptions(self):
+        configure_logging(log_file=self.path, fmt='json', console=False)
+        self.logger.info("Synced %d tasks", 3, extra={'base_id': 'app123'})
+        try:
+            raise ValueError('bad row')
+        except ValueError:
+            self.logger.exception("Sync failed")
+
+        info, error = self.read_json()
+        self.assertEqual((info['level'], info['message'], info['base_id']), ('INFO', 'Synced 3 tasks', 'app123'))
+        self.assertEqual(info['logger'], 'tests.logging_config')
+        self.assertEqual(error['level'], 'ERROR')
+        self.assertIn('ValueError: bad row', error['exception'])
+
+    def test_records_inside_a_trace_name_it(self):
+        set_tracer(Tracer(NullExporter(), sample_rate=1.0))
+        self.addCleanup(set_tracer, None)
+        configure_logging(log_file=self.path, fmt='json', console=False)
+        with start_trace('POST /command') as root:
+            self.logger.info("Handling command")
+        self.logger.info("Idle")
+
+        traced, untraced = self.read_json()
+        self.assertEqual((traced['trace_id'], traced['span_id']), (root.trace.trace_id, root.span_id))
+        self.assertNotIn('trace_id', untraced)
+
+    def test_files_are_rotated_by_size(self):
+        configure_logging(log_file=self.path, max_bytes=1024, backup_count=2, console=False)
+        for i in range(200):
+            self.logger.info(f"Reminder {i} delivered")
+        shutdown_logging()
+
+        self.assertEqual(len(glob.glob(self.path + '*')), 3)
+        self.assertLessEqual(os.path.getsize(self.path), 1024)
+
+    def test_configure_is_idempotent(self):
+        configure_logging(log_file=self.path, console=False)
+        configure_logging(log_file=self.path, console=False)
+        self.logger.info("Once")
+        shutdown_logging()
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(dropped_records(), 0)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            configure_logging(log_file=self.path, fmt='xml', console=False)
+
+
+class TestDroppingQueueHandler(unittest.TestCase):
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+        logger = logging.getLogger('tests.dropping')
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        self.addCleanup(setattr, logger, 'propagate', True)
+
+        start = time.monotonic()
+        for i in range(100):
+            logger.warning("Queue full %d", i)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(handler.dropped, 98)
+        self.assertEqual(handler.queue.get_nowait().msg, 'Queue full 0')
+
+    def test_records_are_frozen_on_the_calling_thread(self):
+        handler = DroppingQueueHandler(queue.Queue())
+        values = ['before']
+        record = logging.LogRecord('x', logging.INFO, __file__, 1, 'Value %s', (values,), None)
+        handler.handle(record)
+        values[0] = 'after'
+        queued = handler.queue.get_nowait()
+        self.assertEqual(json.loads(JSONFormatter().format(queued))['message'], "Value ['before']")
+
+
+if __name__ == '__main__':
+    unittest.main()
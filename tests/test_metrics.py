@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.utils.metrics import (CALLS, ERRORS, IN_FLIGHT, LATENCY, Counter, Histogram, LatencyHistogram, Registry,
+                               instrumented, track)
+
+
+class TestMetricTypes(unittest.TestCase):
+    def test_cumulative_buckets(self):
+        histogram = LatencyHistogram(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(seconds)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['buckets'], {'0.1': 2, '1.0': 3, '+Inf': 4})
+        self.assertEqual((snapshot['count'], snapshot['sum']), (4, 3.65))
+
+    def test_exposition_format(self):
+        registry = Registry()
+        requests = Counter('requests_total', 'Requests "served"', ('path',), registry=registry)
+        latency = Histogram('latency_seconds', 'Latency', registry=registry, buckets=(0.5,))
+        requests.labels('/a\nb').inc(2)
+        latency.observe(0.25)
+
+        self.assertEqual(registry.exposition(),
+                         '# HELP requests_total Requests \\"served\\"\n'
+                         '# TYPE requests_total counter\n'
+                         'requests_total{path="/a\\nb"} 2.0\n'
+                         '# HELP latency_seconds Latency\n'
+                         '# TYPE latency_seconds histogram\n'
+                         'latency_seconds_bucket{le="0.5"} 1\n'
+                         'latency_seconds_bucket{le="+Inf"} 1\n'
+                         'latency_seconds_sum 0.25\n'
+                         'latency_seconds_count 1\n')
+        with self.assertRaises(ValueError):
+            Counter('requests_total', 'Again', registry=registry)
+        with self.assertRaises(ValueError):
+            requests.labels('/a', 'extra')
+
+
+class TestInstrumentation(unittest.TestCase):
+    def values(self, component, operation):
+        return (CALLS.labels(component, operation).value, ERRORS.labels(component, operation).value,
+                LATENCY.labels(component, operation).cumulative()[0][-1])
+
+    def test_calls_and_errors(self):
+        @instrumented('test')
+        def lookup(key):
+            if key is None:
+                raise KeyError('missing')
+            return key
+
+        self.assertEqual(lookup('a'), 'a')
+        with self.assertRaises(KeyError):
+            lookup(None)
+        self.assertEqual(self.values('test', 'lookup'), (2.0, 1.0, 2))
+        self.assertEqual(lookup.__name__, 'lookup')
+
+    def test_in_flight(self):
+        started, release = threading.Event(), threading.Event()
+
+        @instrumented('test', 'slow')
+        def slow():
+            started.set()
+            release.wait(5)
+
+        thread = threading.Thread(target=slow)
+        thread.start()
+        started.wait(5)
+        self.assertEqual(IN_FLIGHT.labels('test', 'slow').value, 1.0)
+        release.set()
+        thread.join()
+        self.assertEqual(IN_FLIGHT.labels('test', 'slow').value, 0.0)
+
+    def test_generators_are_timed_to_exhaustion(self):
+        @instrumented('test')
+        def tokens():
+            yield 'a'
+            yield 'b'
+
+        stream = tokens()
+        self.assertEqual(next(stream), 'a')
+        self.assertEqual(IN_FLIGHT.labels('test', 'tokens').value, 1.0)
+        self.assertEqual(list(stream), ['b'])
+        self.assertEqual(self.values('test', 'tokens'), (1.0, 0.0, 1))
+
+    def test_overhead_is_small(self):
+        @instrumented('test')
+        def noop():
+            return None
+
+        start = time.perf_counter()
+        for _ in range(20000):
+            noop()
+        self.assertLess((time.perf_counter() - start) / 20000, 50e-6)
+
+    def test_bot_commands_are_labelled(self):
+        task_manager = MagicMock()
+        task_manager.get_due_tasks.return_value = []
+        before = CALLS.labels('command', 'due_tasks').value
+        AIAccountabilityBot(task_manager).process_command('show due')
+        self.assertEqual(CALLS.labels('command', 'due_tasks').value, before + 1)
+
+        with self.assertRaises(RuntimeError):
+            with track('test', 'block'):
+                raise RuntimeError('boom')
+        self.assertEqual(ERRORS.labels('test', 'block').value, 1.0)
+
+
+class TestMetricsRoute(unittest.TestCase):
+    def test_serves_prometheus_text(self):
+        env = {name: 'test' for name in ('GITHUB_CLIENT_ID', 'GITHUB_CLIENT_SECRET', 'GITHUB_REDIRECT_URI',
+                                          'FLASK_SECRET_KEY', 'OPENAI_API_KEY', 'AIRTABLE_API_KEY',
+                                          'AIRTABLE_BASE_ID')}
+        env['OPENAI_RESPONSE_CACHE'] = ':memory:'
+        with patch.dict(os.environ, env):
+            from src.web import app as app_module
+
+        with track('test', 'route'):
+            pass
+        response = app_module.app.test_client().get('/metrics')
+        self.assertEqual(response.content_type, 'text/plain; version=0.0.4; charset=utf-8')
+        body = response.get_data(as_text=True)
+        self.assertIn('gitaccountable_calls_total{component="test",operation="route"} 1.0\n', body)
+        self.assertIn('# TYPE gitaccountable_health_probe_latency_seconds histogram\n', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers.rate_limiter import (
+    Priority, RateLimitScheduler, _base_id_from_url, get_scheduler, request_priority
+)
+
+
+class TestRateLimitScheduler(unittest.TestCase):
+    def test_burst_then_rate(self):
+        scheduler = RateLimitScheduler(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(4):
+            scheduler.acquire()
+        # Two tokens up front, two more at 50/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.03)
+
+    def test_waiters_are_served_by_priority(self):
+        scheduler = RateLimitScheduler(rate=20, burst=1)
+        scheduler.acquire()
+        granted = []
+
+        def worker(priority):
+            scheduler.acquire(priority)
+            granted.append(priority)
+
+        threads = []
+        for priority in (Priority.BULK, Priority.SCHEDULED, Priority.INTERACTIVE):
+            thread = threading.Thread(target=worker, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            time.sleep(0.005)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(granted, [Priority.INTERACTIVE, Priority.SCHEDULED, Priority.BULK])
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics['waits']['bulk']['granted'], 1)
+        self.assertGreater(metrics['waits']['bulk']['wait_max'], 0)
+
+    def test_request_priority_context(self):
+        scheduler = RateLimitScheduler(rate=100)
+        with request_priority(Priority.BULK):
+            scheduler.acquire()
+        self.assertEqual(scheduler.metrics()['waits']['bulk']['granted'], 1)
+
+    def test_penalize_blocks_callers(self):
+        scheduler = RateLimitScheduler(rate=100)
+        scheduler.penalize(0.05)
+        self.assertGreaterEqual(scheduler.acquire(), 0.04)
+        self.assertEqual(scheduler.metrics()['throttled'], 1)
+
+    def test_scheduler_is_shared_per_base(self):
+        self.assertIs(get_scheduler('appA'), get_scheduler('appA'))
+        self.assertIsNot(get_scheduler('appA'), get_scheduler('appB'))
+        self.assertEqual(_base_id_from_url('https://api.airtable.com/v0/appA/Tasks/rec1'), 'appA')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.reminder_engine import Account, ReminderEngine, ReminderLedger, create_sinks, shard_of
+from src.managers.task_cache import TaskCache
+
+HOUR = 3600.0
+START = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_task(record_id, due, owner=None):
+    fields = {'Title': f'Task {record_id}', 'Status': 'Todo', 'Priority': 'Medium', 'Due Date': due}
+    if owner:
+        fields['Owner'] = owner
+    return {'id': record_id, 'fields': fields}
+
+
+class CollectingSink:
+    name = 'collect'
+
+    def __init__(self):
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, reminder):
+        with self._lock:
+            self.sent.append(reminder)
+
+
+class FailingSink:
+    name = 'failing'
+
+    def send(self, reminder):
+        raise ConnectionError('sink down')
+
+
+class FlakySink(CollectingSink):
+    name = 'flaky'
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def send(self, reminder):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('sink down')
+        super().send(reminder)
+
+
+class TestReminderEngine(unittest.TestCase):
+    def setUp(self):
+        self.caches = {}
+        self.sink = CollectingSink()
+        self.now = START.timestamp()
+
+    def base_factory(self, base_id):
+        cache = self.caches.setdefault(base_id, TaskCache())
+        return cache, MagicMock(), None
+
+    def engine(self, accounts, sinks=None, ledger=None, **kwargs):
+        return ReminderEngine(accounts, sinks=sinks or [self.sink], ledger=ledger or ReminderLedger(':memory:'),
+                              base_factory=self.base_factory, shard=kwargs.pop('shard', (0, 1)),
+                              lead_times=[HOUR], clock=lambda: self.now, **kwargs)
+
+    def due_in(self, hours):
+        return (START + timedelta(hours=hours)).isoformat()
+
+    def test_routes_tasks_to_their_owners(self):
+        engine = self.engine([Account('alice', 'app1'), Account('bob', 'app1'), Account('carol', 'app2')])
+        self.caches['app1'].load([make_task('rec1', self.due_in(2), 'bob'), make_task('rec2', self.due_in(2))])
+        self.caches['app2'].load([make_task('rec3', self.due_in(2))])
+
+        self.assertEqual(engine.run_pending(self.now + HOUR), 2)
+        self.assertEqual(sorted((r.account.user_id, r.task['id']) for r in self.sink.sent),
+                         [('bob', 'rec1'), ('carol', 'rec3')])
+        self.assertEqual(self.sink.sent[0].message, f"🔔 Task {self.sink.sent[0].task['id']} is due in 1 hour")
+
+    def test_date_only_due_dates_use_the_owners_timezone(self):
+        engine = self.engine([Account('dana', 'app1', 'America/New_York')])
+        task = make_task('rec1', '2024-05-03')
+        due = engine.bases['app1'].due_instant(task)
+        self.assertEqual(due, datetime(2024, 5, 3, 9, 0, tzinfo=ZoneInfo('America/New_York')).timestamp())
+
+    def test_sent_reminders_survive_restarts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'reminders.sqlite')
+            first = self.engine([Account('alice', 'app1')], ledger=ReminderLedger(path))
+            self.caches['app1'].load([make_task('rec1', self.due_in(2))])
+            self.assertEqual(first.run_pending(self.now + HOUR), 1)
+            first.ledger.close()
+
+            # A restarted engine rebuilds its heap from the same tasks
+            self.caches.clear()
+            second = self.engine([Account('alice', 'app1')], ledger=ReminderLedger(path))
+            self.caches['app1'].load([make_task('rec1', self.due_in(2))])
+            second.run_pending(self.now + HOUR)
+            second.ledger.close()
+
+        self.assertEqual(len(self.sink.sent), 1)
+        self.assertEqual(second.metrics()['duplicates'], 1)
+
+    def test_failed_deliveries_are_not_recorded(self):
+        engine = self.engine([Account('alice', 'app1')], sinks=[FailingSink(), self.sink])
+        self.caches['app1'].load([make_task('rec1', self.due_in(2))])
+        engine.run_pending(self.now + HOUR)
+
+        reminder = self.sink.sent[0]
+        self.assertNotIn(f'{reminder.key}:failing', engine.ledger)
+        self.assertIn(f'{reminder.key}:collect', engine.ledger)
+        self.assertEqual((engine.metrics()['failed'], engine.metrics()['delivered']), (1, 1))
+
+    def test_failed_deliveries_are_retried(self):
+        flaky = FlakySink(failures=1)
+        engine = self.engine([Account('alice', 'app1')], sinks=[flaky, self.sink], retry_delay=60)
+        self.caches['app1'].load([make_task('rec1', self.due_in(2))])
+        engine.run_pending(self.now + HOUR)
+        self.assertEqual((len(flaky.sent), len(self.sink.sent)), (0, 1))
+
+        engine.run_pending(self.now + HOUR + 60)
+        self.assertEqual((len(flaky.sent), len(self.sink.sent)), (1, 1))
+        self.assertIn(f'{flaky.sent[0].key}:flaky', engine.ledger)
+        self.assertEqual(engine.metrics()['retried'], 1)
+
+        # Delivered everywhere, so nothing is tried again
+        engine.run_pending(self.now + 2 * HOUR)
+        self.assertEqual((len(flaky.sent), len(self.sink.sent)), (1, 1))
+
+    def test_process_shards_partition_accounts(self):
+        accounts = [Account(f'user{i}', 'app1') for i in range(100)]
+        shards = [self.engine(accounts, shard=(i, 3)).accounts for i in range(3)]
+        self.assertEqual(sorted(a.user_id for shard in shards for a in shard), sorted(a.user_id for a in accounts))
+        self.assertEqual(shard_of('user7', 3), shard_of('user7', 3))
+
+    def test_fan_out_throughput(self):
+        accounts = [Account(f'user{i}', f'app{i % 20}') for i in range(2000)]
+        engine = self.engine(accounts, shards=4)
+        self.assertEqual(len(self.caches), 20)
+        for base_id, cache in self.caches.items():
+            cache.load([make_task(f'{base_id}-rec{i}', self.due_in(2), account.user_id)
+                        for i, account in enumerate(engine.bases[base_id].accounts.values())])
+
+        engine.start()
+        try:
+            self.assertEqual(engine.run_pending(self.now + HOUR), 2000)
+        finally:
+            engine.stop()
+        metrics = engine.metrics()
+        self.assertEqual(metrics['delivered'], 2000)
+        self.assertEqual(metrics['queued'], 0)
+        self.assertGreater(metrics['reminders_per_second'], 200)
+
+    def test_unknown_sink(self):
+        self.assertEqual([sink.name for sink in create_sinks('log, webhook')], ['log', 'webhook'])
+        with self.assertRaises(ValueError):
+            create_sinks('pager')
+
+
+if __name__ == '__main__':
+    unittest.main()
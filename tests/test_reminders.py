@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+import os
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.core.reminders import ReminderScheduler, format_lead, parse_lead_times
+from src.managers.task_cache import TaskCache
+
+HOUR = 3600.0
+
+
+def make_task(record_id, title, due, status='Todo'):
+    return {'id': record_id, 'fields': {'Title': title, 'Status': status, 'Priority': 'High',
+                                        'Due Date': due.isoformat(timespec='seconds')}}
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestReminderScheduler(unittest.TestCase):
+    def setUp(self):
+        self.start = datetime(2024, 5, 1, 9, 0)
+        self.clock = FakeClock(self.start.timestamp())
+        self.cache = TaskCache()
+        self.sent = []
+        self.scheduler = ReminderScheduler(self.cache, lambda task, left: self.sent.append((task['id'], left)),
+                                           lead_times=[24 * HOUR, HOUR], clock=self.clock)
+
+    def at(self, hours):
+        return self.start + timedelta(hours=hours)
+
+    def advance(self, hours):
+        self.clock.now += hours * HOUR
+        return self.scheduler.run_pending()
+
+    def test_fires_at_each_lead_time(self):
+        self.cache.upsert(make_task('rec1', 'Ship', self.at(48)))
+        self.assertEqual(self.scheduler.next_reminder(), self.at(24).timestamp())
+
+        self.assertEqual(self.advance(23), 0)
+        self.assertEqual(self.advance(1), 1)
+        self.assertEqual(self.advance(23), 1)
+        self.assertEqual(self.sent, [('rec1', 24 * HOUR), ('rec1', HOUR)])
+        self.assertIsNone(self.scheduler.next_reminder())
+
+    def test_loaded_tasks_are_scheduled(self):
+        self.cache.load([make_task('rec1', 'Ship', self.at(30)), make_task('rec2', 'Docs', self.at(2))])
+        scheduler = ReminderScheduler(self.cache, MagicMock(), lead_times=[HOUR], clock=self.clock)
+        self.assertEqual(len(scheduler), 2)
+        self.assertEqual(scheduler.next_reminder(), self.at(1).timestamp())
+
+    def test_rescheduling_and_completion_update_the_heap(self):
+        self.cache.upsert(make_task('rec1', 'Ship', self.at(48)))
+        self.cache.upsert(make_task('rec1', 'Ship', self.at(72)))
+        self.assertEqual(self.scheduler.next_reminder(), self.at(48).timestamp())
+
+        self.cache.upsert(make_task('rec1', 'Ship', self.at(72), status='Done'))
+        self.assertIsNone(self.scheduler.next_reminder())
+        self.assertEqual(self.advance(100), 0)
+
+    def test_deleted_tasks_do_not_fire(self):
+        self.cache.upsert(make_task('rec1', 'Ship', self.at(48)))
+        self.cache.remove('rec1')
+        self.assertEqual(self.advance(48), 0)
+
+    def test_late_tasks_get_the_latest_missed_reminder_once(self):
+        self.cache.upsert(make_task('rec1', 'Ship', self.at(0.5)))
+        self.assertEqual(self.scheduler.run_pending(), 1)
+        self.assertEqual(self.sent, [('rec1', 0.5 * HOUR)])
+
+        # Unrelated edits do not repeat it
+        self.cache.upsert(make_task('rec1', 'Ship it', self.at(0.5)))
+        self.assertEqual(self.scheduler.run_pending(), 0)
+
+    def test_failed_reminders_are_retried_with_backoff(self):
+        notify = MagicMock(side_effect=[ConnectionError('down'), ConnectionError('down'), None])
+        scheduler = ReminderScheduler(self.cache, None, lead_times=[HOUR], retry_delay=60, clock=self.clock)
+        scheduler.notify = notify
+        self.cache.upsert(make_task('rec1', 'Ship', self.at(2)))
+
+        self.clock.now = self.at(1).timestamp()
+        self.assertEqual(scheduler.run_pending(), 0)
+        self.assertEqual(scheduler.next_reminder(), self.clock.now + 60)
+        self.assertEqual(scheduler.run_pending(self.clock.now + 60), 0)
+        self.assertEqual(scheduler.next_reminder(), self.clock.now + 60 + 120)
+        self.assertEqual(scheduler.run_pending(self.clock.now + 180), 1)
+        self.assertEqual((notify.call_count, scheduler.stats['retried']), (3, 2))
+
+    def test_retries_stop_after_max_attempts(self):
+        scheduler = ReminderScheduler(self.cache, MagicMock(side_effect=ConnectionError('down')),
+                                      lead_times=[HOUR], retry_delay=0, max_attempts=3, clock=self.clock)
+        self.cache.upsert(make_task('rec1', 'Ship', self.at(0.5)))
+        for _ in range(5):
+            scheduler.run_pending()
+        self.assertEqual(scheduler.notify.call_count, 3)
+        self.assertIsNone(scheduler.next_reminder())
+
+    def test_overdue_tasks_get_one_reminder(self):
+        self.cache.load([make_task('rec1', 'Ship', self.at(-1)), make_task('rec2', 'Docs', self.at(-2), 'Done')])
+        self.assertEqual(self.scheduler.run_pending(), 1)
+        self.assertEqual(self.sent, [('rec1', 0.0)])
+
+        self.cache.upsert(make_task('rec1', 'Ship it', self.at(-1)))
+        self.assertEqual(self.advance(1), 0)
+        # Moving the due date is a new reminder
+        self.cache.upsert(make_task('rec1', 'Ship it', self.at(-0.5)))
+        self.assertEqual(self.scheduler.run_pending(), 1)
+
+    def test_date_only_due_dates_use_the_due_time(self):
+        task = {'id': 'rec1', 'fields': {'Title': 'Ship', 'Due Date': '2024-05-03'}}
+        self.assertEqual(self.scheduler.due_instant(task), datetime(2024, 5, 3, 9, 0).timestamp())
+
+    def test_repeated_updates_keep_the_heap_compact(self):
+        for hour in range(2, 2000):
+            self.cache.upsert(make_task('rec1', 'Ship', self.at(hour)))
+        self.assertLess(len(self.scheduler._heap), 200)
+        self.assertEqual(len(self.scheduler), 2)
+
+    def test_thread_sleeps_until_woken_by_an_earlier_reminder(self):
+        clock = time.time
+        fired = threading.Event()
+        scheduler = ReminderScheduler(TaskCache(), lambda task, left: fired.set(), lead_times=[0], clock=clock)
+        scheduler.start()
+        try:
+            scheduler.cache.upsert(make_task('rec1', 'Ship', datetime.fromtimestamp(clock() + 1.5)))
+            self.assertTrue(fired.wait(5))
+        finally:
+            scheduler.stop()
+        self.assertFalse(scheduler.running)
+
+
+class TestLeadTimes(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_lead_times('1h, 1d,30m,0'), [86400, 3600, 1800, 0])
+        with self.assertRaises(ValueError):
+            parse_lead_times('soon')
+
+    def test_format(self):
+        self.assertEqual(format_lead(86400), 'in 1 day')
+        self.assertEqual(format_lead(2 * HOUR + 5), 'in 2 hours')
+        self.assertEqual(format_lead(0), 'now')
+
+
+class TestBotScheduler(unittest.TestCase):
+    def test_start_and_stop(self):
+        task_manager = MagicMock()
+        task_manager.cache = TaskCache()
+        task_manager.sync.interval = 30
+        bot = AIAccountabilityBot(task_manager)
+
+        bot.start_scheduler()
+        self.assertTrue(bot.running)
+        task_manager.sync.maybe_refresh.assert_called()
+        bot.stop_scheduler()
+        self.assertFalse(bot.running)
+        self.assertFalse(bot.reminders.running)
+
+
+if __name__ == '__main__':
+    unittest.main()
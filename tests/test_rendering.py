@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.utils.rendering import get_renderer, render, strip_trailing
+
+TASKS = [
+    {'id': 'rec1', 'fields': {'Title': 'Write report', 'Status': 'In Progress', 'Priority': 'High',
+                              'Due Date': '2024-05-01'}},
+    {'id': 'rec2', 'fields': {'Title': 'Review PR'}}
+]
+REPOS = [
+    {'name': 'hello', 'description': 'Greeter', 'language': 'Python', 'stars': 3, 'forks': 1},
+    {'name': 'notes', 'description': None, 'language': None, 'stars': 0, 'forks': 0}
+]
+
+
+def make_activity(count):
+    return {
+        'commits': [{'sha': f'{i:07x}', 'message': f'Change {i}', 'author': 'octocat',
+                     'date': '2024-05-01T10:00:00Z'} for i in range(count)],
+        'pull_requests': [{'number': i, 'title': f'PR {i}', 'state': 'open'} for i in range(count)],
+        'issues': [{'number': i, 'title': f'Issue {i}', 'state': 'closed'} for i in range(count)]
+    }
+
+
+class TestRenderers(unittest.TestCase):
+    def test_strip_trailing(self):
+        self.assertEqual(list(strip_trailing(['a\n\n', '  ', 'b\n', '\n'])), ['a', '\n\n  b'])
+        self.assertEqual(list(strip_trailing(['\n'])), [])
+
+    def test_text_matches_the_chat_replies(self):
+        text = get_renderer('text')
+        self.assertEqual(render(text.repositories(REPOS)),
+                         "Your GitHub repositories:\n\n"
+                         "📁 hello\n   Greeter\n   Language: Python\n   Stars: 3 | Forks: 1\n\n"
+                         "📁 notes\n   Language: N/A\n   Stars: 0 | Forks: 0")
+        self.assertEqual(render(text.due_tasks(TASKS[:1], 3)),
+                         "Tasks due in the next 3 days:\n\n"
+                         "📅 Write report\n   Due: 2024-05-01\n   Priority: High\n   Status: In Progress")
+        self.assertEqual(render(text.task_list(TASKS[1:], note='More below')),
+                         "📋 Review PR\n   Priority: 🟡 Medium\n   Due: No due date\n   Status: Todo\n\nMore below")
+        self.assertEqual(render(text.repo_activity('octocat/hello', 7, make_activity(1))),
+                         "Activity for octocat/hello in the last 7 days:\n\n"
+                         "🔨 Recent Commits:\n   [0000000] Change 0\n   by octocat on 2024-05-01\n\n"
+                         "🔄 Pull Requests:\n   #0 PR 0\n   Status: open\n\n"
+                         "❗ Issues:\n   #0 Issue 0\n   Status: closed")
+
+    def test_markdown(self):
+        markdown = render(get_renderer('markdown').task_list(TASKS, note='More below'))
+        self.assertTrue(markdown.startswith('- ⏳ **Write report** — 🔴 High · due 2024-05-01 · In Progress\n'))
+        self.assertTrue(markdown.endswith('\n\n_More below_'))
+
+    def test_json_documents(self):
+        renderer = get_renderer('JSON')
+        self.assertEqual(json.loads(render(renderer.task_list(TASKS))), {'tasks': TASKS})
+        self.assertEqual(json.loads(render(renderer.task_list([], note='none'))), {'tasks': [], 'note': 'none'})
+        self.assertEqual(json.loads(render(renderer.repositories(REPOS))), {'repos': REPOS})
+        activity = make_activity(2)
+        self.assertEqual(json.loads(render(renderer.repo_activity('octocat/hello', 7, activity))),
+                         dict(repo='octocat/hello', days=7, **activity))
+        self.assertEqual(json.loads(render(renderer.error('boom'))), {'error': 'boom'})
+
+    def test_large_reports_stream_in_bounded_chunks(self):
+        chunks = list(get_renderer('text').repo_activity('octocat/hello', 30, make_activity(20000)))
+        self.assertGreater(len(chunks), 60000)
+        self.assertLess(max(len(chunk) for chunk in chunks), 200)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            get_renderer('html')
+
+
+class TestBotRendering(unittest.TestCase):
+    def setUp(self):
+        self.github = MagicMock()
+        self.github.get_repositories.return_value = REPOS
+        self.github.get_repo_activity.return_value = make_activity(3)
+        self.bot = AIAccountabilityBot(MagicMock(), github_manager=self.github)
+
+    def test_reports_stream_block_by_block(self):
+        chunks = list(self.bot.stream_command('show activity for octocat/hello'))
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(''.join(chunks), self.bot.process_command('show activity for octocat/hello'))
+
+    def test_format_views(self):
+        body = json.loads(self.bot.with_format('json').process_command('list repos'))
+        self.assertEqual(body, {'repos': REPOS})
+        self.assertEqual(self.bot.renderer.name, 'text')
+
+    def test_errors_follow_the_format(self):
+        self.github.get_repositories.side_effect = Exception('rate limited')
+        self.assertEqual(self.bot.process_command('list repos'), 'Error listing repositories: rate limited')
+        self.assertEqual(json.loads(self.bot.with_format('json').process_command('list repos')),
+                         {'error': 'Error listing repositories: rate limited'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers.repository_index import RepositoryIndex
+
+
+def make_repo(record_id, name, description=''):
+    return {'id': record_id, 'fields': {'Repository Name': name, 'Description': description}}
+
+
+class TestRepositoryIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = RepositoryIndex()
+        self.index.load([
+            make_repo('rec1', 'GitAccountable', 'Accountability bot for GitHub'),
+            make_repo('rec2', 'dotfiles', 'My shell config'),
+            make_repo('rec3', 'account-service', 'Billing backend'),
+            make_repo('rec4', 'notes', 'Meeting notes about the account migration'),
+        ])
+
+    def ids(self, query):
+        return [record['id'] for record in self.index.search(query)]
+
+    def test_substring_matches_like_find(self):
+        self.assertEqual(set(self.ids('ccount')), {'rec1', 'rec3', 'rec4'})
+        self.assertEqual(self.ids('fil'), ['rec2'])
+        self.assertEqual(self.ids('zzz'), [])
+
+    def test_short_queries(self):
+        self.assertIn('rec2', self.ids('d'))
+        self.assertEqual(set(self.ids('sh')), {'rec2'})
+
+    def test_ranking_prefers_name_matches(self):
+        self.assertEqual(self.ids('account')[:2], ['rec3', 'rec1'])
+        self.assertEqual(self.ids('account')[-1], 'rec4')
+
+    def test_multi_word_prefix_query(self):
+        self.assertEqual(self.ids('bill back'), ['rec3'])
+
+    def test_index_follows_updates_and_removals(self):
+        self.index.upsert(make_repo('rec2', 'dotfiles', 'Accounting scripts'))
+        self.assertIn('rec2', self.ids('accounting'))
+        self.index.remove('rec3')
+        self.assertNotIn('rec3', self.ids('account'))
+        self.assertEqual(self.ids('billing'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.chat import ChatService
+from src.core.response_cache import ResponseCache, normalize_prompt
+
+PARAMS = {'model': 'gpt-3.5-turbo', 'system_prompt': 'system', 'temperature': 0.7, 'max_tokens': 150}
+
+
+def fake_embed(text):
+    # Bag of letters: prompts with the same words in any order embed identically
+    return [text.count(letter) for letter in 'abcdefghijklmnopqrstuvwxyz']
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_normalizes_prompts(self):
+        self.assertEqual(normalize_prompt('  What can   you DO?? '), 'what can you do')
+
+    def test_exact_hits_within_scope(self):
+        cache = ResponseCache(':memory:')
+        cache.put('Help', 'Try "list tasks"', latency=1.5, **PARAMS)
+
+        self.assertEqual(cache.get('help!', **PARAMS), 'Try "list tasks"')
+        self.assertIsNone(cache.get('help', **dict(PARAMS, temperature=0.2)))
+
+        metrics = cache.metrics()
+        self.assertEqual((metrics['hits'], metrics['misses']), (1, 1))
+        self.assertEqual(metrics['hit_rate'], 0.5)
+        self.assertEqual(metrics['latency_saved'], 1.5)
+
+    def test_entries_expire(self):
+        cache = ResponseCache(':memory:', ttl=60)
+        with patch('src.core.response_cache.time.time', return_value=1000.0):
+            cache.put('help', 'answer', **PARAMS)
+        with patch('src.core.response_cache.time.time', return_value=1061.0):
+            self.assertIsNone(cache.get('help', **PARAMS))
+        self.assertEqual(cache.metrics()['entries'], 0)
+
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(':memory:', max_entries=2)
+        now = time.time()
+        with patch('src.core.response_cache.time.time', side_effect=[now - 4, now - 3, now - 2, now - 1]):
+            cache.put('first', '1', **PARAMS)
+            cache.put('second', '2', **PARAMS)
+            cache.get('first', **PARAMS)
+            cache.put('third', '3', **PARAMS)
+
+        self.assertEqual(cache.get('first', **PARAMS), '1')
+        self.assertIsNone(cache.get('second', **PARAMS))
+
+    def test_semantic_hits_above_threshold(self):
+        embed = MagicMock(side_effect=fake_embed)
+        cache = ResponseCache(':memory:', embed=embed, similarity=0.99)
+        cache.put('show my tasks', 'Here are your tasks', **PARAMS)
+
+        self.assertEqual(cache.get('tasks show my', **PARAMS), 'Here are your tasks')
+        self.assertIsNone(cache.get('delete the repository', **PARAMS))
+        self.assertEqual(cache.metrics()['semantic_hits'], 1)
+        # The store after a miss reuses the lookup's embedding
+        cache.put('delete the repository', 'Done', **PARAMS)
+        self.assertEqual(embed.call_count, 3)
+
+
+class TestChatServiceCache(unittest.TestCase):
+    def setUp(self):
+        self.service = ChatService('sk-test', airtable_manager=MagicMock(), task_manager=MagicMock(),
+                                   response_cache=ResponseCache(':memory:'))
+        self.service.client = MagicMock()
+        self.service.client.chat.completions.create.return_value.choices = [
+            MagicMock(message=MagicMock(content='I can manage your tasks'))
+        ]
+
+    def test_repeated_messages_skip_the_api(self):
+        self.assertEqual(self.service.chat_with_gpt('What can you do?'), 'I can manage your tasks')
+        self.assertEqual(self.service.chat_with_gpt('what can you do'), 'I can manage your tasks')
+
+        self.service.client.chat.completions.create.assert_called_once()
+        self.assertEqual(self.service.cache_stats()['hits'], 1)
+
+    def test_generate_text_is_cached_separately(self):
+        self.service.chat_with_gpt('help')
+        self.service.generate_text('help')
+
+        self.assertEqual(self.service.client.chat.completions.create.call_count, 2)
+
+    def test_errors_are_not_cached(self):
+        self.service.client.chat.completions.create.side_effect = Exception('timeout')
+        self.assertIn('timeout', self.service.chat_with_gpt('help'))
+        with self.assertRaises(Exception):
+            self.service.generate_text('help')
+        self.assertEqual(self.service.cache_stats()['entries'], 0)
+
+    def test_cache_failures_fall_back_to_the_api(self):
+        broken = MagicMock()
+        broken.get.side_effect = Exception('database is locked')
+        broken.put.side_effect = Exception('database is locked')
+        self.service.response_cache = broken
+
+        with self.assertLogs('src.core.chat', 'WARNING'):
+            self.assertEqual(self.service.chat_with_gpt('help'), 'I can manage your tasks')
+            self.assertEqual(self.service.generate_text('help'), 'I can manage your tasks')
+        self.service.client.chat.completions.create.return_value = iter([
+            MagicMock(choices=[MagicMock(delta=MagicMock(content='streamed'))])
+        ])
+        self.assertEqual(''.join(self.service.stream_chat('help')), 'streamed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers.rate_limiter import Priority, current_priority, request_priority
+from src.managers.record_store import RecordStore
+from src.managers.table_sync import TableSync
+
+
+def make_record(record_id, updated):
+    return {'id': record_id, 'fields': {'Name': record_id, 'Last Updated': updated}}
+
+
+class TestTableSync(unittest.TestCase):
+    def setUp(self):
+        self.table = MagicMock()
+        self.store = RecordStore()
+        self.sync = TableSync(self.table, self.store, interval=0, sweep_interval=3600)
+        self.table.all.return_value = [
+            make_record('rec1', '2024-05-01'),
+            make_record('rec2', '2024-05-03'),
+        ]
+        self.sync.refresh()
+
+    def test_first_refresh_is_full_load(self):
+        self.table.all.assert_called_once_with()
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.sync.watermark, '2024-05-03')
+
+    def test_delta_refresh_uses_watermark(self):
+        self.table.all.reset_mock()
+        self.table.all.return_value = [make_record('rec3', '2024-05-04')]
+        self.sync.refresh()
+
+        self.table.all.assert_called_once_with(
+            formula="NOT(IS_BEFORE({Last Updated}, '2024-05-03'))"
+        )
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.sync.watermark, '2024-05-04')
+        self.assertEqual(self.sync.stats['delta_pulls'], 1)
+
+    def test_sweep_drops_deleted_records(self):
+        self.table.all.return_value = [{'id': 'rec2', 'fields': {}}]
+        removed = self.sync.sweep()
+
+        self.table.all.assert_called_with(fields=['Last Updated'])
+        self.assertEqual(removed, 1)
+        self.assertIsNone(self.store.get('rec1'))
+        self.assertIsNotNone(self.store.get('rec2'))
+
+    def test_maybe_refresh_respects_interval(self):
+        self.sync.interval = 3600
+        self.table.all.reset_mock()
+        self.sync.maybe_refresh()
+        self.table.all.assert_not_called()
+
+    def test_refresh_keeps_the_callers_priority(self):
+        seen = []
+        self.table.all.side_effect = lambda **kwargs: seen.append(current_priority()) or []
+        self.sync.maybe_refresh()
+        with request_priority(Priority.SCHEDULED):
+            self.sync.maybe_refresh()
+            self.sync.refresh(full=True)
+        self.sync.refresh()
+        self.assertEqual(seen, [Priority.INTERACTIVE, Priority.SCHEDULED, Priority.SCHEDULED, Priority.BULK])
+
+
+if __name__ == '__main__':
+    unittest.main()
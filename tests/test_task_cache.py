@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers.task_cache import TaskCache
+from src.managers.task_manager import TaskManager
+
+
+def make_task(record_id, title, status='Todo', due_date=None):
+    fields = {'Title': title, 'Status': status, 'Priority': 'Medium'}
+    if due_date:
+        fields['Due Date'] = due_date
+    return {'id': record_id, 'fields': fields}
+
+
+class TestTaskCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = TaskCache()
+        self.cache.load([
+            make_task('rec1', 'Write docs', 'Todo', '2024-05-03'),
+            make_task('rec2', 'Fix bugs', 'In Progress', '2024-05-01'),
+            make_task('rec3', 'Ship release', 'Done', '2024-05-02'),
+            make_task('rec4', 'Someday', 'Todo'),
+        ])
+
+    def test_find_by_title_ignores_case(self):
+        self.assertEqual(self.cache.find_by_title('WRITE DOCS')['id'], 'rec1')
+        self.assertIsNone(self.cache.find_by_title('missing'))
+
+    def test_by_status(self):
+        self.assertEqual([t['id'] for t in self.cache.by_status('todo')], ['rec1', 'rec4'])
+        self.assertEqual(len(self.cache.by_status(None)), 4)
+
+    def test_due_window_is_sorted_and_skips_done(self):
+        due = self.cache.due_on_or_before('2024-05-03')
+        self.assertEqual([t['id'] for t in due], ['rec2', 'rec1'])
+        self.assertEqual(self.cache.due_on_or_before('2024-04-30'), [])
+
+    def test_upsert_reindexes(self):
+        self.cache.upsert(make_task('rec1', 'Write docs', 'Done', '2024-06-01'))
+        self.assertEqual([t['id'] for t in self.cache.by_status('Todo')], ['rec4'])
+        self.assertEqual([t['id'] for t in self.cache.due_on_or_before('2024-05-03')], ['rec2'])
+
+    def test_remove(self):
+        self.cache.remove('rec2')
+        self.assertIsNone(self.cache.find_by_title('fix bugs'))
+        self.assertEqual([t['id'] for t in self.cache.due_on_or_before('2024-05-03')], ['rec1'])
+
+    def test_listeners_see_every_change(self):
+        changes = []
+        self.cache.add_listener(changes.extend)
+        self.cache.upsert(make_task('rec5', 'New'))
+        self.cache.remove('rec5')
+        self.cache.remove('missing')
+        self.cache.retain({'rec1', 'rec2', 'rec3'})
+        self.cache.load([make_task('rec1', 'Write docs')])
+
+        self.assertEqual([(record_id, record is not None) for record_id, record in changes], [
+            ('rec5', True), ('rec5', False), ('rec4', False), ('rec1', True), ('rec2', False), ('rec3', False)
+        ])
+
+
+class TestTaskManagerCache(unittest.TestCase):
+    def setUp(self):
+        airtable_manager = MagicMock(api_key='key', base_id='app123')
+        self.task_manager = TaskManager(airtable_manager)
+        self.task_manager.table = self.task_manager.sync.table = MagicMock()
+        self.task_manager.table.all.return_value = [
+            make_task('rec1', 'Write docs'),
+            make_task('rec2', 'Fix bugs'),
+        ]
+
+    def test_lookups_hit_airtable_once(self):
+        self.assertEqual(self.task_manager.find_task_by_title('fix BUGS')['id'], 'rec2')
+        self.task_manager.get_tasks_by_status('Todo')
+        self.task_manager.get_due_tasks(7)
+        self.task_manager.table.all.assert_called_once()
+
+    def test_writes_update_cache(self):
+        self.task_manager.get_tasks_by_status()
+        self.task_manager.table.update.return_value = make_task('rec1', 'Write docs', 'Done')
+        self.task_manager.update_task_status('rec1', 'Done')
+        self.assertEqual(self.task_manager.get_tasks_by_status('Done')[0]['id'], 'rec1')
+
+        self.task_manager.delete_task('rec2')
+        self.assertIsNone(self.task_manager.find_task_by_title('Fix bugs'))
+        self.task_manager.table.all.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.managers.task_cache import TaskCache
+from src.managers.task_manager import TASK_LIST_LIMIT, TaskManager
+
+
+def make_task(record_id, title, status='Todo', due_date=None):
+    fields = {'Title': title, 'Status': status, 'Priority': 'Medium'}
+    if due_date:
+        fields['Due Date'] = due_date
+    return {'id': record_id, 'fields': fields}
+
+
+def make_tasks(count):
+    statuses = ['Todo', 'In Progress', 'Done']
+    return [make_task(f'rec{i:05d}', f'Task {i:05d}', statuses[i % 3],
+                      f'2024-{1 + i % 12:02d}-{1 + i % 28:02d}' if i % 10 else None)
+            for i in range(count)]
+
+
+def make_task_manager(records):
+    task_manager = TaskManager(MagicMock(api_key='key', base_id='app123'))
+    task_manager.table = task_manager.sync.table = MagicMock()
+    task_manager.table.all.return_value = records
+    return task_manager
+
+
+class TestIterSorted(unittest.TestCase):
+    def setUp(self):
+        self.cache = TaskCache()
+        self.cache.load(make_tasks(1000))
+
+    def test_orders_match_a_full_sort(self):
+        by_due = [t['id'] for t in self.cache.iter_sorted('due_date', chunk=7)]
+        expected = sorted(self.cache.all(), key=lambda t: (t['fields'].get('Due Date') or '\uffff', t['id']))
+        self.assertEqual(by_due, [t['id'] for t in expected])
+        self.assertEqual([t['id'] for t in self.cache.iter_sorted('title', descending=True, chunk=50)],
+                         [t['id'] for t in sorted(self.cache.all(), key=lambda t: t['fields']['Title'], reverse=True)])
+
+    def test_resumes_after_a_position(self):
+        tasks = list(self.cache.iter_sorted('title'))
+        after = ('task 00499', 'rec00499')
+        self.assertEqual(list(self.cache.iter_sorted('title', after=after)), tasks[500:])
+        self.assertEqual(list(self.cache.iter_sorted('title', descending=True, after=after)), tasks[:499][::-1])
+
+    def test_sees_changes_between_chunks(self):
+        tasks = self.cache.iter_sorted('title', chunk=10)
+        first = [next(tasks) for _ in range(10)]
+        self.cache.upsert(make_task('rec99999', 'Task 99999'))
+        self.cache.remove('rec00500')
+        rest = list(tasks)
+        self.assertEqual(len(first) + len(rest), 1000)
+        self.assertEqual(rest[-1]['id'], 'rec99999')
+
+    def test_unknown_sort(self):
+        with self.assertRaises(ValueError):
+            next(self.cache.iter_sorted('priority'))
+
+
+class TestIterTasks(unittest.TestCase):
+    def setUp(self):
+        self.task_manager = make_task_manager(make_tasks(300))
+
+    def test_filters(self):
+        tasks = list(self.task_manager.iter_tasks(status='done', due_after='2024-03-01', due_before='2024-03-31'))
+        self.assertTrue(tasks)
+        for task in tasks:
+            self.assertEqual(task['fields']['Status'], 'Done')
+            self.assertTrue('2024-03-01' <= task['fields']['Due Date'] <= '2024-03-31')
+        self.assertEqual([t['fields']['Due Date'] for t in tasks], sorted(t['fields']['Due Date'] for t in tasks))
+
+    def test_cursor_pages_cover_every_task_once(self):
+        seen = []
+        cursor = None
+        while True:
+            page = []
+            for task in self.task_manager.iter_tasks(sort='created', cursor=cursor):
+                page.append(task)
+                if len(page) == 40:
+                    break
+            seen.extend(page)
+            if len(page) < 40:
+                break
+            cursor = self.task_manager.task_cursor(page[-1], 'created')
+        self.assertEqual(sorted(t['id'] for t in seen), sorted(t['id'] for t in make_tasks(300)))
+        self.task_manager.table.all.assert_called_once()
+
+    def test_rejects_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            self.task_manager.iter_tasks(sort='priority')
+        with self.assertRaises(ValueError):
+            self.task_manager.iter_tasks(cursor='not-a-cursor')
+        cursor = self.task_manager.task_cursor(make_task('rec1', 'A'), 'title')
+        with self.assertRaises(ValueError):
+            self.task_manager.iter_tasks(sort='due_date', cursor=cursor)
+        for bound in ('tomorrow', '2024-3-1', '20240301', '2024-02-30'):
+            with self.assertRaises(ValueError):
+                self.task_manager.iter_tasks(due_before=bound)
+
+    def test_bot_lists_one_page(self):
+        response = AIAccountabilityBot(self.task_manager).process_command('list tasks')
+        self.assertEqual(response.count('Priority:'), TASK_LIST_LIMIT)
+        self.assertIn('GET /tasks', response)
+
+
+class TestTasksRoute(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        env = {name: 'test' for name in ('GITHUB_CLIENT_ID', 'GITHUB_CLIENT_SECRET', 'GITHUB_REDIRECT_URI',
+                                          'FLASK_SECRET_KEY', 'OPENAI_API_KEY', 'AIRTABLE_API_KEY',
+                                          'AIRTABLE_BASE_ID')}
+        env['OPENAI_RESPONSE_CACHE'] = ':memory:'
+        with patch.dict(os.environ, env):
+            from src.web import app as app_module
+        cls.app_module = app_module
+
+    def setUp(self):
+        patcher = patch.object(self.app_module, 'task_manager', make_task_manager(make_tasks(120)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = self.app_module.app.test_client()
+        with self.client.session_transaction() as session:
+            session['github_token'] = {'access_token': 'token', 'token_type': 'bearer', 'scope': []}
+
+    def test_json_pages(self):
+        ids = []
+        query = {'sort': '-title', 'limit': 50}
+        while True:
+            body = self.client.get('/tasks', query_string=query).get_json()
+            ids.extend(task['id'] for task in body['tasks'])
+            if not body['next_cursor']:
+                break
+            query['cursor'] = body['next_cursor']
+        self.assertEqual(ids, sorted((t['id'] for t in make_tasks(120)), reverse=True))
+
+    def test_ndjson_stream(self):
+        response = self.client.get('/tasks?status=Done', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(lines), 40)
+        self.assertTrue(all(task['fields']['Status'] == 'Done' for task in lines))
+
+    def test_ndjson_pages_end_with_a_cursor(self):
+        response = self.client.get('/tasks?format=ndjson&limit=100')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(lines), 101)
+        rest = self.client.get('/tasks', query_string={'cursor': lines[-1]['next_cursor'], 'limit': 100}).get_json()
+        self.assertEqual(len(rest['tasks']), 20)
+        self.assertIsNone(rest['next_cursor'])
+
+    def test_bad_cursor(self):
+        self.assertEqual(self.client.get('/tasks?cursor=bogus').status_code, 400)
+        self.assertEqual(self.client.get('/tasks?sort=priority').status_code, 400)
+
+    def test_bad_due_dates(self):
+        response = self.client.get('/tasks?due_after=next-week')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('due_after', response.get_json()['message'])
+        self.assertEqual(self.client.get('/tasks?due_before=2024-13-01').status_code, 400)
+        self.assertEqual(self.client.get('/tasks?due_before=2024-03-31').status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.bot import AIAccountabilityBot
+from src.managers.async_adapters import run_io
+from src.managers.task_manager import TaskManager
+from src.utils.tracing import (JSONLinesExporter, OTLPExporter, Tracer, create_tracer, current_span, set_tracer,
+                               span, start_trace)
+
+
+class CollectingExporter:
+    name = 'collect'
+
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+def make_task_manager(records):
+    task_manager = TaskManager(MagicMock(api_key='key', base_id='app123'))
+    task_manager.table = task_manager.sync.table = MagicMock()
+    task_manager.table.all.return_value = records
+    return task_manager
+
+
+class TracingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.exporter = CollectingExporter()
+        self.tracer = Tracer(self.exporter, sample_rate=1.0)
+        set_tracer(self.tracer)
+        self.addCleanup(set_tracer, None)
+
+    def spans(self):
+        self.tracer.flush()
+        return {span.name: span for trace in self.exporter.traces for span in trace}
+
+
+class TestTracer(TracingTestCase):
+    def test_unsampled_requests_open_no_spans(self):
+        set_tracer(Tracer(self.exporter, sample_rate=0.0))
+        with start_trace('POST /command') as root:
+            with span('work') as child:
+                self.assertIsNone(current_span())
+        self.assertIsNone(root)
+        self.assertIsNone(child)
+        self.assertEqual(self.exporter.traces, [])
+        self.assertIsNone(Tracer().begin('GET /'))
+
+    def test_bot_command_spans_nest(self):
+        bot = AIAccountabilityBot(make_task_manager([]))
+        with start_trace('POST /command'):
+            bot.process_command('show due in 3 days')
+
+        spans = self.spans()
+        chain = ['tasks.get_due_tasks', 'command.due_tasks', 'process_command', 'POST /command']
+        for child, parent in zip(chain, chain[1:]):
+            self.assertEqual(spans[child].parent_id, spans[parent].span_id)
+        self.assertEqual(spans['process_command'].attributes['command'], 'due_tasks')
+        self.assertEqual(len({s.trace.trace_id for s in spans.values()}), 1)
+        self.assertIsNone(current_span())
+
+    def test_errors_are_recorded(self):
+        with self.assertRaises(KeyError):
+            with start_trace('job'):
+                with span('lookup'):
+                    raise KeyError('missing')
+        spans = self.spans()
+        self.assertEqual(spans['lookup'].error, "KeyError: 'missing'")
+        self.assertEqual(spans['job'].error, "KeyError: 'missing'")
+
+    def test_traceparent_continues_the_callers_trace(self):
+        header = '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+        with start_trace('POST /command', header) as root:
+            pass
+        self.assertEqual((root.trace.trace_id, root.parent_id), ('4bf92f3577b34da6a3ce929d0e0e4736', '00f067aa0ba902b7'))
+        with start_trace('POST /command', header[:-2] + '00') as root:
+            self.assertIsNone(root)
+
+    def test_run_io_keeps_the_span(self):
+        async def handle():
+            with start_trace('GET /repos'):
+                return await run_io(current_span)
+
+        self.assertEqual(asyncio.run(handle()).name, 'GET /repos')
+
+    def test_unknown_exporter(self):
+        with patch.dict(os.environ, {'TRACE_EXPORTER': 'zipkin'}):
+            with self.assertRaises(ValueError):
+                create_tracer()
+        with patch.dict(os.environ, {'TRACE_EXPORTER': ''}):
+            self.assertIsNone(create_tracer().exporter)
+
+
+class TestExporters(TracingTestCase):
+    def test_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'traces.jsonl')
+            tracer = Tracer(JSONLinesExporter(path))
+            set_tracer(tracer)
+            with start_trace('POST /command'):
+                with span('work', rows=3):
+                    pass
+            tracer.flush()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([r['name'] for r in records], ['work', 'POST /command'])
+        self.assertEqual(records[0]['parent_id'], records[1]['span_id'])
+        self.assertEqual(records[0]['attributes'], {'rows': 3})
+
+    def test_otlp_payload(self):
+        exporter = OTLPExporter('http://collector:4318/', service_name='bot')
+        exporter.session = MagicMock()
+        tracer = Tracer(exporter)
+        set_tracer(tracer)
+        with start_trace('POST /command'):
+            with span('github_api.GET', kind='client', status=200):
+                pass
+        tracer.flush()
+
+        url, = exporter.session.post.call_args.args
+        payload = exporter.session.post.call_args.kwargs['json']
+        self.assertEqual(url, 'http://collector:4318/v1/traces')
+        resource_spans = payload['resourceSpans'][0]
+        self.assertEqual(resource_spans['resource']['attributes'][0]['value'], {'stringValue': 'bot'})
+        child, root = resource_spans['scopeSpans'][0]['spans']
+        self.assertEqual((child['kind'], root['kind']), (3, 2))
+        self.assertEqual(child['parentSpanId'], root['spanId'])
+        self.assertEqual(child['attributes'], [{'key': 'status', 'value': {'intValue': '200'}}])
+        self.assertNotIn('parentSpanId', root)
+
+
+class TestCommandRoute(TracingTestCase):
+    def test_command_responses_name_their_trace(self):
+        env = {name: 'test' for name in ('GITHUB_CLIENT_ID', 'GITHUB_CLIENT_SECRET', 'GITHUB_REDIRECT_URI',
+                                          'FLASK_SECRET_KEY', 'OPENAI_API_KEY', 'AIRTABLE_API_KEY',
+                                          'AIRTABLE_BASE_ID')}
+        env['OPENAI_RESPONSE_CACHE'] = ':memory:'
+        with patch.dict(os.environ, env):
+            from src.web import app as app_module
+        client = app_module.app.test_client()
+        with client.session_transaction() as session:
+            session['github_token'] = {'access_token': 'token'}
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.dict(os.environ, {'GITHUB_CACHE_DIR': tmp}), \
+                patch.object(app_module, 'bot', AIAccountabilityBot(make_task_manager([]))):
+            response = client.post('/command', json={'command': 'list tasks'})
+        spans = self.spans()
+        root = spans['POST /command']
+        self.assertEqual(response.headers['traceparent'], root.traceparent)
+        self.assertEqual(root.attributes['http.response.status_code'], 200)
+        self.assertEqual(spans['tasks.iter_tasks'].trace, root.trace)
+
+
+if __name__ == '__main__':
+    unittest.main()
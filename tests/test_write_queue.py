@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.managers.rate_limiter import Priority, current_priority, request_priority
+from src.managers.record_store import RecordStore
+from src.managers.write_queue import WriteBehindQueue
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+    def setUp(self):
+        self.table = MagicMock()
+        self.table.batch_create.side_effect = lambda records: [
+            {'id': f'rec{i}', 'fields': fields} for i, fields in enumerate(records)
+        ]
+        self.table.batch_update.side_effect = lambda records: records
+        self.table.batch_delete.side_effect = lambda ids: [{'id': i, 'deleted': True} for i in ids]
+        self.store = RecordStore()
+        self.queue = WriteBehindQueue(self.table, store=self.store, flush_interval=0)
+
+    def test_creates_are_sent_in_batches_of_ten(self):
+        futures = [self.queue.create({'Title': f'Task {i}'}) for i in range(25)]
+        self.queue.flush()
+
+        self.assertEqual(self.table.batch_create.call_count, 3)
+        self.assertEqual([len(c.args[0]) for c in self.table.batch_create.call_args_list], [10, 10, 5])
+        self.assertEqual(futures[12].result()['fields']['Title'], 'Task 12')
+
+    def test_updates_to_same_record_are_coalesced(self):
+        first = self.queue.update('rec1', {'Status': 'In Progress'})
+        second = self.queue.update('rec1', {'Status': 'Done', 'Priority': 'High'})
+        self.queue.flush()
+
+        self.table.batch_update.assert_called_once_with(
+            [{'id': 'rec1', 'fields': {'Status': 'Done', 'Priority': 'High'}}]
+        )
+        self.assertIs(first.result(), second.result())
+        self.assertEqual(self.store.get('rec1')['fields']['Status'], 'Done')
+
+    def test_delete_supersedes_pending_update(self):
+        update = self.queue.update('rec1', {'Status': 'Done'})
+        delete = self.queue.delete('rec1')
+        self.queue.flush()
+
+        self.assertTrue(update.cancelled())
+        self.table.batch_update.assert_not_called()
+        self.assertTrue(delete.result()['deleted'])
+
+    def test_failed_batch_sets_exception(self):
+        self.table.batch_create.side_effect = RuntimeError('429 Too Many Requests')
+        future = self.queue.create({'Title': 'Task'})
+        self.queue.flush()
+
+        with self.assertRaises(RuntimeError):
+            future.result()
+        self.assertEqual(len(self.queue), 0)
+
+    def test_flushes_run_at_the_callers_priority(self):
+        priorities = []
+        self.table.batch_create.side_effect = lambda records: (
+            priorities.append(current_priority()) or [{'id': 'rec1', 'fields': records[0]}]
+        )
+        self.queue.create({'Title': 'Task'})
+        self.queue.flush()
+        self.queue.create({'Title': 'Task'})
+        with request_priority(Priority.SCHEDULED):
+            self.queue.flush()
+
+        timed = WriteBehindQueue(self.table, flush_interval=0.01)
+        timed.create({'Title': 'Task'}).result(timeout=5)
+        self.assertEqual(priorities, [Priority.INTERACTIVE, Priority.SCHEDULED, Priority.BULK])
+
+
+if __name__ == '__main__':
+    unittest.main()